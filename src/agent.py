@@ -1,39 +1,60 @@
-from src.grid import GridEnvironment
-from src.planners import Planner
+from typing import List, Tuple
+from grid import GridEnvironment
+from planners import Planner
+from dstar import DStarLite
+from sipp import SIPPPlanner
+from plan_cache import PlanCache
 import logging
 
 class DeliveryAgent:
-    def __init__(self, env: GridEnvironment, planner_type: str):
+    def __init__(self, env: GridEnvironment, planner_type: str, cache: PlanCache = None, time_budget: float = None):
         self.env = env
-        self.planner = Planner(env)
+        self.planner = Planner(env, cache=cache)
         self.planner_type = planner_type
+        self.time_budget = time_budget  # Latency ceiling per (re)plan for 'ara'
+        self.dstar = DStarLite(env) if planner_type == 'dstar' else None
+        self.sipp = SIPPPlanner(env) if planner_type == 'sipp' else None
         self.max_fuel = 1000
         self.max_steps = 200
         logging.basicConfig(level=logging.INFO, filename='replan_log.txt', filemode='w')
 
-    def plan_path(self, start: Tuple[int, int]) -> List[Tuple[int, int]]:
-        if self.planner_type == 'bfs':
-            return self.planner.bfs(start)[0]
-        elif self.planner_type == 'ucs':
-            return self.planner.ucs(start)[0]
-        elif self.planner_type == 'astar':
-            return self.planner.astar(start)[0]
+    def plan_path(self, start: Tuple[int, int], departure: int = 0) -> List[Tuple[int, int]]:
+        if self.planner_type in ('bfs', 'ucs', 'astar', 'bidijkstra', 'biastar'):
+            return self.planner.plan(self.planner_type, start, departure)[0]
+        elif self.planner_type == 'ara':
+            path, metrics = self.planner.plan('ara', start, departure, time_budget=self.time_budget)
+            logging.info(f"ARA* cost {metrics['cost']} within {metrics['bound']:.2f}x optimal")
+            return path
         elif self.planner_type == 'sa':
-            return self.planner.simulated_annealing(start, self.max_steps)[0]
+            return self.planner.plan('sa', start, departure, max_steps=self.max_steps)[0]
+        elif self.planner_type == 'dstar':
+            path, metrics = self.dstar.plan(start)
+            logging.info(f"D* Lite expanded {metrics['nodes']} nodes")
+            return path
+        elif self.planner_type == 'sipp':
+            path, metrics = self.sipp.plan(start, departure)
+            logging.info(f"SIPP arrives at step {metrics.get('arrival')} after {metrics.get('waits', 0)} waits")
+            return path
         return []
 
     def execute_with_replanning(self, path: List[Tuple[int, int]], enable_replan: bool = False):
         current_pos = path[0]
-        step = 0
-        while step < len(path) and self._check_constraints(step):
+        step = fuel = 0
+        while step < len(path) and self._check_constraints(step, fuel):
             if enable_replan and self.env.is_occupied(path[step], step):
                 logging.info(f"Step {step}: Obstacle at {path[step]}, replanning...")
-                new_path = self.plan_path(current_pos)
+                if self.dstar:
+                    self.dstar.set_blocked([path[step]])
+                new_path = self.plan_path(current_pos, max(step - 1, 0))  # current_pos is where we are at step - 1
                 if new_path:
-                    path = new_path  # Replan from current
+                    path = path[:max(step, 1)] + new_path[1:]  # Replan from current, keeping the steps taken
                     logging.info(f"Replanned path length: {len(path)}")
                 else:
                     break
+            burn = self._step_fuel(current_pos, path[step])
+            if not self._check_constraints(step, fuel + burn):
+                break  # Not enough fuel left to make this move
+            fuel += burn
             current_pos = path[step]
             step += 1
             print(f"Step {step}: At {current_pos}")
@@ -42,5 +63,8 @@ class DeliveryAgent:
         else:
             print("Failed: Constraints violated or blocked.")
 
-    def _check_constraints(self, steps: int) -> bool:
-        return steps < self.max_steps  # Fuel checked in path cost
\ No newline at end of file
+    def _step_fuel(self, pos: Tuple[int, int], nxt: Tuple[int, int]) -> float:
+        return self.env.edge_cost(pos, nxt) if nxt != pos else 0  # Burns what the planners charge for the move
+
+    def _check_constraints(self, steps: int, fuel: float = 0) -> bool:
+        return steps < self.max_steps and fuel <= self.max_fuel
\ No newline at end of file
@@ -0,0 +1,218 @@
+import sys
+import os
+src_dir = os.path.dirname(os.path.abspath(__file__))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+import argparse
+import csv
+import json
+import platform
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Callable, Dict, List, Tuple
+import numpy as np
+from grid import GridEnvironment
+from planners import Planner
+from dstar import DStarLite
+from hpa import HPAPlanner
+from jps import JumpPointPlanner
+from sipp import SIPPPlanner
+from landmarks import LandmarkTable
+import mapgen
+
+PlanFn = Callable[[Tuple[int, int]], Tuple[List[Tuple[int, int]], Dict]]
+
+
+def _prepare(name: str, env: GridEnvironment) -> PlanFn:
+    # One-off per-map setup (e.g. the HPA* abstraction) happens here, outside the timed query
+    planner = Planner(env)
+    if name in ('bfs', 'ucs', 'astar', 'ara', 'bidijkstra', 'biastar'):
+        return getattr(planner, name)
+    if name == 'sa':
+        return planner.simulated_annealing
+    if name == 'dstar':
+        return lambda start: DStarLite(env).plan(start)  # Goal is fixed at construction
+    if name == 'hpa':
+        hpa = HPAPlanner(env)
+        return hpa.plan
+    if name == 'jps':
+        return JumpPointPlanner(env).plan
+    if name == 'alt':
+        return Planner(env, landmarks=LandmarkTable.build(env)).astar
+    if name == 'sipp':
+        sipp = SIPPPlanner(env)
+        return lambda start: sipp.plan(start, goal=env.goal)
+    raise ValueError(f"Unknown planner {name!r}")
+
+
+PLANNERS = ('bfs', 'ucs', 'astar', 'ara', 'bidijkstra', 'biastar', 'sa', 'dstar', 'hpa', 'jps', 'sipp', 'alt')
+
+
+def run_query(plan: PlanFn, env: GridEnvironment, start: Tuple[int, int], goal: Tuple[int, int],
+              measure_memory: bool = True) -> Dict:
+    """Time one query with perf_counter; a second, traced run measures peak memory."""
+    saved_goal = env.goal
+    env.goal = goal
+    try:
+        t0 = time.perf_counter()
+        path, metrics = plan(start)
+        elapsed = time.perf_counter() - t0
+        peak = 0
+        if measure_memory:
+            tracemalloc.start()
+            plan(start)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    finally:
+        env.goal = saved_goal
+    nodes = metrics.get('nodes', 0)
+    return {'found': bool(path), 'cost': metrics.get('cost', float('inf')), 'nodes': nodes,
+            'path_len': len(path), 'time': elapsed,
+            'nodes_per_sec': nodes / elapsed if elapsed > 0 else 0.0, 'peak_kb': peak / 1024}
+
+
+def run_suite(maps: List[Tuple[str, GridEnvironment]], planners: List[str], n_queries: int, seed: int,
+              measure_memory: bool = True, log=print) -> List[Dict]:
+    results = []
+    for map_name, env in maps:
+        query_set = mapgen.queries(env, n_queries, seed)
+        for name in planners:
+            t0 = time.perf_counter()
+            plan = _prepare(name, env)
+            setup = time.perf_counter() - t0
+            for q, (start, goal) in enumerate(query_set):
+                row = {'map': map_name, 'planner': name, 'query': q, 'start': list(start), 'goal': list(goal),
+                       'setup_time': setup}
+                row.update(run_query(plan, env, start, goal, measure_memory))
+                results.append(row)
+            log(f"{map_name:>18} {name:>6}: {len(query_set)} queries done")
+    return results
+
+
+def summarize(results: List[Dict]) -> Dict[str, Dict]:
+    """Aggregate per (map, planner): median time, mean nodes/cost, peak memory, solve rate."""
+    groups = defaultdict(list)
+    for row in results:
+        groups[f"{row['map']}/{row['planner']}"].append(row)
+    summary = {}
+    for key, rows in groups.items():
+        solved = [r for r in rows if r['found']]
+        summary[key] = {
+            'queries': len(rows),
+            'solved': len(solved),
+            'median_time': float(np.median([r['time'] for r in rows])),
+            'mean_nodes': float(np.mean([r['nodes'] for r in rows])),
+            'mean_cost': float(np.mean([r['cost'] for r in solved])) if solved else float('inf'),
+            'nodes_per_sec': float(np.median([r['nodes_per_sec'] for r in rows])),
+            'peak_kb': float(max(r['peak_kb'] for r in rows)),
+        }
+    return summary
+
+
+def versus(summary: Dict[str, Dict], planner: str, reference: str = 'astar') -> Dict[str, Dict]:
+    """Per map: planner's mean nodes and median time as a fraction of the reference planner's."""
+    ratios = {}
+    for key, stats in summary.items():
+        map_name, name = key.rsplit('/', 1)
+        ref = summary.get(f'{map_name}/{reference}')
+        if name == planner and ref and ref['mean_nodes'] and ref['median_time']:
+            ratios[map_name] = {'nodes': stats['mean_nodes'] / ref['mean_nodes'],
+                                'time': stats['median_time'] / ref['median_time']}
+    return ratios
+
+
+def compare(summary: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """List regressions against a saved summary: slower, more nodes, worse cost or fewer solves."""
+    regressions = []
+    for key, base in baseline.items():
+        cur = summary.get(key)
+        if cur is None:
+            continue
+        if cur['solved'] < base['solved']:
+            regressions.append(f"{key}: solved {cur['solved']} < baseline {base['solved']}")
+        if cur['mean_cost'] > base['mean_cost'] * (1 + 1e-9):
+            regressions.append(f"{key}: mean cost {cur['mean_cost']:.2f} > baseline {base['mean_cost']:.2f}")
+        if cur['mean_nodes'] > base['mean_nodes'] * (1 + tolerance):
+            regressions.append(f"{key}: mean nodes {cur['mean_nodes']:.0f} > baseline {base['mean_nodes']:.0f}")
+        if cur['median_time'] > base['median_time'] * (1 + tolerance):
+            regressions.append(f"{key}: median time {cur['median_time'] * 1e3:.2f}ms > baseline {base['median_time'] * 1e3:.2f}ms")
+        if base['peak_kb'] and cur['peak_kb'] > base['peak_kb'] * (1 + tolerance):
+            regressions.append(f"{key}: peak memory {cur['peak_kb']:.0f}KB > baseline {base['peak_kb']:.0f}KB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Seeded benchmark suite for the path planners')
+    parser.add_argument('--kinds', nargs='+', default=list(mapgen.MAP_KINDS), choices=mapgen.MAP_KINDS,
+                        help='Synthetic map kinds to generate')
+    parser.add_argument('--sizes', nargs='+', type=int, default=None,
+                        help='Map edge lengths, 50 up to 4096 (default: 50 128, or none with --repo-maps)')
+    parser.add_argument('--repo-maps', nargs='+', default=[],
+                        help='Benchmark maps/<name>.map too, e.g. small medium large dynamic')
+    parser.add_argument('--planners', nargs='+', default=list(PLANNERS), choices=PLANNERS,
+                        help='Planners to run')
+    parser.add_argument('--queries', type=int, default=5,
+                        help='Queries per map (the first is always the map start->goal)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed for map generation and queries')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='Skip the tracemalloc peak-memory run')
+    parser.add_argument('--output', default='results/benchmark.json',
+                        help='JSON file for raw results and summary')
+    parser.add_argument('--csv', default=None,
+                        help='Also write planner,map,cost,nodes,time rows (results/experiments.csv format)')
+    parser.add_argument('--compare', default=None,
+                        help='Baseline JSON to check for regressions; exits 1 if any are found')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed relative slowdown / node growth before flagging a regression')
+    args = parser.parse_args()
+
+    maps = []
+    for name in args.repo_maps:
+        dyn_file = f'maps/{name}.dyn' if name == 'dynamic' else None
+        maps.append((name, GridEnvironment(f'maps/{name}.map', dyn_file)))
+    sizes = args.sizes if args.sizes is not None else ([] if args.repo_maps else [50, 128])
+    for kind in args.kinds:
+        for size in sizes:
+            maps.append((f'{kind}-{size}', mapgen.generate(kind, size, args.seed)))
+
+    results = run_suite(maps, args.planners, args.queries, args.seed, not args.no_memory)
+    summary = summarize(results)
+    meta = {'seed': args.seed, 'queries': args.queries, 'python': platform.python_version(),
+            'numpy': np.__version__, 'machine': platform.machine()}
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump({'meta': meta, 'summary': summary, 'results': results}, f, indent=1)
+    print(f"Results saved to {args.output}")
+
+    if args.csv:
+        with open(args.csv, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['planner', 'map', 'cost', 'nodes', 'time'])
+            for row in results:
+                if row['query'] == 0:
+                    writer.writerow([row['planner'], row['map'], row['cost'], row['nodes'], f"{row['time']:.6f}"])
+        print(f"CSV saved to {args.csv}")
+
+    for key, stats in sorted(summary.items()):
+        print(f"{key:>26}: {stats['solved']}/{stats['queries']} solved, median {stats['median_time'] * 1e3:8.2f}ms, "
+              f"{stats['nodes_per_sec']:10.0f} nodes/s, peak {stats['peak_kb']:8.0f}KB, cost {stats['mean_cost']:.1f}")
+
+    for planner in ('jps', 'alt'):
+        for map_name, ratio in sorted(versus(summary, planner).items()):
+            print(f"{map_name:>18}    {planner} vs astar: {(1 - ratio['nodes']) * 100:5.1f}% fewer nodes, "
+                  f"{(1 - ratio['time']) * 100:5.1f}% less time")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['summary']
+        regressions = compare(summary, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
+
+if __name__ == '__main__':
+    main()
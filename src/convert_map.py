@@ -0,0 +1,34 @@
+import sys
+import os
+src_dir = os.path.dirname(os.path.abspath(__file__))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+import argparse
+from grid import GridEnvironment, save_binary_map
+from tiled import save_tiled_map
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert a text .map (and optional .dyn) to the binary or tiled map format')
+    parser.add_argument('map_file', help='Text map file, e.g. maps/large.map')
+    parser.add_argument('--dyn', default=None,
+                        help='Optional .dyn file to embed in the binary map')
+    parser.add_argument('-o', '--output', default=None,
+                        help='Output path (default: same name with .gmap, or .tmap with --tile)')
+    parser.add_argument('--tile', type=int, default=0, metavar='N',
+                        help='Write the tiled out-of-core format with N x N tiles instead')
+    args = parser.parse_args()
+
+    out_file = args.output or os.path.splitext(args.map_file)[0] + ('.tmap' if args.tile else '.gmap')
+    try:
+        env = GridEnvironment(args.map_file, args.dyn)
+        if args.tile:
+            save_tiled_map(env, out_file, args.tile)
+        else:
+            save_binary_map(env, out_file)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error converting map: {e}")
+        sys.exit(1)
+    print(f"Wrote {out_file}: {env.rows}x{env.cols}, {len(env.moving_obstacles)} moving obstacles")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+import hashlib
+import heapq
+from collections import OrderedDict
+from typing import List, Sequence, Tuple
+import numpy as np
+from grid import GridEnvironment
+
+UNREACHABLE = -1  # Cost-grid value for cells the sweep never reaches
+
+
+def _sweep(table: Tuple[list, list, list, list, list], source: int, reverse: bool) -> Tuple[List[float], List[int]]:
+    # One Dijkstra pass over the map's neighbor table (as flat lists); entering a cell
+    # costs its terrain value times the step length. reverse=True measures cost *to*
+    # the source, with pred pointing one hop toward it (stencils are symmetric).
+    terrain, indptr, indices, steps, edge_costs = table
+    inf = float('inf')
+    dist = [inf] * len(terrain)
+    pred = [-1] * len(terrain)
+    if terrain[source] == inf:
+        return dist, pred
+    dist[source] = 0
+    pq = [(0, source)]
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]:
+            continue
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            nd = d + (terrain[u] * steps[k] if reverse else edge_costs[k])
+            if nd < dist[v]:
+                dist[v] = nd
+                pred[v] = u
+                heapq.heappush(pq, (nd, v))
+    return dist, pred
+
+
+def _to_costs(dist: List[float], integral: bool) -> np.ndarray:
+    cost = np.array(dist, dtype=np.float64)
+    cost[np.isinf(cost)] = UNREACHABLE
+    return cost.astype(np.int32) if integral else cost
+
+
+_WORKER_TABLE = None  # Set once per pool process by _init_sweep_worker, not shipped with every job
+
+
+def _init_sweep_worker(table: Tuple[list, list, list, list, list]):
+    global _WORKER_TABLE
+    _WORKER_TABLE = table
+
+
+def _matrix_row(args) -> np.ndarray:
+    integral, source, targets = args
+    dist, _ = _sweep(_WORKER_TABLE, source, False)
+    return _to_costs([dist[t] for t in targets], integral).astype(np.int64 if integral else np.float64)
+
+
+def map_fingerprint(env: GridEnvironment) -> str:
+    """Content hash of the static grid, used to key cached fields."""
+    digest = hashlib.sha1(np.ascontiguousarray(env.grid).tobytes())
+    digest.update(repr(env.grid.shape).encode())
+    return digest.hexdigest()
+
+
+class DistanceFields:
+    """One-to-all Dijkstra fields over the static grid, cached per (map, source).
+
+    Moving obstacles are ignored: fields describe the terrain only. Sweeps follow
+    the environment's movement model via its neighbor table.
+    """
+
+    def __init__(self, env: GridEnvironment, max_fields: int = 64):
+        self.env = env
+        self.rows, self.cols = env.rows, env.cols
+        self.max_fields = max_fields
+        self._cache: 'OrderedDict[Tuple, Tuple[np.ndarray, np.ndarray]]' = OrderedDict()
+        self._load()
+
+    def invalidate(self):
+        """Drop cached fields and rebuild the env's neighbor table; call after editing env.grid."""
+        self.env.invalidate_neighbor_table()
+        self._load()
+
+    def _load(self):
+        # Snapshot the env's current (shared) neighbor table as flat lists for the sweeps
+        nt = self.env.neighbor_table
+        self._table = (self.env.cost_grid().ravel().tolist(), nt.indptr.tolist(), nt.indices.tolist(),
+                       nt.steps.tolist(), nt.costs.tolist())
+        self.integral = bool(np.all(nt.steps == 1))  # 4-connected costs stay integers
+        self.symmetric = all((-dx, -dy) in self.env.stencil for dx, dy in self.env.stencil)
+        self.map_key = (map_fingerprint(self.env), tuple(self.env.stencil))
+        self._cache.clear()
+
+    def _index(self, pos: Tuple[int, int]) -> int:
+        return pos[0] * self.cols + pos[1]
+
+    def field(self, source: Tuple[int, int], reverse: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (cost grid, int32 predecessor grid) for one source.
+
+        Costs are from the source, or to it when reverse=True; UNREACHABLE marks
+        cells with no path. The cost grid is int32, or float64 when diagonal steps
+        make costs fractional. Predecessors are flat cell indices, -1 at the root.
+        """
+        key = (self.map_key, source, reverse)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        if reverse and not self.symmetric:
+            raise ValueError("Reverse fields need a symmetric movement stencil")
+        dist, pred = _sweep(self._table, self._index(source), reverse)
+        grids = (_to_costs(dist, self.integral).reshape(self.rows, self.cols),
+                 np.array(pred, dtype=np.int32).reshape(self.rows, self.cols))
+        self._cache[key] = grids
+        if len(self._cache) > self.max_fields:
+            self._cache.popitem(last=False)
+        return grids
+
+    def cost(self, source: Tuple[int, int], target: Tuple[int, int]) -> float:
+        value = self.field(source)[0][target].item()
+        return float('inf') if value == UNREACHABLE else value
+
+    def path(self, source: Tuple[int, int], target: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Extract source -> target from the cached field in O(path length)."""
+        dist, pred = self.field(source)
+        if dist[target] == UNREACHABLE:
+            return []
+        flat_pred = pred.ravel()
+        idx, path = self._index(target), []
+        while idx != -1:
+            path.append(divmod(idx, self.cols))
+            idx = int(flat_pred[idx])
+        path.reverse()
+        return path
+
+    def matrix(self, sources: Sequence[Tuple[int, int]], targets: Sequence[Tuple[int, int]], workers: int = 1) -> np.ndarray:
+        """Many-to-many cost matrix (len(sources) x len(targets)), one sweep per source.
+
+        int64 for 4-connected maps, float64 otherwise. With workers > 1 the sweeps
+        run on a process pool and are not cached.
+        """
+        dtype = np.int64 if self.integral else np.float64
+        target_idx = [self._index(t) for t in targets]
+        if workers <= 1 or len(sources) <= 1:
+            rows = [self.field(s)[0].ravel()[target_idx].astype(dtype) for s in sources]
+        else:
+            jobs = [(self.integral, self._index(s), target_idx) for s in sources]
+            from concurrent.futures import ProcessPoolExecutor  # Deferred: pulls in multiprocessing
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_sweep_worker,
+                                     initargs=(self._table,)) as pool:
+                rows = list(pool.map(_matrix_row, jobs))
+        return np.array(rows, dtype=dtype).reshape(len(sources), len(targets))
@@ -0,0 +1,174 @@
+import heapq
+import time
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+from grid import GridEnvironment
+
+
+class DStarLite:
+    """Incremental planner (D* Lite) that keeps its search state between replans.
+
+    The search runs backward from the goal, so moving the start or blocking a few
+    cells only re-expands the part of the tree whose costs actually changed.
+    Moves are 4-connected.
+    """
+
+    def __init__(self, env: GridEnvironment):
+        if env.movement != '4':
+            raise ValueError("D* Lite supports 4-connected movement only")
+        self.env = env
+        self.rows, self.cols = env.rows, env.cols
+        self.goal = self._index(env.goal)
+        size = self.rows * self.cols
+        # Static cell costs with walls as inf; blocked cells are patched in and restored
+        self.static_cost = env.cost_grid().ravel()
+        self.cost = self.static_cost.copy()
+        self.g = np.full(size, np.inf)
+        self.rhs = np.full(size, np.inf)
+        self.rhs[self.goal] = 0
+        self.blocked = set()  # Extra (x, y) cells blocked on top of the static map
+        self.km = 0
+        self.start = None
+        self.total_expanded = 0
+        self._heap = []
+        self._open: Dict[int, Tuple[float, float]] = {}  # idx -> key currently queued
+
+    def _index(self, pos: Tuple[int, int]) -> int:
+        return pos[0] * self.cols + pos[1]
+
+    def _position(self, idx: int) -> Tuple[int, int]:
+        return divmod(idx, self.cols)
+
+    def _heuristic(self, a: int, b: int) -> int:
+        ax, ay = divmod(a, self.cols)
+        bx, by = divmod(b, self.cols)
+        return abs(ax - bx) + abs(ay - by)
+
+    def _neighbors(self, idx: int) -> List[int]:
+        x, y = divmod(idx, self.cols)
+        nbrs = []
+        if x > 0:
+            nbrs.append(idx - self.cols)
+        if x < self.rows - 1:
+            nbrs.append(idx + self.cols)
+        if y > 0:
+            nbrs.append(idx - 1)
+        if y < self.cols - 1:
+            nbrs.append(idx + 1)
+        return nbrs
+
+    def _edge_cost(self, u: int, v: int) -> float:
+        # Entering v costs its terrain value; nothing leaves or enters a blocked cell
+        if self.cost[u] == np.inf:
+            return np.inf
+        return self.cost[v]
+
+    def _key(self, idx: int) -> Tuple[float, float]:
+        k2 = min(self.g[idx], self.rhs[idx])
+        return (k2 + self._heuristic(self.start, idx) + self.km, k2)
+
+    def _push(self, idx: int):
+        key = self._key(idx)
+        self._open[idx] = key
+        heapq.heappush(self._heap, (key[0], key[1], idx))
+
+    def _top(self):
+        # Drop heap entries whose key no longer matches the open list
+        while self._heap:
+            k1, k2, idx = self._heap[0]
+            if self._open.get(idx) == (k1, k2):
+                return (k1, k2), idx
+            heapq.heappop(self._heap)
+        return (np.inf, np.inf), None
+
+    def _update_vertex(self, idx: int):
+        if idx != self.goal:
+            self.rhs[idx] = min((self._edge_cost(idx, v) + self.g[v] for v in self._neighbors(idx)), default=np.inf)
+        self._open.pop(idx, None)
+        if self.g[idx] != self.rhs[idx]:
+            self._push(idx)
+
+    def _compute_shortest_path(self) -> int:
+        expanded = 0
+        while True:
+            k_old, idx = self._top()
+            if idx is None:
+                break
+            if k_old >= self._key(self.start) and self.rhs[self.start] == self.g[self.start]:
+                break
+            heapq.heappop(self._heap)
+            k_new = self._key(idx)
+            if k_old < k_new:
+                self._open[idx] = k_new
+                heapq.heappush(self._heap, (k_new[0], k_new[1], idx))
+                continue
+            del self._open[idx]
+            expanded += 1
+            if self.g[idx] > self.rhs[idx]:
+                self.g[idx] = self.rhs[idx]
+                for pred in self._neighbors(idx):
+                    self._update_vertex(pred)
+            else:
+                self.g[idx] = np.inf
+                self._update_vertex(idx)
+                for pred in self._neighbors(idx):
+                    self._update_vertex(pred)
+        return expanded
+
+    def update_cells(self, blocked: Iterable[Tuple[int, int]] = (), unblocked: Iterable[Tuple[int, int]] = ()):
+        """Block or restore cells and mark the affected vertices inconsistent."""
+        changed = []
+        for pos in blocked:
+            if self.env.get_cost(pos) == float('inf') or pos in self.blocked:
+                continue
+            self.blocked.add(pos)
+            idx = self._index(pos)
+            self.cost[idx] = np.inf
+            changed.append(idx)
+        for pos in unblocked:
+            if pos not in self.blocked:
+                continue
+            self.blocked.discard(pos)
+            idx = self._index(pos)
+            self.cost[idx] = self.static_cost[idx]
+            changed.append(idx)
+        if self.start is None:
+            return  # Nothing searched yet; costs are picked up by the first plan
+        for idx in changed:
+            self._update_vertex(idx)
+            for pred in self._neighbors(idx):
+                self._update_vertex(pred)
+
+    def set_blocked(self, cells: Iterable[Tuple[int, int]]):
+        """Replace the extra blocked set, restoring cells that are no longer listed."""
+        cells = set(cells)
+        self.update_cells(blocked=cells - self.blocked, unblocked=self.blocked - cells)
+
+    def plan(self, start: Tuple[int, int]) -> Tuple[List[Tuple[int, int]], Dict]:
+        start_time = time.time()
+        start_idx = self._index(start)
+        if self.start is None:
+            self.start = start_idx
+            self._push(self.goal)
+        elif start_idx != self.start:
+            self.km += self._heuristic(self.start, start_idx)
+            self.start = start_idx
+        expanded = self._compute_shortest_path()
+        self.total_expanded += expanded
+        path = self._extract_path(start_idx)
+        cost = float('inf') if not path else sum(int(self.cost[self._index(p)]) for p in path[1:])
+        return path, {'cost': cost, 'nodes': expanded, 'time': time.time() - start_time}
+
+    def _extract_path(self, start_idx: int) -> List[Tuple[int, int]]:
+        if self.g[start_idx] == np.inf:
+            return []
+        path = [self._position(start_idx)]
+        idx = start_idx
+        for _ in range(self.rows * self.cols):
+            if idx == self.goal:
+                return path
+            idx = min(self._neighbors(idx), key=lambda v: self._edge_cost(idx, v) + self.g[v])
+            if self.g[idx] == np.inf:
+                return []
+            path.append(self._position(idx))
+        return []
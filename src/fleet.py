@@ -0,0 +1,252 @@
+import heapq
+import math
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from grid import GridEnvironment
+
+Query = Tuple[Tuple[int, int], Tuple[int, int]]
+
+
+class ReservationTable:
+    """Space-time reservations shared by a fleet: (cell, t) vertices, (u, v, t) moves, parked goals."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.vertices = set()  # t * size + cell
+        self.edges = set()  # (u, v, t): some agent moves u -> v between t and t + 1
+        self.parked: Dict[int, int] = {}  # cell -> time an agent arrives there and stays
+        self.last_use: Dict[int, int] = {}  # cell -> latest reserved time step
+
+    def blocked(self, cell: int, t: int) -> bool:
+        if t * self.size + cell in self.vertices:
+            return True
+        parked_at = self.parked.get(cell)
+        return parked_at is not None and t >= parked_at
+
+    def swap(self, u: int, v: int, t: int) -> bool:
+        # Moving u -> v at t collides head-on with a reserved v -> u at the same t
+        return (v, u, t) in self.edges
+
+    def reserve(self, path: Sequence[int], t0: int = 0):
+        for i, cell in enumerate(path):
+            self.vertices.add((t0 + i) * self.size + cell)
+            self.last_use[cell] = max(self.last_use.get(cell, -1), t0 + i)
+            if i:
+                self.edges.add((path[i - 1], cell, t0 + i - 1))
+        self.parked[path[-1]] = t0 + len(path) - 1
+
+
+class _TrueDistance:
+    """Reverse resumable A* (RRA*) from one goal: exact static cost-to-goal, computed on demand.
+
+    The search runs backwards toward the agent's start and is resumed only when the
+    space-time search expands a cell outside the closed set; cells that are merely
+    generated get the cheaper lower bound from bound().
+    """
+
+    def __init__(self, planner: 'FleetPlanner', goal: int, start: int):
+        self.p = planner
+        self.start = divmod(start, planner.cols)
+        self.goal = divmod(goal, planner.cols)
+        self.closed: Dict[int, float] = {}
+        self.g = {goal: 0}
+        self.pq = [(self._h(goal), 0, goal)]
+
+    def _h(self, cell: int) -> float:
+        return self.p.estimate(divmod(cell, self.p.cols), self.start)
+
+    def bound(self, cell: int) -> float:
+        if cell in self.closed:
+            return self.closed[cell]
+        if not self.pq:
+            return math.inf  # Search exhausted: cell cannot reach the goal
+        # With a consistent heuristic, every cell with f below the open minimum is closed
+        pos = divmod(cell, self.p.cols)
+        return max(self.p.estimate(pos, self.goal), self.pq[0][0] - self.p.estimate(pos, self.start))
+
+    def __call__(self, cell: int) -> float:
+        closed = self.closed
+        if cell in closed:
+            return closed[cell]
+        terrain, indptr, indices, steps = self.p._terrain, self.p._indptr, self.p._indices, self.p._steps
+        g, pq = self.g, self.pq
+        cols, (sx, sy) = self.p.cols, self.start
+        manhattan = self.p.env.movement == '4'  # Inlined: this loop dominates fleet planning
+        while pq:
+            _, d, v = heapq.heappop(pq)
+            if v in closed:
+                continue
+            closed[v] = d
+            enter = terrain[v]
+            for k in range(indptr[v], indptr[v + 1]):
+                u = indices[k]
+                nd = d + enter * steps[k]  # Cost of the forward move u -> v (stencils are symmetric)
+                if u not in closed and nd < g.get(u, math.inf):
+                    g[u] = nd
+                    if manhattan:
+                        x, y = divmod(u, cols)
+                        heapq.heappush(pq, (nd + abs(x - sx) + abs(y - sy), nd, u))
+                    else:
+                        heapq.heappush(pq, (nd + self._h(u), nd, u))
+            if v == cell:
+                return d
+        closed[cell] = math.inf
+        return math.inf
+
+
+class FleetPlanner:
+    """Prioritized cooperative A*: agents plan one at a time in space-time.
+
+    Each finished path is written to a shared ReservationTable, so later agents
+    treat earlier ones (and scripted .dyn obstacles) as moving obstacles. Agents
+    may wait in place; moves cost the terrain of the entered cell, waits cost 1.
+    Vertex and head-on swap conflicts are both ruled out, and agents park at
+    their goals once they arrive.
+    """
+
+    def __init__(self, env: GridEnvironment, max_time: Optional[int] = None):
+        self.env = env
+        self.cols = env.cols
+        self.size = env.rows * env.cols
+        self.max_time = max_time or 4 * (env.rows + env.cols)
+        if not all((-dx, -dy) in env.stencil for dx, dy in env.stencil):
+            raise ValueError("Fleet planning needs a symmetric movement stencil")
+        table = env.neighbor_table
+        self._terrain = env.cost_grid().ravel().tolist()
+        self._indptr = table.indptr.tolist()
+        self._indices = table.indices.tolist()
+        self._steps = table.steps.tolist()
+        self._costs = table.costs.tolist()
+
+    def estimate(self, a: Tuple[int, int], b: Tuple[int, int]) -> float:
+        # Admissible lower bound on terrain cost (every cell costs at least 1)
+        dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+        if self.env.movement == '4':
+            return dx + dy
+        if self.env.movement == '8':
+            return max(dx, dy) + (math.sqrt(2) - 1) * min(dx, dy)
+        return 0
+
+    def plan(self, queries: Sequence[Query], order: str = 'given') -> Tuple[List[List[Tuple[int, int]]], Dict]:
+        """Plan every (start, goal) query; returns one path per agent ([] if it failed) and stats."""
+        start_time = time.perf_counter()
+        starts = [s[0] * self.cols + s[1] for s, _ in queries]
+        goals = [g[0] * self.cols + g[1] for _, g in queries]
+        agents = list(range(len(queries)))
+        if order == 'longest':
+            agents.sort(key=lambda a: -self.estimate(queries[a][0], queries[a][1]))
+        table = ReservationTable(self.size)
+        for s in starts:
+            table.vertices.add(s)  # Everyone occupies their start at t = 0
+        paths: List[List[Tuple[int, int]]] = [[] for _ in queries]
+        stats = {'agents': len(queries), 'planned': 0, 'failed': 0, 'nodes': 0, 'blocked_moves': 0}
+        for a in agents:
+            table.vertices.discard(starts[a])
+            cells, nodes, blocked = self._space_time_astar(starts[a], goals[a], table)
+            stats['nodes'] += nodes
+            stats['blocked_moves'] += blocked
+            if cells:
+                table.reserve(cells)
+                paths[a] = [divmod(c, self.cols) for c in cells]
+                stats['planned'] += 1
+            else:
+                table.parked[starts[a]] = 0  # Stranded at its start for the whole horizon
+                stats['failed'] += 1
+        elapsed = time.perf_counter() - start_time
+        done = [p for p in paths if p]
+        stats.update(
+            time=elapsed,
+            agents_per_sec=len(queries) / elapsed if elapsed > 0 else 0.0,
+            makespan=max((len(p) - 1 for p in done), default=0),
+            sum_of_steps=sum(len(p) - 1 for p in done),
+            conflicts=len(find_conflicts(done)),
+        )
+        return paths, stats
+
+    def _space_time_astar(self, start: int, goal: int, table: ReservationTable) -> Tuple[List[int], int, int]:
+        size, cols = self.size, self.cols
+        indptr, indices, costs = self._indptr, self._indices, self._costs
+        dynamic = bool(self.env.moving_obstacles)
+        h = _TrueDistance(self, goal, start)
+        if h(start) == math.inf:
+            return [], 0, 0
+        # Parking is only safe once nobody else passes the goal; every time step costs at
+        # least 1, so arriving no earlier than `free_at` bounds the remaining cost too.
+        free_at = table.last_use.get(goal, -1) + 1
+        # Heap of (f, -t, h, g, state) with state = t * size + cell; ties go deeper, then closer
+        pq = [(max(h(start), free_at), 0, h(start), 0, start)]
+        best = {start: 0}
+        parent = {start: -1}
+        nodes = blocked = 0
+        while pq:
+            _, neg_t, hs, g, state = heapq.heappop(pq)
+            if g > best[state]:
+                continue
+            t, cell = -neg_t, state % size
+            if cell not in h.closed:
+                exact = h(cell)
+                if exact > hs:  # Generated with a lower bound; requeue at its true priority
+                    if exact < math.inf:
+                        heapq.heappush(pq, (g + max(exact, free_at - t), neg_t, exact, g, state))
+                    continue
+            nodes += 1
+            if cell == goal and t >= free_at:
+                cells = []
+                while state != -1:
+                    cells.append(state % size)
+                    state = parent[state]
+                return cells[::-1], nodes, blocked
+            if t >= self.max_time:
+                continue
+            nt = t + 1
+            moves = [(cell, 1)]  # Wait in place
+            moves.extend((indices[k], costs[k]) for k in range(indptr[cell], indptr[cell + 1]))
+            for nxt, cost in moves:
+                if table.blocked(nxt, nt) or (nxt != cell and table.swap(cell, nxt, t)):
+                    blocked += 1
+                    continue
+                if dynamic and self.env.is_occupied(divmod(nxt, cols), nt):
+                    blocked += 1
+                    continue
+                nstate = nt * size + nxt
+                ng = g + cost
+                if ng < best.get(nstate, math.inf):
+                    best[nstate] = ng
+                    parent[nstate] = state
+                    hn = h.bound(nxt)
+                    heapq.heappush(pq, (ng + max(hn, free_at - nt), -nt, hn, ng, nstate))
+        return [], nodes, blocked
+
+
+def find_conflicts(paths: Sequence[Sequence[Tuple[int, int]]]) -> List[Tuple]:
+    """Vertex and swap conflicts between timed paths (agents stay at their last cell)."""
+    conflicts = []
+    horizon = max((len(p) for p in paths), default=0)
+    for t in range(horizon):
+        seen: Dict[Tuple[int, int], int] = {}
+        for a, path in enumerate(paths):
+            pos = path[min(t, len(path) - 1)]
+            if pos in seen:
+                conflicts.append(('vertex', seen[pos], a, pos, t))
+            seen[pos] = a
+        if t + 1 < horizon:
+            moves = {}
+            for a, path in enumerate(paths):
+                u, v = path[min(t, len(path) - 1)], path[min(t + 1, len(path) - 1)]
+                if u != v:
+                    if (v, u) in moves:
+                        conflicts.append(('swap', moves[(v, u)], a, u, t))
+                    moves[(u, v)] = a
+    return conflicts
+
+
+def random_queries(env: GridEnvironment, count: int, seed: int = 0) -> List[Query]:
+    """Distinct random free start cells and distinct free goal cells."""
+    rng = np.random.default_rng(seed)
+    free = np.argwhere(env.grid != -1)
+    if len(free) < count:
+        raise ValueError(f"Map has {len(free)} free cells, not enough for {count} agents")
+    starts = free[rng.choice(len(free), count, replace=False)].tolist()
+    goals = free[rng.choice(len(free), count, replace=False)].tolist()
+    return [(tuple(s), tuple(g)) for s, g in zip(starts, goals)]
@@ -1,17 +1,181 @@
 import numpy as np
+import math
 import os
-from typing import List, Tuple, Dict
+import struct
+from functools import reduce
+from typing import List, Optional, Tuple, Dict
+
+OCCUPANCY_TABLE_LIMIT = 1 << 24  # Max (LCM period * cells) for the dense time-indexed table
+
+# Binary map layout: fixed header, raw C-order cost array, optional dynamics section
+BINARY_MAGIC = b'GRIDMAP1'
+BINARY_HEADER = struct.Struct('<8s4i2IBxxxQ')  # magic, sx sy gx gy, rows cols, dtype code, dyn offset
+BINARY_DATA_OFFSET = 64
+BINARY_DTYPES = {1: np.int8, 2: np.int16}
+TILED_MAGIC = b'GRIDTIL1'  # Out-of-core layout, see tiled.py
+
+# Movement models: neighbor offsets in the order successors reports them
+STENCILS = {
+    '4': [(-1, 0), (1, 0), (0, -1), (0, 1)],
+    '8': [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)],
+}
+
+
+def _shifted(a: np.ndarray, dx: int, dy: int) -> np.ndarray:
+    # out[x, y] = a[x + dx, y + dy], False where that falls off the grid
+    rows, cols = a.shape
+    out = np.zeros_like(a)
+    out[max(-dx, 0):rows - max(dx, 0), max(-dy, 0):cols - max(dy, 0)] = \
+        a[max(dx, 0):rows + min(dx, 0), max(dy, 0):cols + min(dy, 0)]
+    return out
+
+
+class NeighborTable:
+    """CSR adjacency for one map and stencil, built once with NumPy.
+
+    Edges out of cell i (flat index row * cols + col) are indices[indptr[i]:indptr[i+1]],
+    with length multipliers in steps and edge costs (target terrain * step) in costs.
+    Only passable targets are listed; unit diagonals also need both orthogonal cells
+    free, so paths never cut corners.
+    """
+
+    def __init__(self, grid: np.ndarray, stencil: List[Tuple[int, int]]):
+        rows, cols = grid.shape
+        passable = np.asarray(grid) != -1
+        sources, targets, steps = [], [], []
+        for dx, dy in stencil:
+            valid = _shifted(passable, dx, dy)
+            if abs(dx) == 1 and abs(dy) == 1:
+                valid &= _shifted(passable, dx, 0) & _shifted(passable, 0, dy)
+            src = np.flatnonzero(valid)
+            sources.append(src)
+            targets.append(src + dx * cols + dy)
+            steps.append(np.full(len(src), math.hypot(dx, dy)))
+        src = np.concatenate(sources)
+        order = np.argsort(src, kind='stable')  # Group by source, stencil order within a cell
+        self.indices = np.concatenate(targets)[order].astype(np.int32 if rows * cols < 2 ** 31 else np.int64)
+        self.steps = np.concatenate(steps)[order]
+        self.indptr = np.zeros(rows * cols + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=rows * cols), out=self.indptr[1:])
+        terrain = np.where(passable, grid, 0).ravel()
+        if np.all(self.steps == 1):
+            self.costs = terrain[self.indices].astype(np.int64)  # Keep integer costs for 4-connected
+        else:
+            self.costs = terrain[self.indices] * self.steps
+
+
+def is_binary_map(file: str) -> bool:
+    with open(file, 'rb') as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def is_tiled_map(file: str) -> bool:
+    with open(file, 'rb') as f:
+        return f.read(len(TILED_MAGIC)) == TILED_MAGIC
+
+
+def resolve_map(name: str, maps_dir: str = 'maps',
+                extensions: Tuple[str, ...] = ('.gmap', '.map')) -> Tuple[str, Optional[str]]:
+    """(map file, dyn file) for a map path, or the first maps_dir/<name><ext> that exists.
+
+    Binary and tiled maps carry their own dynamics; text maps pick up a .dyn alongside.
+    """
+    if os.path.isfile(name):
+        map_file = name
+    else:
+        candidates = [os.path.join(maps_dir, f'{name}{ext}') for ext in extensions]
+        map_file = next((f for f in candidates if os.path.exists(f)), None)
+        if map_file is None:
+            raise FileNotFoundError(f"Map file for {name!r} not found (tried {', '.join(candidates)})")
+    stem = os.path.splitext(map_file)[0]
+    text = not (is_binary_map(map_file) or is_tiled_map(map_file))
+    dyn_file = f'{stem}.dyn' if text and os.path.exists(f'{stem}.dyn') else None
+    return map_file, dyn_file
+
+
+def save_binary_map(env: 'GridEnvironment', out_file: str):
+    """Write env's grid, start/goal and moving obstacles in the binary map format."""
+    peak = int(np.abs(env.grid).max()) if env.grid.size else 0
+    if peak > np.iinfo(np.int16).max:
+        raise ValueError(f"Terrain cost {peak} does not fit the int16 binary format.")
+    code = 1 if peak <= np.iinfo(np.int8).max else 2
+    data = np.ascontiguousarray(env.grid, dtype=BINARY_DTYPES[code])
+    dyn_offset = BINARY_DATA_OFFSET + data.nbytes if env.moving_obstacles else 0
+    with open(out_file, 'wb') as f:
+        f.write(BINARY_HEADER.pack(BINARY_MAGIC, *env.start, *env.goal, env.rows, env.cols, code, dyn_offset).ljust(BINARY_DATA_OFFSET, b'\0'))
+        f.write(data.tobytes())
+        if dyn_offset:
+            write_binary_dynamic(f, env.moving_obstacles)
+
+
+def write_binary_dynamic(f, moving_obstacles: Dict[str, Dict]):
+    """Moving-obstacle section shared by the binary and tiled map formats."""
+    f.write(struct.pack('<I', len(moving_obstacles)))
+    for obs_id, obs in moving_obstacles.items():
+        name = obs_id.encode()
+        f.write(struct.pack('<H', len(name)) + name)
+        f.write(struct.pack('<2iI', *obs['pos'], len(obs['path'])))
+        f.write(np.asarray(obs['path'], dtype='<i4').reshape(-1, 2).tobytes())
 
 class GridEnvironment:
-    def __init__(self, map_file: str, dyn_file: str = None):
+    version = 0  # Bumped by set_movement/invalidate_neighbor_table/build_occupancy_index, i.e. after edits
+
+    def __init__(self, map_file: str, dyn_file: str = None, movement='4'):
         if not os.path.exists(map_file):
             raise FileNotFoundError(f"Map file not found: {map_file}. Ensure maps/ directory has the file.")
-        self.grid = self._load_map(map_file)
+        self.moving_obstacles: Dict[str, Dict] = {}
+        if is_binary_map(map_file):
+            self.grid = self._load_binary_map(map_file)  # Also picks up embedded dynamics
+        else:
+            self.grid = self._load_map(map_file)
         self.rows, self.cols = self.grid.shape
         # start and goal are now set in _load_map; no need for _parse_positions
         self.obstacles = self._find_static_obstacles()
-        self.moving_obstacles: Dict[str, Dict] = self._load_dynamic(dyn_file) if dyn_file else {}
+        if dyn_file:
+            self.moving_obstacles = self._load_dynamic(dyn_file)
         self.horizon = 10  # Planning lookahead for dynamics
+        self.set_movement(movement)
+        self.build_occupancy_index()
+
+    @classmethod
+    def from_array(cls, grid: np.ndarray, start: Tuple[int, int], goal: Tuple[int, int],
+                   moving_obstacles: Dict[str, Dict] = None, movement='4') -> 'GridEnvironment':
+        """Build an environment from an in-memory grid (e.g. a generated map)."""
+        env = cls.__new__(cls)
+        env.grid = np.array(grid, dtype=int)
+        env.grid[env.grid == 0] = 1  # Normalize free to cost 1, as in _load_map
+        env.rows, env.cols = env.grid.shape
+        env.start, env.goal = tuple(start), tuple(goal)
+        env.obstacles = env._find_static_obstacles()
+        env.moving_obstacles = moving_obstacles or {}
+        env.horizon = 10
+        env.set_movement(movement)
+        env.build_occupancy_index()
+        return env
+
+    def set_movement(self, movement='4'):
+        """Choose '4', '8' (octile costs, no corner cutting) or a custom list of (dx, dy) offsets."""
+        if isinstance(movement, str):
+            if movement not in STENCILS:
+                raise ValueError(f"Unknown movement model {movement!r}; use '4', '8' or a list of (dx, dy) offsets")
+            self.stencil = STENCILS[movement]
+        else:
+            self.stencil = [(int(dx), int(dy)) for dx, dy in movement]
+            if not self.stencil or (0, 0) in self.stencil:
+                raise ValueError("Custom stencil needs at least one non-zero (dx, dy) offset")
+        self.movement = movement if isinstance(movement, str) else 'custom'
+        self.invalidate_neighbor_table()
+
+    @property
+    def neighbor_table(self) -> NeighborTable:
+        """Built on first use; call invalidate_neighbor_table() after editing grid."""
+        if self._neighbor_table is None:
+            self._neighbor_table = NeighborTable(self.grid, self.stencil)
+        return self._neighbor_table
+
+    def invalidate_neighbor_table(self):
+        self._neighbor_table = None
+        self.version += 1
 
     def _load_map(self, file: str) -> np.ndarray:
         try:
@@ -42,8 +206,36 @@ class GridEnvironment:
         except (ValueError, IndexError, TypeError) as e:
             raise ValueError(f"Error parsing map {file}: {e}. Check format: First line 'sx sy gx gy', then grid rows.")
 
+    def _load_binary_map(self, file: str) -> np.ndarray:
+        # Zero-copy: the cost array is memory-mapped copy-on-write, never read into RAM up front
+        try:
+            with open(file, 'rb') as f:
+                header = f.read(BINARY_HEADER.size)
+                _, sx, sy, gx, gy, rows, cols, code, dyn_offset = BINARY_HEADER.unpack(header)
+                if code not in BINARY_DTYPES:
+                    raise ValueError(f"unknown dtype code {code}")
+                if dyn_offset:
+                    f.seek(dyn_offset)
+                    self.moving_obstacles = self._read_binary_dynamic(f)
+            self.start = (sx, sy)
+            self.goal = (gx, gy)
+            return np.memmap(file, dtype=BINARY_DTYPES[code], mode='c', offset=BINARY_DATA_OFFSET, shape=(rows, cols))
+        except (struct.error, ValueError) as e:
+            raise ValueError(f"Error parsing binary map {file}: {e}. Re-create it with convert_map.")
+
+    def _read_binary_dynamic(self, f) -> Dict[str, Dict]:
+        obs = {}
+        (count,) = struct.unpack('<I', f.read(4))
+        for _ in range(count):
+            (name_len,) = struct.unpack('<H', f.read(2))
+            obs_id = f.read(name_len).decode()
+            sx, sy, n_points = struct.unpack('<2iI', f.read(12))
+            coords = np.frombuffer(f.read(8 * n_points), dtype='<i4').reshape(-1, 2)
+            obs[obs_id] = {'pos': (sx, sy), 'path': [tuple(p) for p in coords.tolist()], 'speed': 1}
+        return obs
+
     def _find_static_obstacles(self) -> List[Tuple[int, int]]:
-        return [(i, j) for i in range(self.rows) for j in range(self.cols) if self.grid[i, j] == -1]
+        return [tuple(p) for p in np.argwhere(self.grid == -1).tolist()]
 
     def _load_dynamic(self, file: str) -> Dict[str, Dict]:
         obs = {}
@@ -75,33 +267,109 @@ class GridEnvironment:
             print(f"Warning: Failed to load dynamic file {file}: {e}. Using no dynamics.")
             return {}
 
+    def build_occupancy_index(self):
+        """Precompute dynamic occupancy; call again after editing moving_obstacles."""
+        self.version += 1
+        self.occupancy = None  # (period, rows, cols) bool table when it fits
+        self.occupancy_period = 1
+        self.dynamic_period = 1  # LCM of obstacle periods: the whole scene repeats after this many steps
+        self._phase_cells: Dict[int, List[set]] = {}  # Fallback: period -> cells occupied per phase
+        paths = [obs['path'] for obs in self.moving_obstacles.values() if obs['path']]
+        if not paths:
+            return
+        period = reduce(math.lcm, (len(path) for path in paths), 1)
+        self.dynamic_period = period
+        if period * self.rows * self.cols <= OCCUPANCY_TABLE_LIMIT:
+            table = np.zeros((period, self.rows, self.cols), dtype=bool)
+            times = np.arange(period)
+            for path in paths:
+                coords = np.asarray(path, dtype=np.int64)[times % len(path)]
+                xs, ys = coords[:, 0], coords[:, 1]
+                inside = (xs >= 0) & (xs < self.rows) & (ys >= 0) & (ys < self.cols)
+                table[times[inside], xs[inside], ys[inside]] = True
+            self.occupancy = table
+            self.occupancy_period = period
+            return
+        # LCM too large for a dense table: one set per phase of each distinct period
+        for path in paths:
+            phases = self._phase_cells.setdefault(len(path), [set() for _ in path])
+            for t, obs_pos in enumerate(path):
+                phases[t].add(tuple(obs_pos))
+
+    def cost_grid(self) -> np.ndarray:
+        """Float copy of the terrain costs with walls as inf, for array-based searches."""
+        return np.where(self.grid == -1, np.inf, self.grid).astype(np.float64)
+
     def get_cost(self, pos: Tuple[int, int]) -> int:
         x, y = pos
         if 0 <= x < self.rows and 0 <= y < self.cols and self.grid[x, y] != -1:
-            return self.grid[x, y]
+            return int(self.grid[x, y])  # Plain int: narrow binary-map dtypes would overflow in sums
         return float('inf')
 
+    def edge_cost(self, a: Tuple[int, int], b: Tuple[int, int]) -> float:
+        """Cost of one move a -> b under the movement model; inf if it is not a legal step."""
+        dx, dy = b[0] - a[0], b[1] - a[1]
+        if (dx, dy) not in self.stencil:
+            return float('inf')
+        cost = self.get_cost(b)
+        if cost == float('inf'):
+            return cost
+        if abs(dx) == 1 and abs(dy) == 1:
+            if self.get_cost((a[0] + dx, a[1])) == float('inf') or self.get_cost((a[0], a[1] + dy)) == float('inf'):
+                return float('inf')  # No corner cutting
+            return cost * math.sqrt(2)
+        return cost if abs(dx) + abs(dy) == 1 else cost * math.hypot(dx, dy)
+
     def is_occupied(self, pos: Tuple[int, int], time: int) -> bool:
         # Check static
         if self.get_cost(pos) == float('inf'):
             return True
-        # Check dynamic at time t (mod path length)
-        for obs in self.moving_obstacles.values():
-            path = obs['path']
-            path_len = len(path)
-            if path_len > 0:
-                obs_pos = path[time % path_len]
-                if obs_pos == pos:
-                    return True
+        # Check dynamic at time t (mod obstacle period)
+        if self.occupancy is not None:
+            return bool(self.occupancy[time % self.occupancy_period, pos[0], pos[1]])
+        for period, phases in self._phase_cells.items():
+            if pos in phases[time % period]:
+                return True
         return False
 
+    def occupied_mask(self, positions: np.ndarray, time: int) -> np.ndarray:
+        """Vectorized is_occupied for an (N, 2) array of positions at one time step."""
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+        xs, ys = positions[:, 0], positions[:, 1]
+        inside = (xs >= 0) & (xs < self.rows) & (ys >= 0) & (ys < self.cols)
+        mask = ~inside
+        xi, yi = xs[inside], ys[inside]
+        blocked = self.grid[xi, yi] == -1
+        if self.occupancy is not None:
+            blocked |= self.occupancy[time % self.occupancy_period, xi, yi]
+        else:
+            for period, phases in self._phase_cells.items():
+                cells = phases[time % period]
+                if cells:
+                    blocked |= np.fromiter(((x, y) in cells for x, y in zip(xi.tolist(), yi.tolist())), dtype=bool, count=len(xi))
+        mask[inside] = blocked
+        return mask
+
     def successors(self, pos: Tuple[int, int], time: int) -> List[Tuple[Tuple[int, int], int]]:
-        dirs = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # 4-connected
-        succ = []
-        for dx, dy in dirs:
-            new_pos = (pos[0] + dx, pos[1] + dy)
-            if not self.is_occupied(new_pos, time + 1):
-                cost = self.get_cost(new_pos)
-                if cost != float('inf'):
-                    succ.append((new_pos, cost))
-        return succ 
\ No newline at end of file
+        """Moves out of pos when the agent is there at `time`; targets held by a moving obstacle at time + 1 are dropped."""
+        x, y = pos
+        if not (0 <= x < self.rows and 0 <= y < self.cols):
+            return []
+        return self._unoccupied(self._edges(x * self.cols + y), time)
+
+    def _edges(self, idx: int) -> List[Tuple[Tuple[int, int], int]]:
+        # Static moves and their costs out of flat cell idx, straight from the neighbor table
+        table = self.neighbor_table
+        lo, hi = table.indptr[idx], table.indptr[idx + 1]
+        cols = self.cols
+        return [(divmod(nbr, cols), cost) for nbr, cost in zip(table.indices[lo:hi].tolist(), table.costs[lo:hi].tolist())]
+
+    def _unoccupied(self, succ: List[Tuple[Tuple[int, int], int]], time: int) -> List[Tuple[Tuple[int, int], int]]:
+        if not self.moving_obstacles:
+            return succ
+        # Static walls are already excluded; only moving obstacles remain
+        t = time + 1
+        if self.occupancy is not None:
+            frame = self.occupancy[t % self.occupancy_period]
+            return [s for s in succ if not frame[s[0]]]
+        return [s for s in succ if not any(s[0] in phases[t % period] for period, phases in self._phase_cells.items())]
@@ -0,0 +1,246 @@
+import heapq
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from grid import GridEnvironment
+from distance import map_fingerprint
+
+Cluster = Tuple[int, int]
+
+
+class HPAPlanner:
+    """Hierarchical path-finding (HPA*) over square clusters of a static grid.
+
+    Entrances between neighbouring clusters and the costs between them are
+    precomputed once; queries search the small abstract graph and refine only
+    the clusters the abstract path passes through. Moves are 4-connected and
+    moving obstacles are ignored.
+    """
+
+    def __init__(self, env: GridEnvironment, cluster_size: int = 10, build: bool = True):
+        if env.movement != '4':
+            raise ValueError("HPA* supports 4-connected movement only")
+        if cluster_size < 2:
+            raise ValueError("cluster_size must be at least 2")
+        self.env = env
+        self.cluster_size = cluster_size
+        self.rows, self.cols = env.rows, env.cols
+        self.cluster_rows = -(-self.rows // cluster_size)
+        self.cluster_cols = -(-self.cols // cluster_size)
+        self._costs = env.cost_grid().ravel().tolist()
+        self.transitions: Dict[Tuple[Cluster, Cluster], List[Tuple[int, int]]] = {}  # border -> (cell in first, cell in second)
+        self.intra: Dict[Cluster, Dict[int, Dict[int, float]]] = {}  # cluster -> u -> v -> in-cluster cost
+        self.inter: Dict[int, Dict[int, float]] = {}  # u -> v -> cost of stepping across a border
+        if build:
+            self.build()
+
+    def build(self):
+        for c in self._clusters():
+            for nbr in ((c[0], c[1] + 1), (c[0] + 1, c[1])):
+                if nbr[0] < self.cluster_rows and nbr[1] < self.cluster_cols:
+                    self.transitions[(c, nbr)] = self._find_transitions(c, nbr)
+        for c in self._clusters():
+            self._build_intra(c)
+        self._build_inter()
+
+    def _clusters(self) -> Iterable[Cluster]:
+        return ((cx, cy) for cx in range(self.cluster_rows) for cy in range(self.cluster_cols))
+
+    def _cluster_of(self, idx: int) -> Cluster:
+        x, y = divmod(idx, self.cols)
+        return (x // self.cluster_size, y // self.cluster_size)
+
+    def _bounds(self, c: Cluster) -> Tuple[int, int, int, int]:
+        x0, y0 = c[0] * self.cluster_size, c[1] * self.cluster_size
+        return x0, min(x0 + self.cluster_size, self.rows), y0, min(y0 + self.cluster_size, self.cols)
+
+    def _borders(self, c: Cluster) -> List[Tuple[Cluster, Cluster]]:
+        cx, cy = c
+        keys = [((cx, cy - 1), c), (c, (cx, cy + 1)), ((cx - 1, cy), c), (c, (cx + 1, cy))]
+        return [key for key in keys if key in self.transitions]
+
+    def _find_transitions(self, first: Cluster, second: Cluster) -> List[Tuple[int, int]]:
+        x0, x1, y0, y1 = self._bounds(first)
+        if first[0] == second[0]:  # Side by side: walk the shared column pair
+            pairs = [(x * self.cols + y1 - 1, x * self.cols + y1) for x in range(x0, x1)]
+        else:  # Stacked: walk the shared row pair
+            pairs = [((x1 - 1) * self.cols + y, x1 * self.cols + y) for y in range(y0, y1)]
+        inf = float('inf')
+        transitions, run = [], []
+        for a, b in pairs + [(None, None)]:
+            if a is not None and self._costs[a] != inf and self._costs[b] != inf:
+                run.append((a, b))
+                continue
+            # Short entrances get one transition in the middle, long ones one at each end
+            if len(run) >= 6:
+                transitions.extend([run[0], run[-1]])
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+        return transitions
+
+    def _cluster_nodes(self, c: Cluster) -> Set[int]:
+        nodes = set()
+        for key in self._borders(c):
+            side = 0 if key[0] == c else 1
+            nodes.update(pair[side] for pair in self.transitions[key])
+        return nodes
+
+    def _cluster_search(self, source: int, c: Cluster, reverse: bool = False) -> Tuple[Dict[int, float], Dict[int, int]]:
+        # Dijkstra confined to one cluster; reverse=True gives costs *to* the source
+        x0, x1, y0, y1 = self._bounds(c)
+        costs, cols = self._costs, self.cols
+        dist, pred = {source: 0}, {source: -1}
+        pq = [(0, source)]
+        while pq:
+            d, u = heapq.heappop(pq)
+            if d > dist[u]:
+                continue
+            x, y = divmod(u, cols)
+            for v, ok in ((u - cols, x > x0), (u + cols, x < x1 - 1), (u - 1, y > y0), (u + 1, y < y1 - 1)):
+                if not ok or costs[v] == float('inf'):
+                    continue
+                nd = d + (costs[u] if reverse else costs[v])
+                if nd < dist.get(v, float('inf')):
+                    dist[v] = nd
+                    pred[v] = u
+                    heapq.heappush(pq, (nd, v))
+        return dist, pred
+
+    def _build_intra(self, c: Cluster):
+        nodes = self._cluster_nodes(c)
+        edges = {}
+        for u in nodes:
+            dist, _ = self._cluster_search(u, c)
+            edges[u] = {v: dist[v] for v in nodes if v != u and v in dist}
+        self.intra[c] = edges
+
+    def _build_inter(self):
+        self.inter = {}
+        for pairs in self.transitions.values():
+            for a, b in pairs:
+                self.inter.setdefault(a, {})[b] = self._costs[b]
+                self.inter.setdefault(b, {})[a] = self._costs[a]
+
+    def update_cells(self, cells: Iterable[Tuple[int, int]]) -> Set[Cluster]:
+        """Re-read changed terrain from env.grid and rebuild only the touched clusters."""
+        touched = set()
+        for x, y in cells:
+            idx = x * self.cols + y
+            value = self.env.grid[x, y]
+            self._costs[idx] = float('inf') if value == -1 else float(value)
+            touched.add(self._cluster_of(idx))
+        rebuild = set(touched)
+        for c in touched:
+            for key in self._borders(c):
+                self.transitions[key] = self._find_transitions(*key)
+                rebuild.update(key)  # Entrances moved on both sides of the border
+        for c in rebuild:
+            self._build_intra(c)
+        self._build_inter()
+        return rebuild
+
+    def save(self, file: str):
+        """Persist the abstraction (entrances and intra-cluster costs) as .npz."""
+        trans = [(*k[0], *k[1], a, b) for k, pairs in self.transitions.items() for a, b in pairs]
+        borders = np.array([(*k[0], *k[1]) for k in self.transitions], dtype=np.int64).reshape(-1, 4)
+        edges = [(u, v, cost) for c in self.intra.values() for u, nbrs in c.items() for v, cost in nbrs.items()]
+        np.savez_compressed(file, fingerprint=map_fingerprint(self.env), cluster_size=self.cluster_size,
+                            borders=borders,
+                            transitions=np.array(trans, dtype=np.int64).reshape(-1, 6),
+                            edges=np.array(edges, dtype=np.float64).reshape(-1, 3))
+
+    @classmethod
+    def load(cls, env: GridEnvironment, file: str) -> 'HPAPlanner':
+        data = np.load(file)
+        if str(data['fingerprint']) != map_fingerprint(env):
+            raise ValueError(f"Abstraction in {file} was built for a different map.")
+        hpa = cls(env, int(data['cluster_size']), build=False)
+        for cx1, cy1, cx2, cy2 in data['borders'].tolist():
+            hpa.transitions[((cx1, cy1), (cx2, cy2))] = []
+        for cx1, cy1, cx2, cy2, a, b in data['transitions'].tolist():
+            hpa.transitions[((cx1, cy1), (cx2, cy2))].append((a, b))
+        for c in hpa._clusters():
+            hpa.intra[c] = {u: {} for u in hpa._cluster_nodes(c)}
+        for u, v, cost in data['edges'].tolist():
+            hpa.intra[hpa._cluster_of(int(u))][int(u)][int(v)] = cost
+        hpa._build_inter()
+        return hpa
+
+    def plan(self, start: Tuple[int, int], goal: Optional[Tuple[int, int]] = None) -> Tuple[List[Tuple[int, int]], Dict]:
+        start_time = time.time()
+        goal = goal or self.env.goal
+        s, t = start[0] * self.cols + start[1], goal[0] * self.cols + goal[1]
+        fail = {'cost': float('inf'), 'nodes': 0, 'abstract_nodes': 0, 'time': 0}
+        if self._costs[s] == float('inf') or self._costs[t] == float('inf'):
+            fail['time'] = time.time() - start_time
+            return [], fail
+        # Temporarily wire start and goal into the abstract graph
+        s_cluster, t_cluster = self._cluster_of(s), self._cluster_of(t)
+        s_dist, _ = self._cluster_search(s, s_cluster)
+        t_dist, _ = self._cluster_search(t, t_cluster, reverse=True)
+        s_nodes, t_nodes = self._cluster_nodes(s_cluster), self._cluster_nodes(t_cluster)
+        start_edges = {v: s_dist[v] for v in s_nodes if v in s_dist}
+        if s_cluster == t_cluster and t in s_dist:
+            start_edges[t] = s_dist[t]
+        goal_edges = {v: t_dist[v] for v in t_nodes if v in t_dist}
+
+        gx, gy = goal
+        pq = [(abs(start[0] - gx) + abs(start[1] - gy), 0, s)]
+        g_values, parent = {s: 0}, {s: -1}
+        abstract_expanded = 0
+        while pq:
+            _, g, u = heapq.heappop(pq)
+            if g > g_values[u]:
+                continue
+            abstract_expanded += 1
+            if u == t:
+                break
+            nbrs = dict(self.intra.get(self._cluster_of(u), {}).get(u, {}))
+            for v, cost in self.inter.get(u, {}).items():
+                nbrs[v] = min(cost, nbrs.get(v, float('inf')))
+            if u == s:
+                for v, cost in start_edges.items():
+                    nbrs[v] = min(cost, nbrs.get(v, float('inf')))
+            if u in goal_edges:
+                nbrs[t] = min(goal_edges[u], nbrs.get(t, float('inf')))
+            for v, cost in nbrs.items():
+                new_g = g + cost
+                if new_g < g_values.get(v, float('inf')):
+                    g_values[v] = new_g
+                    parent[v] = u
+                    vx, vy = divmod(v, self.cols)
+                    heapq.heappush(pq, (new_g + abs(vx - gx) + abs(vy - gy), new_g, v))
+        if t not in parent:
+            fail.update(abstract_nodes=abstract_expanded, time=time.time() - start_time)
+            return [], fail
+
+        abstract_path = []
+        node = t
+        while node != -1:
+            abstract_path.append(node)
+            node = parent[node]
+        abstract_path.reverse()
+        path, refined_expanded = self._refine(abstract_path)
+        cost = sum(self._costs[idx] for idx in path[1:])
+        return ([divmod(idx, self.cols) for idx in path],
+                {'cost': int(cost), 'nodes': abstract_expanded + refined_expanded,
+                 'abstract_nodes': abstract_expanded, 'time': time.time() - start_time})
+
+    def _refine(self, abstract_path: List[int]) -> Tuple[List[int], int]:
+        # Cross-border hops are single steps; in-cluster hops are re-searched inside that cluster only
+        path, expanded = [abstract_path[0]], 0
+        for u, v in zip(abstract_path, abstract_path[1:]):
+            c = self._cluster_of(u)
+            if c != self._cluster_of(v):
+                path.append(v)
+                continue
+            dist, pred = self._cluster_search(u, c)
+            expanded += len(dist)
+            segment = []
+            node = v
+            while node != u:
+                segment.append(node)
+                node = pred[node]
+            path.extend(reversed(segment))
+        return path, expanded
@@ -0,0 +1,189 @@
+import heapq
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from grid import GridEnvironment
+from planners import Planner
+
+SQRT2 = math.sqrt(2)
+
+
+class JumpPointPlanner:
+    """Jump Point Search over the static grid, 4- or 8-connected (no corner cutting).
+
+    Instead of pushing every neighbour, a search from a jump point scans straight
+    (and diagonal) lines until something forces a turn, and only those cells
+    enter the open list. Cells are stored on a 1-cell wall border so scans never
+    bounds-check.
+
+    Bounded-cost variant: pruning is only sound where costs are uniform, so a cell
+    whose 3x3 neighbourhood mixes terrain costs stops every scan and is expanded
+    like plain A*. Open cost-1 areas get the full JPS speed-up; weighted maps stay
+    optimal. Moving obstacles break the pruning argument entirely, so maps with
+    them fall back to Planner.astar.
+    """
+
+    def __init__(self, env: GridEnvironment):
+        if env.movement not in ('4', '8'):
+            raise ValueError("Jump point search supports 4- and 8-connected movement only")
+        self.env = env
+        self.rows, self.cols = env.rows, env.cols
+        self.width = self.cols + 2
+        self.diagonal = env.movement == '8'
+        self.rebuild()
+
+    def rebuild(self):
+        """Re-read env.grid; call after editing it."""
+        padded = np.full((self.rows + 2, self.cols + 2), -1, dtype=np.int64)
+        padded[1:-1, 1:-1] = self.env.grid
+        passable = padded != -1
+        mixed = np.zeros_like(passable)
+        inner = padded[1:-1, 1:-1]
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                nbr = padded[1 + dx:self.rows + 1 + dx, 1 + dy:self.cols + 1 + dy]
+                mixed[1:-1, 1:-1] |= (inner != -1) & (nbr != -1) & (nbr != inner)
+        self._open = passable.ravel().tolist()
+        self._terrain = np.where(passable, padded, 0).ravel().tolist()
+        self._mixed = mixed.ravel().tolist()
+
+    def _index(self, pos: Tuple[int, int]) -> int:
+        return (pos[0] + 1) * self.width + pos[1] + 1
+
+    def _position(self, idx: int) -> Tuple[int, int]:
+        r, c = divmod(idx, self.width)
+        return (r - 1, c - 1)
+
+    def _heuristic(self, idx: int, goal: int) -> float:
+        (r, c), (gr, gc) = divmod(idx, self.width), divmod(goal, self.width)
+        dx, dy = abs(r - gr), abs(c - gc)
+        if self.diagonal:
+            return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+        return dx + dy
+
+    def _directions(self, idx: int, parent: int) -> List[Tuple[int, int]]:
+        """Pruned (natural + forced) directions out of idx when arriving from parent."""
+        is_open, W = self._open, self.width
+        if parent < 0 or self._mixed[idx]:
+            dirs = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+            if self.diagonal:
+                dirs += [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+            return dirs
+        (r, c), (pr, pc) = divmod(idx, W), divmod(parent, W)
+        dr, dc = (r > pr) - (r < pr), (c > pc) - (c < pc)
+        if dr and dc:
+            dirs = []
+            vert, horiz = is_open[idx + dr * W], is_open[idx + dc]
+            if vert:
+                dirs.append((dr, 0))
+            if horiz:
+                dirs.append((0, dc))
+            if vert and horiz:
+                dirs.append((dr, dc))
+            return dirs
+        forward = is_open[idx + dr * W + dc]
+        dirs = [(dr, dc)] if forward else []
+        for sr, sc in ((0, 1), (0, -1)) if dr else ((1, 0), (-1, 0)):
+            if is_open[idx + sr * W + sc]:
+                dirs.append((sr, sc))
+                if self.diagonal and forward:
+                    dirs.append((dr + sr, dc + sc))
+        return dirs
+
+    def _jump(self, idx: int, dr: int, dc: int, goal: int) -> Tuple[int, float, int]:
+        """Scan from idx in direction (dr, dc); returns (jump point or -1, cost to it, cells scanned)."""
+        is_open, terrain, mixed, W = self._open, self._terrain, self._mixed, self.width
+        step = dr * W + dc
+        diagonal = dr != 0 and dc != 0
+        length = SQRT2 if diagonal else 1
+        cost, scanned = 0, 0
+        while True:
+            if diagonal and not (is_open[idx + dr * W] and is_open[idx + dc]):
+                return -1, 0, scanned  # No corner cutting
+            nxt = idx + step
+            if not is_open[nxt]:
+                return -1, 0, scanned
+            idx = nxt
+            cost += terrain[idx] * length
+            scanned += 1
+            if idx == goal or mixed[idx]:
+                return idx, cost, scanned
+            if diagonal:
+                for sub in ((dr, 0), (0, dc)):
+                    found, _, n = self._jump(idx, sub[0], sub[1], goal)
+                    scanned += n
+                    if found != -1:
+                        return idx, cost, scanned
+                continue
+            # Forced neighbour: a perpendicular cell that is open here but was walled off one step back
+            if dr:
+                if (is_open[idx + 1] and not is_open[idx - step + 1]) or (is_open[idx - 1] and not is_open[idx - step - 1]):
+                    return idx, cost, scanned
+                if not self.diagonal:
+                    # 4-connected: vertical scans stop where a horizontal scan would find something
+                    for sub in (1, -1):
+                        found, _, n = self._jump(idx, 0, sub, goal)
+                        scanned += n
+                        if found != -1:
+                            return idx, cost, scanned
+            elif (is_open[idx + W] and not is_open[idx - step + W]) or (is_open[idx - W] and not is_open[idx - step - W]):
+                return idx, cost, scanned
+
+    def plan(self, start: Tuple[int, int], goal: Optional[Tuple[int, int]] = None) -> Tuple[List[Tuple[int, int]], Dict]:
+        goal = tuple(goal or self.env.goal)
+        if self.env.moving_obstacles:
+            saved_goal, self.env.goal = self.env.goal, goal
+            try:
+                path, metrics = Planner(self.env).astar(start)
+            finally:
+                self.env.goal = saved_goal
+            return path, dict(metrics, fallback='astar')
+        start_time = time.perf_counter()
+        s, t = self._index(start), self._index(goal)
+        fail = {'cost': float('inf'), 'nodes': 0, 'scanned': 0, 'time': 0}
+        if not (self._open[s] and self._open[t]):
+            fail['time'] = time.perf_counter() - start_time
+            return [], fail
+        pq = [(self._heuristic(s, t), 0, s)]
+        g_values, parent = {s: 0}, {s: -1}
+        nodes = scanned = 0
+        while pq:
+            _, g, idx = heapq.heappop(pq)
+            if g > g_values[idx]:
+                continue
+            nodes += 1
+            if idx == t:
+                break
+            for dr, dc in self._directions(idx, parent[idx]):
+                jp, cost, n = self._jump(idx, dr, dc, t)
+                scanned += n
+                if jp == -1:
+                    continue
+                new_g = g + cost
+                if new_g < g_values.get(jp, float('inf')):
+                    g_values[jp] = new_g
+                    parent[jp] = idx
+                    heapq.heappush(pq, (new_g + self._heuristic(jp, t), new_g, jp))
+        if t not in parent:
+            fail.update(nodes=nodes, scanned=scanned, time=time.perf_counter() - start_time)
+            return [], fail
+        return self._expand_path(parent, t), {'cost': g_values[t], 'nodes': nodes, 'scanned': scanned,
+                                              'time': time.perf_counter() - start_time}
+
+    def _expand_path(self, parent: Dict[int, int], goal: int) -> List[Tuple[int, int]]:
+        # Jump points are joined by straight or diagonal runs; fill in the cells between them
+        points = []
+        node = goal
+        while node != -1:
+            points.append(self._position(node))
+            node = parent[node]
+        points.reverse()
+        path = points[:1]
+        for (r0, c0), (r1, c1) in zip(points, points[1:]):
+            dr, dc = (r1 > r0) - (r1 < r0), (c1 > c0) - (c1 < c0)
+            r, c = r0, c0
+            while (r, c) != (r1, c1):
+                r, c = r + dr, c + dc
+                path.append((r, c))
+        return path
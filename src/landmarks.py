@@ -0,0 +1,171 @@
+import json
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from grid import GridEnvironment
+import distance
+from distance import _sweep, _init_sweep_worker, map_fingerprint
+
+BAND_SHIFT = 14  # Bounds are computed lazily in bands of 2**14 consecutive cells
+
+
+def _landmark_costs_to(source: int) -> np.ndarray:
+    # Module-level so a process pool can pickle it; the table comes from _init_sweep_worker
+    return np.array(_sweep(distance._WORKER_TABLE, source, True)[0])
+
+
+class LandmarkTable:
+    """ALT (A*, landmarks, triangle inequality) lower bounds over the static grid.
+
+    For every landmark L the table holds exact costs d(L, v) and d(v, L) to and from
+    each cell, rounded up to integers and stored as uint16 (uint32 on maps where
+    costs overflow it); the dtype's max marks cells L cannot reach. Then
+        d(v, t) >= max(d(L, t) - d(L, v), d(v, L) - d(t, L))
+    for every L, and the best bound is combined with the geometric heuristic.
+    On 4-connected maps costs are integers, so the bound is exact and consistent.
+    With diagonal steps the rounding is paid back by subtracting one, which keeps
+    it admissible but not necessarily consistent. Moving obstacles are ignored:
+    they only make paths costlier, so bounds stay admissible on dynamic maps.
+
+    Landmarks are chosen by farthest-point selection: each next one is the
+    reachable cell whose cost from the nearest chosen landmark is largest.
+    """
+
+    def __init__(self, env: GridEnvironment, landmarks: List[int], tables: np.ndarray):
+        self.env = env
+        self.cols = env.cols
+        self.landmarks = landmarks  # Flat cell indices
+        self.tables = tables  # (2, K, rows * cols): costs from, then costs to, each landmark
+        self.unreachable = int(np.iinfo(tables.dtype).max)
+        self.exact = bool(np.all(env.neighbor_table.steps == 1))
+        self._grids: Dict[Tuple[int, bool], Dict[int, List[float]]] = {}  # (goal, reverse) -> band -> bounds
+
+    @classmethod
+    def build(cls, env: GridEnvironment, count: int = 8, workers: int = 1) -> 'LandmarkTable':
+        """Select `count` landmarks and run the two Dijkstra sweeps for each.
+
+        Selection is sequential (one forward sweep per pick); with workers > 1 the
+        reverse sweeps run on a process pool afterwards.
+        """
+        if count < 1:
+            raise ValueError("Need at least one landmark")
+        if not all((-dx, -dy) in env.stencil for dx, dy in env.stencil):
+            raise ValueError("Landmark tables need a symmetric movement stencil")
+        nt = env.neighbor_table
+        table = (env.cost_grid().ravel().tolist(), nt.indptr.tolist(), nt.indices.tolist(),
+                 nt.steps.tolist(), nt.costs.tolist())
+        passable = np.flatnonzero(np.isfinite(table[0]))
+        if not len(passable):
+            raise ValueError("Map has no passable cells")
+        seed = env.start[0] * env.cols + env.start[1]
+        if not math.isfinite(table[0][seed]):
+            seed = int(passable[0])
+        # The first landmark is the cell farthest from the seed, not the seed itself
+        nearest = np.array(_sweep(table, seed, False)[0])
+        landmarks, forward = [], []
+        for _ in range(count):
+            candidates = np.where(np.isfinite(nearest), nearest, -1.0)
+            if landmarks:
+                candidates[landmarks] = -1.0
+            pick = int(np.argmax(candidates))
+            if candidates[pick] < 0:
+                break  # Fewer reachable cells than landmarks
+            landmarks.append(pick)
+            dist = np.array(_sweep(table, pick, False)[0])
+            forward.append(dist)
+            nearest = dist if len(landmarks) == 1 else np.minimum(nearest, dist)
+        if workers > 1 and len(landmarks) > 1:
+            from concurrent.futures import ProcessPoolExecutor  # Deferred: pulls in multiprocessing
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_sweep_worker, initargs=(table,)) as pool:
+                backward = list(pool.map(_landmark_costs_to, landmarks))
+        else:
+            backward = [np.array(_sweep(table, lm, True)[0]) for lm in landmarks]
+        costs = np.stack([np.stack(forward), np.stack(backward)])
+        finite = np.isfinite(costs)
+        top = np.ceil(costs[finite].max()) if finite.any() else 0
+        dtype = np.uint16 if top < np.iinfo(np.uint16).max else np.uint32
+        tables = np.full(costs.shape, np.iinfo(dtype).max, dtype=dtype)
+        tables[finite] = np.ceil(costs[finite] - 1e-9)  # Float noise must not round exact integers up
+        return cls(env, landmarks, tables)
+
+    def save(self, file: str):
+        """Write the tables as a raw .npy (memory-mappable) plus a .json sidecar naming the map."""
+        out = np.lib.format.open_memmap(file, mode='w+', dtype=self.tables.dtype, shape=self.tables.shape)
+        out[:] = self.tables
+        out.flush()
+        del out
+        with open(file + '.json', 'w') as f:
+            json.dump({'fingerprint': map_fingerprint(self.env), 'stencil': [list(s) for s in self.env.stencil],
+                       'landmarks': self.landmarks}, f)
+
+    @classmethod
+    def load(cls, env: GridEnvironment, file: str) -> 'LandmarkTable':
+        """Memory-map tables saved by save(); heuristic() reads only the bands a search touches."""
+        with open(file + '.json') as f:
+            meta = json.load(f)
+        if meta['fingerprint'] != map_fingerprint(env) or [tuple(s) for s in meta['stencil']] != list(env.stencil):
+            raise ValueError(f"Landmark tables in {file} were built for a different map or movement model.")
+        tables = np.load(file, mmap_mode='r')
+        if tables.shape[2] != env.rows * env.cols:
+            raise ValueError(f"Landmark tables in {file} do not match the map size.")
+        return cls(env, meta['landmarks'], tables)
+
+    @property
+    def nbytes(self) -> int:
+        return self.tables.nbytes
+
+    def bounds(self, cell: Tuple[int, int], reverse: bool = False) -> List[float]:
+        """Per flat cell index: a lower bound on the cost to `cell` (from it when reverse=True).
+
+        inf marks cells in a different connected component. This reads the whole
+        table; searches go through heuristic(), which fills in bands on demand.
+        """
+        return self._band(cell[0] * self.cols + cell[1], reverse, 0, self.tables.shape[2])
+
+    def _band(self, t: int, reverse: bool, lo: int, hi: int) -> List[float]:
+        # Bounds for flat cells lo..hi-1 toward (or from) flat cell t
+        big = self.unreachable
+        best = np.zeros(hi - lo, dtype=np.int64)
+        cut = np.zeros(hi - lo, dtype=bool)
+        for k in range(len(self.landmarks)):
+            frm, to = np.asarray(self.tables[0, k, lo:hi], dtype=np.int64), np.asarray(self.tables[1, k, lo:hi], dtype=np.int64)
+            ft, tt = int(self.tables[0, k, t]), int(self.tables[1, k, t])
+            if ft == big:
+                cut |= frm != big  # L reaches v but not t: v and t are in different components
+                continue
+            cut |= frm == big
+            if reverse:  # d(t, v) >= d(L, v) - d(L, t) and d(t, L) - d(v, L)
+                np.maximum(best, np.maximum(frm - ft, tt - to), out=best)
+            else:  # d(v, t) >= d(L, t) - d(L, v) and d(v, L) - d(t, L)
+                np.maximum(best, np.maximum(ft - frm, to - tt), out=best)
+        if not self.exact:
+            best -= 1
+        return np.where(cut, np.inf, np.maximum(best, 0).astype(np.float64)).tolist()
+
+    def heuristic(self, goal: Tuple[int, int], base: Optional[Callable[[Tuple[int, int]], float]] = None,
+                  reverse: bool = False) -> Callable[[Tuple[int, int]], float]:
+        """Triangle-inequality heuristic toward goal (from it when reverse=True), at least `base`.
+
+        Bounds are computed a band of cells at a time as the search reaches them,
+        and the bands of the last few goals are kept, since replans and repeated
+        queries ask for the same goal again.
+        """
+        cols, size = self.cols, self.tables.shape[2]
+        t = goal[0] * cols + goal[1]
+        key = (t, reverse)
+        if key not in self._grids:
+            if len(self._grids) >= 4:
+                self._grids.pop(next(iter(self._grids)))
+            self._grids[key] = {}
+        bands, mask = self._grids[key], (1 << BAND_SHIFT) - 1
+
+        def h(pos: Tuple[int, int]) -> float:
+            idx = pos[0] * cols + pos[1]
+            band = bands.get(idx >> BAND_SHIFT)
+            if band is None:
+                lo = idx & ~mask
+                band = bands[idx >> BAND_SHIFT] = self._band(t, reverse, lo, min(lo + mask + 1, size))
+            bound = band[idx & mask]
+            return bound if base is None else max(bound, base(pos))
+
+        return h
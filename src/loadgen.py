@@ -0,0 +1,135 @@
+import sys
+import os
+src_dir = os.path.dirname(os.path.abspath(__file__))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List, Optional
+import numpy as np
+from grid import GridEnvironment, resolve_map
+import mapgen
+
+
+class Client:
+    """Minimal JSON-lines client; matches responses to requests by id."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader, self.writer = reader, writer
+        self._waiting: Dict = {}
+        self._next_id = 0
+        self._listener = asyncio.ensure_future(self._listen())
+
+    @classmethod
+    async def connect(cls, host: str = '127.0.0.1', port: int = 8765, unix: Optional[str] = None) -> 'Client':
+        if unix:
+            return cls(*await asyncio.open_unix_connection(unix))
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def _listen(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            future = self._waiting.pop(message.get('id', message.get('op')), None)
+            if future is not None and not future.done():
+                future.set_result(message)
+        for future in self._waiting.values():
+            if not future.done():
+                future.set_exception(ConnectionError('server closed the connection'))
+
+    def request(self, message: Dict) -> asyncio.Future:
+        """Send a message; the returned future resolves to the matching response."""
+        if 'id' not in message and 'op' not in message:
+            self._next_id += 1
+            message = dict(message, id=self._next_id)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[message.get('id', message.get('op'))] = future
+        self.writer.write((json.dumps(message) + '\n').encode())
+        return future
+
+    def cancel(self, req_id):
+        self.writer.write((json.dumps({'op': 'cancel', 'id': req_id}) + '\n').encode())
+
+    async def close(self):
+        self._listener.cancel()
+        self.writer.close()
+
+
+async def run_load(messages: List[Dict], concurrency: int = 8, host: str = '127.0.0.1', port: int = 8765,
+                   unix: Optional[str] = None) -> Dict:
+    """Send messages over `concurrency` connections; returns latencies (s), errors and server stats."""
+    queue: asyncio.Queue = asyncio.Queue()
+    for i, message in enumerate(messages):
+        queue.put_nowait(dict(message, id=message.get('id', i)))
+    latencies, errors = [], []
+
+    async def worker():
+        client = await Client.connect(host, port, unix)
+        try:
+            while not queue.empty():
+                message = queue.get_nowait()
+                t0 = time.perf_counter()
+                reply = await client.request(message)
+                latencies.append(time.perf_counter() - t0)
+                if 'error' in reply:
+                    errors.append(reply['error'])
+        finally:
+            await client.close()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    client = await Client.connect(host, port, unix)
+    stats = await client.request({'op': 'stats'})
+    await client.close()
+    return {'latencies': latencies, 'errors': errors, 'elapsed': elapsed, 'server': stats}
+
+
+def report(result: Dict) -> Dict:
+    lat = np.array(result['latencies']) * 1e3
+    return {'requests': len(lat), 'errors': len(result['errors']),
+            'throughput': len(lat) / result['elapsed'] if result['elapsed'] > 0 else 0.0,
+            'p50_ms': float(np.percentile(lat, 50)) if len(lat) else 0.0,
+            'p99_ms': float(np.percentile(lat, 99)) if len(lat) else 0.0,
+            'mean_ms': float(lat.mean()) if len(lat) else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load generator for the planning server (reports p50/p99 latency)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, metavar='PATH')
+    parser.add_argument('--requests', default=None, metavar='FILE',
+                        help='JSON-lines file of plan requests to replay instead of generated queries')
+    parser.add_argument('--map', default='medium', help='Map for generated queries')
+    parser.add_argument('--planner', default='astar')
+    parser.add_argument('--count', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--deadline', type=float, default=None, help='Per-request deadline in seconds')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.requests:
+        with open(args.requests) as f:
+            messages = [json.loads(line) for line in f if line.strip()]
+    else:
+        env = GridEnvironment(*resolve_map(args.map))
+        messages = [{'map': args.map, 'planner': args.planner, 'start': list(s), 'goal': list(g)}
+                    for s, g in mapgen.queries(env, args.count, args.seed)]
+    if args.deadline is not None:
+        messages = [dict(m, deadline=args.deadline) for m in messages]
+    result = asyncio.run(run_load(messages, args.concurrency, args.host, args.port, args.unix))
+    stats = report(result)
+    print(f"{stats['requests']} requests, {stats['errors']} errors, {stats['throughput']:.1f} req/s")
+    print(f"Latency: p50 {stats['p50_ms']:.2f}ms, p99 {stats['p99_ms']:.2f}ms, mean {stats['mean_ms']:.2f}ms")
+    server = result['server']
+    if server.get('batches'):
+        print(f"Server: {server['batches']} batches, {server['batched_requests'] / server['batches']:.1f} requests/batch, "
+              f"{server['deadline_misses']} deadline misses, {server['cancelled']} cancelled")
+
+if __name__ == '__main__':
+    main()
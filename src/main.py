@@ -5,55 +5,240 @@ if src_dir not in sys.path:
     sys.path.insert(0, src_dir)
 import argparse
 import time 
-import matplotlib.pyplot as plt
 import numpy as np
-from grid import GridEnvironment
+from grid import GridEnvironment, is_tiled_map, resolve_map
 from planners import Planner
+# Every other planner and tool is imported where it is used, so a run only loads what it needs
+
+FOUR_CONNECTED_PLANNERS = ('dstar', 'hpa')  # Searches with hard-wired 4-neighbour moves
+
+def load_hpa(env, args):
+    from hpa import HPAPlanner
+    # Reuse a saved abstraction when it matches this map and cluster size
+    if args.hpa_cache and os.path.exists(args.hpa_cache):
+        try:
+            hpa = HPAPlanner.load(env, args.hpa_cache)
+            if hpa.cluster_size == args.cluster_size:
+                print(f"Loaded HPA* abstraction from {args.hpa_cache}")
+                return hpa
+        except (ValueError, KeyError, OSError) as e:
+            print(f"Warning: Ignoring HPA* cache {args.hpa_cache}: {e}")
+    hpa = HPAPlanner(env, args.cluster_size)
+    if args.hpa_cache:
+        hpa.save(args.hpa_cache)
+        print(f"Saved HPA* abstraction to {args.hpa_cache}")
+    return hpa
+
+def load_landmarks(env, args):
+    from landmarks import LandmarkTable
+    # Reuse saved tables when they match this map and movement model
+    if args.landmark_file and os.path.exists(args.landmark_file):
+        try:
+            table = LandmarkTable.load(env, args.landmark_file)
+            print(f"Loaded {len(table.landmarks)} landmarks from {args.landmark_file}")
+            return table
+        except (ValueError, KeyError, OSError) as e:
+            print(f"Warning: Ignoring landmark file {args.landmark_file}: {e}")
+    start_time = time.time()
+    table = LandmarkTable.build(env, args.landmarks or 8)
+    print(f"Built {len(table.landmarks)} landmarks in {time.time() - start_time:.3f}s ({table.nbytes / 1024:.0f}KB)")
+    if args.landmark_file:
+        table.save(args.landmark_file)
+        print(f"Saved landmark tables to {args.landmark_file}")
+    return table
+
+def run_fleet(env, args):
+    from fleet import FleetPlanner, random_queries
+    print(f"Fleet: {args.agents} agents on {env.rows}x{env.cols} map {args.map}, {args.agent_order} order")
+    try:
+        queries = random_queries(env, args.agents, args.seed)
+        paths, stats = FleetPlanner(env).plan(queries, order=args.agent_order)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Planned {stats['planned']}/{stats['agents']} agents in {stats['time']:.2f}s "
+          f"({stats['agents_per_sec']:.1f} agents/s, {stats['nodes']} nodes expanded)")
+    print(f"Makespan: {stats['makespan']} steps, Sum of steps: {stats['sum_of_steps']}")
+    print(f"Conflicts: {stats['blocked_moves']} reserved moves avoided during search, "
+          f"{stats['conflicts']} in the final plan, {stats['failed']} agents failed")
+
+def run_tour(env, args):
+    from tour import TourPlanner, load_stops
+    try:
+        stops = load_stops(args.stops, env)
+        route, metrics = TourPlanner(env).plan(stops, return_to_start=args.return_to_start, time_budget=args.tour_budget)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Tour: {len(stops)} stops from {env.start} on map {args.map}"
+          f"{', returning to start' if args.return_to_start else ''}")
+    print(f"Order: {metrics['order']}")
+    print(f"Cost: {metrics['cost']} (nearest neighbour {metrics['initial_cost']}, "
+          f"{metrics['passes']} improvement passes), {metrics['sweeps']} sweeps, Time={metrics['time']:.3f}s")
+    if metrics['unreachable']:
+        print(f"Warning: Skipped unreachable stops {metrics['unreachable']}")
+    print(f"Route: {len(route)} cells")
+    if args.render:
+        from render import GridRenderer
+        GridRenderer(env).save(args.render, route)
+        print(f"Render saved as: {args.render}")
 
 def main():
     parser = argparse.ArgumentParser(description='Autonomous Delivery Agent Path Planner')
-    parser.add_argument('--planner', required=True, choices=['bfs', 'ucs', 'astar', 'sa'],
-                        help='Planner type: bfs, ucs, astar, or sa')
+    parser.add_argument('--planner', choices=['bfs', 'ucs', 'astar', 'ara', 'bidijkstra', 'biastar', 'sa', 'dstar', 'hpa', 'jps', 'sipp'],
+                        help='Planner type: bfs, ucs, astar, ara (anytime A*), bidijkstra/biastar (bidirectional, static maps), '
+                             'sa, dstar (incremental D* Lite), hpa (hierarchical A*), jps (jump point search), '
+                             'or sipp (safe interval planning around moving obstacles)')
     parser.add_argument('--map', required=True,
-                        help='Map name (e.g., small, medium, large, dynamic)')
+                        help='Map name (e.g., small, medium, large, dynamic) or path to a text/binary/tiled map file')
     parser.add_argument('--replan', action='store_true',
                         help='Enable replanning simulation for dynamic maps')
     parser.add_argument('--plot', action='store_true',
                         help='Generate and display path plot')
+    parser.add_argument('--render', default=None, metavar='PNG',
+                        help='Write the path straight to a PNG without Matplotlib (fast, headless)')
+    parser.add_argument('--timeline', action='store_true',
+                        help='With --render, write an animated PNG stepping through the moving obstacles')
+    parser.add_argument('--movement', choices=['4', '8'], default='4',
+                        help='4-connected, or 8-connected with octile costs and no corner cutting (not dstar/hpa)')
+    parser.add_argument('--sa-chains', type=int, default=1,
+                        help='Independent simulated-annealing chains (run on a process pool when > 1)')
+    parser.add_argument('--sa-budget', type=float, default=None,
+                        help='Wall-clock budget per SA chain in seconds')
+    parser.add_argument('--deadline', type=float, default=None, metavar='SECONDS',
+                        help='Wall-clock budget for ara, applied to the initial plan and every replan')
+    parser.add_argument('--cluster-size', type=int, default=10,
+                        help='HPA* cluster edge length in cells')
+    parser.add_argument('--hpa-cache', default=None,
+                        help='HPA* abstraction file (.npz): loaded if it matches the map, else built and saved')
+    parser.add_argument('--landmarks', type=int, default=0, metavar='K',
+                        help='Tighten the astar/ara/biastar/sa heuristic with K ALT landmarks (8 if only --landmark-file is given)')
+    parser.add_argument('--landmark-file', default=None, metavar='FILE',
+                        help='Landmark tables (.npy, memory-mapped): loaded if they match the map, else built and saved')
+    parser.add_argument('--profile', nargs='?', const='-', default=None, metavar='FILE',
+                        help='Instrument the initial plan and print JSON stats (or write them to FILE)')
+    parser.add_argument('--plan-cache', default=None, metavar='FILE',
+                        help='SQLite plan cache that persists bfs/ucs/astar/sa results across runs')
+    parser.add_argument('--compare-optimal', action='store_true',
+                        help='Also run exact A* and report the path suboptimality of the chosen planner')
+    parser.add_argument('--agents', type=int, default=0, metavar='N',
+                        help='Plan N agents with random start/goal cells cooperatively (replaces --planner)')
+    parser.add_argument('--agent-order', choices=['given', 'longest'], default='given',
+                        help='Fleet priority order: as generated, or longest trips first')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed for the fleet start/goal cells')
+    parser.add_argument('--stops', default=None, metavar='FILE',
+                        help="Plan a multi-stop tour from the map start through the 'row col' drop points in FILE "
+                             '(replaces --planner)')
+    parser.add_argument('--return-to-start', action='store_true',
+                        help='With --stops, end the tour back at the start')
+    parser.add_argument('--tile-cache', type=int, default=64, metavar='N',
+                        help='Tiles a tiled (.tmap) map keeps in memory at once')
+    parser.add_argument('--tour-budget', type=float, default=None, metavar='SECONDS',
+                        help='With --stops, cap the time spent improving the visiting order')
     args = parser.parse_args()
+    if not args.planner and not args.agents and not args.stops:
+        parser.error('--planner is required unless --agents or --stops is given')
+    if args.movement != '4' and args.planner in FOUR_CONNECTED_PLANNERS:
+        parser.error(f"--planner {args.planner} supports 4-connected movement only")
 
     # Load map and dynamic file if applicable (root-relative paths)
-    map_file = f'maps/{args.map}.map'
-    dyn_file = f'maps/{args.map}.dyn' if args.map == 'dynamic' else None
-    if not os.path.exists(map_file):
-        print(f"Error: Map file {map_file} not found. Available: small, medium, large, dynamic.")
+    # Either an explicit file, or maps/<name>.gmap (binary), maps/<name>.map, then maps/<name>.tmap (tiled)
+    try:
+        map_file, dyn_file = resolve_map(args.map, extensions=('.gmap', '.map', '.tmap'))
+    except FileNotFoundError as e:
+        print(f"Error: {e}. Available: small, medium, large, dynamic.")
         print("Ensure you're running from project root (D:\\autonomous-delivery-agent).")
         sys.exit(1)
+    args.map = os.path.splitext(os.path.basename(map_file))[0]
+    tiled = is_tiled_map(map_file)
+    if tiled:
+        from tiled import TiledGridEnvironment, TILED_PLANNERS
+        # Out-of-core maps only support searches that go through successors()
+        unsupported = [flag for flag, used in (('--agents', args.agents), ('--stops', args.stops),
+                                               ('--landmarks', args.landmarks or args.landmark_file),
+                                               ('--plan-cache', args.plan_cache), ('--plot', args.plot),
+                                               ('--render', args.render)) if used]
+        if args.planner and args.planner not in TILED_PLANNERS:
+            unsupported.insert(0, f'--planner {args.planner}')
+        if unsupported:
+            print(f"Error: {', '.join(unsupported)} not supported on tiled maps "
+                  f"(planners: {', '.join(TILED_PLANNERS)}). Use the .map or .gmap version.")
+            sys.exit(1)
 
     try:
-        env = GridEnvironment(map_file, dyn_file)
+        if tiled:
+            env = TiledGridEnvironment(map_file, dyn_file, movement=args.movement, cache_tiles=args.tile_cache)
+        else:
+            env = GridEnvironment(map_file, dyn_file, movement=args.movement)
     except ValueError as e:
         print(f"Error loading environment: {e}")
         sys.exit(1)
 
-    planner = Planner(env)
+    if args.agents:
+        run_fleet(env, args)
+        return
+    if args.stops:
+        run_tour(env, args)
+        return
+
+    profiler = cache = None
+    if args.profile:
+        from profiling import Profiler
+        profiler = Profiler(track_memory=True).attach(env)
+    if args.plan_cache:
+        from plan_cache import PlanCache
+        cache = PlanCache(db_file=args.plan_cache)
+    landmarks = load_landmarks(env, args) if (args.landmarks or args.landmark_file) and args.planner in Planner.METHODS else None
+    planner = Planner(env, profiler, cache, landmarks)
+    options = {}
+    if args.planner == 'sa':
+        options = {'chains': args.sa_chains, 'workers': args.sa_chains, 'time_budget': args.sa_budget}
+    elif args.planner == 'ara':
+        options = {'time_budget': args.deadline}
+    dstar = hpa = jps = sipp = None
+    if args.planner == 'dstar':
+        from dstar import DStarLite
+        dstar = DStarLite(env)
+    elif args.planner == 'hpa':
+        hpa = load_hpa(env, args)
+    elif args.planner == 'jps':
+        from jps import JumpPointPlanner
+        jps = JumpPointPlanner(env)
+    elif args.planner == 'sipp':
+        from sipp import SIPPPlanner
+        sipp = SIPPPlanner(env)
     planner_name = args.planner.upper()
 
-    print(f"Loading map: {map_file}{' with dynamics' if dyn_file else ''}")
+    print(f"Loading map: {map_file}{' with dynamics' if env.moving_obstacles else ''}")
     print(f"Start: {env.start}, Goal: {env.goal}")
     print(f"Planner: {planner_name}")
 
     # Run the selected planner with timing
+    if profiler:
+        profiler.start()
     start_time = time.time()  # Now safe: time imported above
-    if args.planner == 'bfs':
-        path, metrics = planner.bfs(env.start)
-    elif args.planner == 'ucs':
-        path, metrics = planner.ucs(env.start)
-    elif args.planner == 'astar':
-        path, metrics = planner.astar(env.start)
-    elif args.planner == 'sa':
-        path, metrics = planner.simulated_annealing(env.start)
+    if args.planner in Planner.METHODS:  # Planner's own searches, through the plan cache if enabled
+        path, metrics = planner.plan(args.planner, env.start, **options)
+    elif args.planner == 'dstar':
+        path, metrics = dstar.plan(env.start)
+    elif args.planner == 'hpa':
+        path, metrics = hpa.plan(env.start)
+    elif args.planner == 'jps':
+        path, metrics = jps.plan(env.start)
+    elif args.planner == 'sipp':
+        path, metrics = sipp.plan(env.start)
     end_time = time.time()
+    if profiler:
+        profiler.stop()
+        profiler.detach(env)
+        planner.profiler = None  # Replans and comparisons below stay uninstrumented
+        if args.profile == '-':
+            print(f"Profile:\n{profiler.to_json()}")
+        else:
+            with open(args.profile, 'w') as f:
+                f.write(profiler.to_json())
+            print(f"Profile saved to {args.profile}")
     # Ensure metrics dict has all keys (fallback if planner doesn't set them)
     if 'time' not in metrics:
         metrics['time'] = end_time - start_time
@@ -65,6 +250,27 @@ def main():
     if path:
         print(f"Initial Path found: {path[:5]}... (length {len(path)})")
         print(f"Metrics: Cost={metrics['cost']}, Nodes Expanded={metrics['nodes']}, Time={metrics['time']:.3f}s")
+        if 'waits' in metrics:
+            print(f"SIPP: arrives at step {metrics['arrival']} after {metrics['waits']} waits")
+        if 'bound' in metrics:
+            print(f"ARA*: {len(metrics['solutions'])} solutions, final weight {metrics['weight']:.2f}, "
+                  f"cost within {metrics['bound']:.3f}x optimal")
+        if tiled:
+            stats = env.tile_stats
+            lookups = stats['hits'] + stats['misses']
+            print(f"Tiles: {stats['hits']} hits, {stats['misses']} misses ({stats['hits'] / lookups * 100 if lookups else 0:.1f}% hit rate), "
+                  f"{stats['bytes_read'] / 1024:.1f} KiB read, {stats['evictions']} evictions (tile {env.tile}, cache {env.cache_tiles})")
+        if landmarks is not None:
+            _, plain = Planner(env).plan(args.planner, env.start, **options)
+            saved = (1 - metrics['nodes'] / plain['nodes']) * 100 if plain['nodes'] else 0.0
+            print(f"ALT: {metrics['nodes']} nodes expanded vs {plain['nodes']} with the plain heuristic ({saved:.1f}% fewer)")
+        if cache:
+            print(f"Plan cache: {'hit' if metrics['cached'] else 'miss'} {metrics['cache']}")
+        if args.compare_optimal:
+            _, optimal = planner.astar(env.start)
+            gap = (metrics['cost'] - optimal['cost']) / optimal['cost'] * 100 if optimal['cost'] else 0.0
+            print(f"Exact A*: Cost={optimal['cost']}, Nodes Expanded={optimal['nodes']}, Time={optimal['time']:.3f}s "
+                  f"-> suboptimality {gap:.1f}%")
 
         # Replanning simulation for dynamic maps
         if args.replan and args.map == 'dynamic' and hasattr(env, 'moving_obstacles') and env.moving_obstacles:
@@ -81,14 +287,20 @@ def main():
                     # Replan from previous position
                     prev_pos = current_path[t-1]
                     sub_start_time = time.time()
-                    if args.planner == 'bfs':
-                        subpath, sub_metrics = planner.bfs(prev_pos)
-                    elif args.planner == 'ucs':
-                        subpath, sub_metrics = planner.ucs(prev_pos)
-                    elif args.planner == 'astar':
-                        subpath, sub_metrics = planner.astar(prev_pos)
-                    elif args.planner == 'sa':
-                        subpath, sub_metrics = planner.simulated_annealing(prev_pos)
+                    if args.planner in Planner.METHODS:
+                        subpath, sub_metrics = planner.plan(args.planner, prev_pos, t - 1, **options)
+                    elif args.planner == 'dstar':
+                        # Repair the previous search instead of starting over
+                        dstar.set_blocked([pos])
+                        subpath, sub_metrics = dstar.plan(prev_pos)
+                        fresh_nodes = planner.astar(prev_pos)[1]['nodes']
+                        print(f"D* Lite re-expanded {sub_metrics['nodes']} nodes (fresh A*: {fresh_nodes})")
+                    elif args.planner == 'hpa':
+                        subpath, sub_metrics = hpa.plan(prev_pos)
+                    elif args.planner == 'jps':
+                        subpath, sub_metrics = jps.plan(prev_pos)
+                    elif args.planner == 'sipp':
+                        subpath, sub_metrics = sipp.plan(prev_pos, t - 1)
                     sub_end_time = time.time()
                     # Fallback for sub_metrics
                     if 'time' not in sub_metrics:
@@ -105,7 +317,7 @@ def main():
                                 # Simple added cost: full subpath cost (approximate, ignores exact overlap edges)
                                 total_cost += sub_metrics['cost']
                                 replan_count += 1
-                                log_entries.append(f"Step {t}: Blocked at {pos}. Replanned from {prev_pos}. New sub-path length: {len(new_sub)}")
+                                log_entries.append(f"Step {t}: Blocked at {pos}. Replanned from {prev_pos}. New sub-path length: {len(new_sub)}, nodes re-expanded: {sub_metrics['nodes']}")
                                 print(f"Replanned: New path length {len(current_path)}, total cost now {total_cost:.1f}")
                             else:
                                 print("Replan failed - sub-path doesn't reach goal.")
@@ -141,8 +353,18 @@ def main():
         path = []
         metrics = {'cost': float('inf'), 'nodes': 0, 'time': end_time - start_time}
 
+    if args.render and path:
+        from render import GridRenderer  # Only needed for this output
+        renderer = GridRenderer(env)
+        if args.timeline:
+            renderer.save_timeline(args.render, path)
+        else:
+            renderer.save(args.render, path)
+        print(f"Render saved as: {args.render}")
+
     # Plotting if requested (root-relative save)
     if args.plot and path:
+        import matplotlib.pyplot as plt  # Slow to import, so only when plotting
         fig, ax = plt.subplots(figsize=(10, 10))
         
         # Prepare grid for plotting
@@ -0,0 +1,92 @@
+from typing import Dict, List, Tuple
+import numpy as np
+from grid import GridEnvironment
+
+MAP_KINDS = ('random', 'maze', 'weighted', 'traffic')
+
+
+def random_obstacles(rows: int, cols: int, seed: int, density: float = 0.2) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    grid = np.where(rng.random((rows, cols)) < density, -1, 1)
+    grid[0, 0] = grid[-1, -1] = 1
+    return grid
+
+
+def maze(rows: int, cols: int, seed: int) -> np.ndarray:
+    # Binary-tree maze on odd cells: each cell opens north or east, fully vectorized.
+    # Every odd cell is connected; (1, 1) and the last odd cell make natural endpoints.
+    rng = np.random.default_rng(seed)
+    h, w = max((rows - 1) // 2, 1), max((cols - 1) // 2, 1)
+    grid = np.full((rows, cols), -1)
+    grid[1:2 * h:2, 1:2 * w:2] = 1
+    north = rng.random((h, w)) < 0.5
+    north[0, :] = False  # Top row can only open east
+    north[:, -1] = True  # Right column can only open north
+    ci, cj = np.nonzero(north)
+    keep = ci > 0
+    grid[2 * ci[keep], 2 * cj[keep] + 1] = 1
+    ci, cj = np.nonzero(~north)
+    keep = cj < w - 1
+    grid[2 * ci[keep] + 1, 2 * cj[keep] + 2] = 1
+    return grid
+
+
+def weighted_terrain(rows: int, cols: int, seed: int, max_cost: int = 9, density: float = 0.1) -> np.ndarray:
+    # Blocky cost regions (8x8 patches) with scattered walls
+    rng = np.random.default_rng(seed)
+    patches = rng.integers(1, max_cost + 1, size=(-(-rows // 8), -(-cols // 8)))
+    grid = np.kron(patches, np.ones((8, 8), dtype=int))[:rows, :cols]
+    grid[rng.random((rows, cols)) < density] = -1
+    grid[0, 0] = grid[-1, -1] = 1
+    return grid
+
+
+def traffic(grid: np.ndarray, seed: int, count: int = 10, length: int = 8) -> Dict[str, Dict]:
+    """Moving obstacles that patrol back and forth along random walks over free cells."""
+    rng = np.random.default_rng(seed)
+    rows, cols = grid.shape
+    free = np.argwhere(grid != -1)
+    obstacles = {}
+    for k in range(count):
+        pos = tuple(free[rng.integers(len(free))].tolist())
+        walk = [pos]
+        for _ in range(length - 1):
+            x, y = walk[-1]
+            options = [(x + dx, y + dy) for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                       if 0 <= x + dx < rows and 0 <= y + dy < cols and grid[x + dx, y + dy] != -1]
+            if not options:
+                break
+            walk.append(options[rng.integers(len(options))])
+        path = walk + walk[-2:0:-1]
+        obstacles[f'vehicle{k + 1}'] = {'pos': walk[0], 'path': path, 'speed': 1}
+    return obstacles
+
+
+def generate(kind: str, size: int, seed: int) -> GridEnvironment:
+    """Seeded size x size map of the given kind, start top-left and goal bottom-right."""
+    start, goal = (0, 0), (size - 1, size - 1)
+    if kind == 'random':
+        grid = random_obstacles(size, size, seed)
+    elif kind == 'maze':
+        grid = maze(size, size, seed)
+        last = 2 * ((size - 1) // 2) - 1
+        start, goal = (1, 1), (last, last)
+    elif kind == 'weighted':
+        grid = weighted_terrain(size, size, seed)
+    elif kind == 'traffic':
+        grid = random_obstacles(size, size, seed, density=0.1)
+    else:
+        raise ValueError(f"Unknown map kind {kind!r}; expected one of {', '.join(MAP_KINDS)}")
+    moving = traffic(grid, seed, count=max(size // 5, 1)) if kind == 'traffic' else None
+    return GridEnvironment.from_array(grid, start, goal, moving)
+
+
+def queries(env: GridEnvironment, count: int, seed: int) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """The map's own start->goal first, then seeded random free-cell pairs."""
+    rng = np.random.default_rng(seed)
+    free = np.argwhere(env.grid != -1)
+    pairs = [(env.start, env.goal)]
+    while len(pairs) < count:
+        a, b = free[rng.integers(len(free), size=2)].tolist()
+        pairs.append((tuple(a), tuple(b)))
+    return pairs
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import sqlite3
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from grid import GridEnvironment
+
+PlanResult = Tuple[List[Tuple[int, int]], Dict]
+
+
+def _to_builtin(value):
+    # NumPy scalars in metrics (e.g. int64 costs) are not JSON-serializable as-is
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+def env_fingerprint(env: GridEnvironment) -> str:
+    """Content hash of everything a plan depends on: grid, movement model and obstacle paths."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((env.grid.shape, str(env.grid.dtype), env.stencil)).encode())
+    digest.update(np.ascontiguousarray(env.grid).tobytes())
+    for obs_id in sorted(env.moving_obstacles):
+        digest.update(repr((obs_id, env.moving_obstacles[obs_id]['path'])).encode())
+    return digest.hexdigest()
+
+
+class PlanCache:
+    """LRU cache of (path, metrics) results, optionally backed by an SQLite file.
+
+    Keys combine the environment fingerprint, planner, start, goal, planner options
+    and departure time modulo the obstacle period, so any change to the map simply
+    stops matching; stale entries for that environment are purged when it is seen.
+    The fingerprint is hashed once per env.version, so edits must go through
+    invalidate_neighbor_table() or build_occupancy_index() (as the planners already
+    require). With verify_map=False it is kept across versions until invalidate(env).
+    """
+
+    def __init__(self, max_entries: int = 1024, max_cells: int = 1_000_000, db_file: Optional[str] = None,
+                 verify_map: bool = True):
+        self.max_entries = max_entries
+        self.max_cells = max_cells  # Bound on total stored path cells across entries
+        self.verify_map = verify_map
+        self._entries: 'OrderedDict[str, PlanResult]' = OrderedDict()
+        self._cells = 0
+        self._fingerprints = weakref.WeakKeyDictionary()  # env -> (version, fingerprint) last seen
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'disk_hits': 0, 'invalidations': 0}
+        self._db = None
+        if db_file:
+            self._db = sqlite3.connect(db_file)
+            self._db.execute('CREATE TABLE IF NOT EXISTS plans (key TEXT PRIMARY KEY, map TEXT, path TEXT, metrics TEXT)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS plans_map ON plans (map)')
+
+    def fingerprint(self, env: GridEnvironment) -> str:
+        version, old = self._fingerprints.get(env, (None, None))
+        if old is not None and (version == env.version or not self.verify_map):
+            return old
+        current = env_fingerprint(env)
+        if old is not None and old != current:
+            self._purge(old)
+        self._fingerprints[env] = (env.version, current)
+        return current
+
+    def invalidate(self, env: GridEnvironment):
+        """Forget everything cached for env as it was before an edit."""
+        _, old = self._fingerprints.pop(env, (None, None))
+        if old is not None:
+            self._purge(old)
+
+    def _purge(self, map_key: str):
+        self.stats['invalidations'] += 1
+        for key in [k for k in self._entries if k.startswith(map_key)]:
+            self._cells -= len(self._entries.pop(key)[0])
+        if self._db is not None:
+            with self._db:
+                self._db.execute('DELETE FROM plans WHERE map = ?', (map_key,))
+
+    def key(self, env: GridEnvironment, planner: str, start: Tuple[int, int], departure: int = 0,
+            options: Optional[Dict] = None) -> str:
+        phase = departure % env.dynamic_period
+        return f"{self.fingerprint(env)}|{planner}|{tuple(start)}|{tuple(env.goal)}|{phase}|{sorted((options or {}).items())}"
+
+    def get(self, key: str) -> Optional[PlanResult]:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return self._entries[key]
+        if self._db is not None:
+            row = self._db.execute('SELECT path, metrics FROM plans WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                result = ([tuple(p) for p in json.loads(row[0])], json.loads(row[1]))
+                self._remember(key, result)
+                self.stats['hits'] += 1
+                self.stats['disk_hits'] += 1
+                return result
+        self.stats['misses'] += 1
+        return None
+
+    def put(self, key: str, result: PlanResult):
+        self._remember(key, result)
+        if self._db is not None:
+            path, metrics = result
+            with self._db:
+                self._db.execute('INSERT OR REPLACE INTO plans VALUES (?, ?, ?, ?)',
+                                 (key, key.split('|', 1)[0], json.dumps(path), json.dumps(metrics, default=_to_builtin)))
+
+    def _remember(self, key: str, result: PlanResult):
+        if key in self._entries:
+            self._cells -= len(self._entries.pop(key)[0])
+        self._entries[key] = result
+        self._cells += len(result[0])
+        while self._entries and (len(self._entries) > self.max_entries or self._cells > self.max_cells):
+            _, (path, _) = self._entries.popitem(last=False)
+            self._cells -= len(path)
+            self.stats['evictions'] += 1
+
+    def get_or_plan(self, env: GridEnvironment, planner: str, start: Tuple[int, int], plan: Callable[[], PlanResult],
+                    departure: int = 0, options: Optional[Dict] = None) -> PlanResult:
+        """Return a cached result or run plan() and store it; metrics gain 'cached' and 'cache' stats."""
+        key = self.key(env, planner, start, departure, options)
+        result = self.get(key)
+        cached = result is not None
+        if not cached:
+            path, metrics = plan()
+            result = (path, {k: v for k, v in metrics.items() if k != 'cache'})
+            self.put(key, result)
+        path, metrics = result
+        return list(path), dict(metrics, cached=cached, cache=dict(self.stats))
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -1,6 +1,9 @@
 import heapq
-from typing import List, Tuple, Dict
+from collections import deque
+from typing import Callable, List, Optional, Tuple, Dict
 from grid import GridEnvironment
+# Profiler, PlanCache and LandmarkTable appear in annotations only; callers import them when they use them
+import math
 import time
 import random
 import numpy as np
@@ -14,119 +17,505 @@ import numpy as np
 # from grid import GridEnvironment  # Absolute import (sys.path will handle location)
 # # ... (rest of your planners.py code: class Planner, methods bfs/ucs/etc.)
 
-class Planner:
+SA_SHORTCUT_WINDOW = 8  # Furthest path index a shortcut may jump to
+DENSE_SEARCH_LIMIT = 1 << 22  # Cells above which SearchSpace keeps per-cell state in dicts, not arrays
+
+# Temperature at step k of n, from initial temperature t0 and cooling rate alpha
+COOLING_SCHEDULES = {
+    'geometric': lambda t0, k, n, alpha: t0 * alpha ** k,
+    'linear': lambda t0, k, n, alpha: t0 * max(1 - k / n, 1e-3),
+    'log': lambda t0, k, n, alpha: t0 / math.log(k + 2),
+}
+
+
+def _anneal_job(job):
+    # Module-level so a process pool can pickle it
+    planner, path, seed, params = job
+    return planner._anneal(path, random.Random(seed), *params)
+
+
+class _Sparse(dict):
+    # Dict that reads missing keys as a default, so it can stand in for a dense per-cell array
+    def __init__(self, default):
+        super().__init__()
+        self.default = default
+
+    def __missing__(self, key):
+        return self.default
+
+
+class SearchSpace:
+    """Flat per-cell search state (parent, g, depth) keyed by row * cols + col.
+
+    Maps over DENSE_SEARCH_LIMIT cells (e.g. tiled out-of-core maps) keep the
+    state in dicts holding only the cells the search touches.
+    """
+
     def __init__(self, env: GridEnvironment):
+        self.cols = env.cols
+        size = env.rows * env.cols
+        if size > DENSE_SEARCH_LIMIT:
+            self.parent, self.g, self.depth = _Sparse(-2), _Sparse(np.inf), _Sparse(0)
+            return
+        self.parent = np.full(size, -2, dtype=np.int64)  # -2 unseen, -1 root
+        self.g = np.full(size, np.inf, dtype=np.float64)
+        self.depth = np.zeros(size, dtype=np.int32)  # Time step at which the path reaches the cell (departure + steps)
+
+    def index(self, pos: Tuple[int, int]) -> int:
+        return pos[0] * self.cols + pos[1]
+
+    def position(self, idx: int) -> Tuple[int, int]:
+        return divmod(idx, self.cols)
+
+    def seen(self, idx: int) -> bool:
+        return self.parent[idx] != -2
+
+    def open(self, idx: int, parent: int, g: float, depth: int):
+        self.parent[idx] = parent
+        self.g[idx] = g
+        self.depth[idx] = depth
+
+    def extract_path(self, idx: int) -> List[Tuple[int, int]]:
+        path = []
+        while idx != -1:
+            path.append(self.position(idx))
+            idx = int(self.parent[idx])
+        path.reverse()
+        return path
+
+
+class Planner:
+    METHODS = {'bfs': 'bfs', 'ucs': 'ucs', 'astar': 'astar', 'ara': 'ara', 'bidijkstra': 'bidijkstra',
+               'biastar': 'biastar', 'sa': 'simulated_annealing'}
+
+    def __init__(self, env: GridEnvironment, profiler: Optional['Profiler'] = None, cache: Optional['PlanCache'] = None,
+                 landmarks: Optional['LandmarkTable'] = None):
         self.env = env
+        self.profiler = profiler  # Opt-in instrumentation; None keeps the loops uninstrumented
+        self.cache = cache
+        self.landmarks = landmarks  # ALT bounds that tighten heuristic() for astar/ara/biastar/sa
+
+    def plan(self, method: str, start: Tuple[int, int], departure: int = 0, **options) -> Tuple[List[Tuple[int, int]], Dict]:
+        """Run a search method by name (see METHODS) leaving start at time `departure`.
+
+        Goes through the plan cache when one is set.
+        """
+        run = getattr(self, self.METHODS[method])
+        if self.cache is None:
+            return run(start, departure=departure, **options)
+        return self.cache.get_or_plan(self.env, method, start, lambda: run(start, departure=departure, **options),
+                                      departure, options)
 
     def manhattan_heuristic(self, pos: Tuple[int, int]) -> int:
         return abs(pos[0] - self.env.goal[0]) + abs(pos[1] - self.env.goal[1])
 
-    def bfs(self, start: Tuple[int, int]) -> Tuple[List[Tuple[int, int]], Dict]:
-        start_time = time.time()
-        queue = [(start, [start])]  # (pos, path)
-        visited = set([start])
+    def octile_heuristic(self, pos: Tuple[int, int]) -> float:
+        dx, dy = abs(pos[0] - self.env.goal[0]), abs(pos[1] - self.env.goal[1])
+        return max(dx, dy) + (math.sqrt(2) - 1) * min(dx, dy)
+
+    def euclidean_heuristic(self, pos: Tuple[int, int]) -> float:
+        return math.hypot(pos[0] - self.env.goal[0], pos[1] - self.env.goal[1])
+
+    def heuristic(self, consistent: bool = False) -> Callable[[Tuple[int, int]], float]:
+        # Admissible for the env's movement model (every cell costs at least 1 per unit step);
+        # consistent=True skips ALT bounds that are rounded down and so may not be consistent
+        if self.env.movement == '4':
+            base = self.manhattan_heuristic
+        elif self.env.movement == '8':
+            base = self.octile_heuristic
+        else:
+            base = self.euclidean_heuristic
+        if self.landmarks is not None and (self.landmarks.exact or not consistent):
+            return self.landmarks.heuristic(self.env.goal, base)
+        return base
+
+    def bfs(self, start: Tuple[int, int], departure: int = 0) -> Tuple[List[Tuple[int, int]], Dict]:
+        start_time = time.perf_counter()
+        prof = self.profiler
+        space = SearchSpace(self.env)
+        root, goal = space.index(start), space.index(self.env.goal)
+        space.open(root, -1, 0, departure)
+        queue = deque([root])
         nodes_expanded = 0
+        path = []
         while queue:
-            pos, path = queue.pop(0)
+            idx = queue.popleft()
             nodes_expanded += 1
-            if pos == self.env.goal:
-                return path, {'cost': len(path) - 1, 'nodes': nodes_expanded, 'time': time.time() - start_time}
-            for next_pos, _ in self.env.successors(pos, len(path)):
-                if next_pos not in visited:
-                    visited.add(next_pos)
-                    queue.append((next_pos, path + [next_pos]))
-        return [], {'cost': float('inf'), 'nodes': nodes_expanded, 'time': time.time() - start_time}
-
-    def ucs(self, start: Tuple[int, int]) -> Tuple[List[Tuple[int, int]], Dict]:
-        start_time = time.time()
-        pq = [(0, start, [start])]  # (cost, pos, path)
-        visited = {start: 0}
-        nodes_expanded = 0
-        while pq:
-            cost, pos, path = heapq.heappop(pq)
+            if prof is not None:
+                prof.expand(space.position(idx), int(space.g[idx]), len(queue))
+            if idx == goal:
+                path = space.extract_path(idx)
+                break
+            depth = int(space.depth[idx])
+            for next_pos, _ in self.env.successors(space.position(idx), depth):
+                next_idx = space.index(next_pos)
+                if not space.seen(next_idx):
+                    space.open(next_idx, idx, space.g[idx] + 1, depth + 1)
+                    queue.append(next_idx)
+        if prof is not None:
+            prof.record_search(nodes_expanded + len(queue), nodes_expanded, 0)
+        cost = len(path) - 1 if path else float('inf')
+        return path, {'cost': cost, 'nodes': nodes_expanded, 'time': time.perf_counter() - start_time}
+
+    def ucs(self, start: Tuple[int, int], departure: int = 0) -> Tuple[List[Tuple[int, int]], Dict]:
+        return self._best_first(start, None, departure)
+
+    def astar(self, start: Tuple[int, int], departure: int = 0) -> Tuple[List[Tuple[int, int]], Dict]:
+        return self._best_first(start, self.heuristic(), departure)
+
+    def bidijkstra(self, start: Tuple[int, int], departure: int = 0) -> Tuple[List[Tuple[int, int]], Dict]:
+        """Bidirectional Dijkstra; falls back to ucs when moving obstacles are loaded."""
+        if self.env.moving_obstacles:
+            return self._fallback(self.ucs, start, departure)
+        return self._bidirectional(start, None)
+
+    def biastar(self, start: Tuple[int, int], departure: int = 0) -> Tuple[List[Tuple[int, int]], Dict]:
+        """Bidirectional A* with average potentials; falls back to astar when moving obstacles are loaded."""
+        if self.env.moving_obstacles:
+            return self._fallback(self.astar, start, departure)
+        metric = {'4': lambda dx, dy: dx + dy,
+                  '8': lambda dx, dy: max(dx, dy) + (math.sqrt(2) - 1) * min(dx, dy)}.get(self.env.movement, math.hypot)
+        (sx, sy), (gx, gy) = start, self.env.goal
+        to_goal = lambda pos: metric(abs(pos[0] - gx), abs(pos[1] - gy))
+        from_start = lambda pos: metric(abs(pos[0] - sx), abs(pos[1] - sy))
+        if self.landmarks is not None and self.landmarks.exact:  # Rounded (diagonal) bounds are not consistent
+            to_goal = self.landmarks.heuristic(self.env.goal, to_goal)
+            from_start = self.landmarks.heuristic(start, from_start, reverse=True)
+
+        def potential(pos: Tuple[int, int]) -> float:
+            # (h_goal - h_start) / 2 is consistent for both directions when each h is
+            return (to_goal(pos) - from_start(pos)) / 2
+
+        return self._bidirectional(start, potential)
+
+    def _fallback(self, search: Callable, start: Tuple[int, int], departure: int) -> Tuple[List[Tuple[int, int]], Dict]:
+        # A reverse search cannot know when the goal is reached, so time-dependent maps search forward only
+        path, metrics = search(start, departure)
+        return path, dict(metrics, fallback=search.__name__)
+
+    def _bidirectional(self, start: Tuple[int, int],
+                       potential: Optional[Callable[[Tuple[int, int]], float]]) -> Tuple[List[Tuple[int, int]], Dict]:
+        # Forward keys are d_f + p, reverse keys d_r - p; with a feasible potential p, no
+        # path through unsettled cells can beat the best meeting cost mu once top_f + top_r >= mu.
+        start_time = time.perf_counter()
+        prof = self.profiler
+        goal = self.env.goal
+        table = self.env.neighbor_table
+        cols = self.env.cols
+        terrain = self.env.cost_grid().ravel()
+        root, target = start[0] * cols + start[1], goal[0] * cols + goal[1]
+        fail = {'cost': float('inf'), 'nodes': 0, 'time': 0.0}
+        if terrain[root] == np.inf or terrain[target] == np.inf:
+            fail['time'] = time.perf_counter() - start_time
+            return [], fail
+        p = (lambda idx: potential(divmod(idx, cols))) if potential else (lambda idx: 0)
+        dist = ({root: 0}, {target: 0})
+        parent = ({root: -1}, {target: -1})  # Reverse parents point one step toward the goal
+        settled = (set(), set())
+        queues = ([(p(root), 0, root)], [(-p(target), 0, target)])
+        sign = (1, -1)
+        mu, meet = (0, root) if root == target else (float('inf'), -1)  # start == goal meets before any relaxation
+        nodes_expanded = stale = 0
+        while queues[0] and queues[1]:
+            if queues[0][0][0] + queues[1][0][0] >= mu:
+                break
+            side = 0 if queues[0][0][0] <= queues[1][0][0] else 1  # Expand the smaller frontier key
+            _, d, u = heapq.heappop(queues[side])
+            if u in settled[side] or d > dist[side][u]:
+                stale += 1
+                continue
+            settled[side].add(u)
             nodes_expanded += 1
-            if pos == self.env.goal:
-                return path, {'cost': cost, 'nodes': nodes_expanded, 'time': time.time() - start_time}
-            for next_pos, edge_cost in self.env.successors(pos, len(path)):
-                new_cost = cost + edge_cost
-                if new_cost < visited.get(next_pos, float('inf')):
-                    visited[next_pos] = new_cost
-                    heapq.heappush(pq, (new_cost, next_pos, path + [next_pos]))
-        return [], {'cost': float('inf'), 'nodes': nodes_expanded, 'time': time.time() - start_time}
-
-    def astar(self, start: Tuple[int, int]) -> Tuple[List[Tuple[int, int]], Dict]:
-        start_time = time.time()
-        pq = [(0 + self.manhattan_heuristic(start), 0, start, [start])]  # (f, g, pos, path)
-        visited = {start: 0}
-        nodes_expanded = 0
+            if prof:
+                prof.expand(divmod(u, cols), d, len(queues[0]) + len(queues[1]))
+            lo, hi = table.indptr[u], table.indptr[u + 1]
+            if side == 0:
+                moves = zip(table.indices[lo:hi].tolist(), table.costs[lo:hi].tolist())
+            else:
+                # Predecessor v of u: the move v -> u enters u, costing u's terrain times the step
+                enter = terrain[u]
+                moves = ((v, enter * step if step != 1 else int(enter))
+                         for v, step in zip(table.indices[lo:hi].tolist(), table.steps[lo:hi].tolist()))
+            other = dist[1 - side]
+            for v, cost in moves:
+                nd = d + cost
+                if nd < dist[side].get(v, float('inf')):
+                    dist[side][v] = nd
+                    parent[side][v] = u
+                    heapq.heappush(queues[side], (nd + sign[side] * p(v), nd, v))
+                    if v in other and nd + other[v] < mu:
+                        mu, meet = nd + other[v], v
+        if prof:
+            pops = nodes_expanded + stale
+            prof.record_search(pops + len(queues[0]) + len(queues[1]), pops, stale)
+        if meet == -1:
+            fail.update(nodes=nodes_expanded, time=time.perf_counter() - start_time)
+            return [], fail
+        path = []
+        node = meet
+        while node != -1:
+            path.append(divmod(node, cols))
+            node = parent[0][node]
+        path.reverse()
+        node = parent[1][meet]
+        while node != -1:
+            path.append(divmod(node, cols))
+            node = parent[1][node]
+        return path, {'cost': dist[0][meet] + dist[1][meet], 'nodes': nodes_expanded, 'time': time.perf_counter() - start_time}
+
+    def ara(self, start: Tuple[int, int], weight: float = 3.0, weight_step: float = 0.5,
+            time_budget: Optional[float] = None, departure: int = 0) -> Tuple[List[Tuple[int, int]], Dict]:
+        """Anytime Repairing A*: a fast weighted-A* path first, then tighter ones while time remains.
+
+        Each round searches with f = g + weight * h, reusing g-values from the
+        previous round (only inconsistent cells are re-opened), then lowers the
+        weight by weight_step until it reaches 1 (optimal) or time_budget seconds
+        pass. The first round always runs to completion, so there is a path
+        whenever one exists, even if that overruns time_budget. The best path so
+        far is returned; metrics['bound'] guarantees cost <= bound * optimal (inf
+        when there is no path), metrics['weight'] is the weight of the round
+        that found it, and metrics['solutions'] lists each round's (seconds, cost, bound).
+        """
+        start_time = time.perf_counter()
+        deadline = start_time + time_budget if time_budget is not None else float('inf')
+        prof = self.profiler
+        heuristic = self.heuristic(consistent=True)  # Rounds never re-expand a closed cell
+        space = SearchSpace(self.env)
+        root, goal = space.index(start), space.index(self.env.goal)
+        space.open(root, -1, 0, departure)
+        g_values, depths = space.g, space.depth
+        h = {}  # Cell index -> heuristic, computed once per cell across rounds
+
+        def h_of(idx: int) -> float:
+            if idx not in h:
+                h[idx] = heuristic(space.position(idx))
+            return h[idx]
+
+        w = max(weight, 1.0)
+        pq = [(w * h_of(root), 0, root)]
+        incons = set()
+        path, cost, bound = [], float('inf'), float('inf')
+        solved_weight = w
+        solutions = []
+        nodes_expanded = stale = 0
+        timed_out = False
+        while True:
+            closed = set()
+            # ImprovePath: expand while some open cell could still beat the goal's weighted f
+            while pq and pq[0][0] < g_values[goal]:
+                if path and time.perf_counter() > deadline:
+                    timed_out = True
+                    break
+                _, g, idx = heapq.heappop(pq)
+                if g > g_values[idx] or idx in closed:
+                    stale += 1
+                    continue
+                closed.add(idx)
+                nodes_expanded += 1
+                if prof is not None:
+                    prof.expand(space.position(idx), g, len(pq))
+                depth = int(depths[idx])
+                for next_pos, edge_cost in self.env.successors(space.position(idx), depth):
+                    new_g = g + edge_cost
+                    next_idx = space.index(next_pos)
+                    if new_g < g_values[next_idx]:
+                        space.open(next_idx, idx, new_g, depth + 1)
+                        if next_idx in closed:
+                            incons.add(next_idx)  # Fixed up in the next, less greedy round
+                        else:
+                            heapq.heappush(pq, (new_g + w * h_of(next_idx), new_g, next_idx))
+            if timed_out:
+                break
+            if g_values[goal] < cost:
+                path, cost = space.extract_path(goal), float(g_values[goal])
+            if not path:
+                break  # Open list exhausted: no path at any weight
+            # Suboptimality bound: optimal cost >= smallest unweighted f among open/inconsistent cells
+            frontier = [g_values[i] + h_of(i) for _, g, i in pq if g == g_values[i]]
+            frontier.extend(g_values[i] + h_of(i) for i in incons)
+            lower = min(frontier, default=cost)
+            bound = float(min(w, cost / lower)) if lower > 0 else 1.0
+            solved_weight = w
+            solutions.append((time.perf_counter() - start_time, cost, bound))
+            if w <= 1.0 or bound <= 1.0:
+                break
+            w = max(1.0, min(w - weight_step, bound))  # No point searching looser than the proven bound
+            live = {i: g for _, g, i in pq if g == g_values[i]}
+            live.update((i, g_values[i]) for i in incons)
+            pq = [(g + w * h_of(i), g, i) for i, g in live.items()]
+            heapq.heapify(pq)
+            incons = set()
+        if prof is not None:
+            pops = nodes_expanded + stale
+            prof.record_search(pops + len(pq), pops, stale)
+        return path, {'cost': cost, 'nodes': nodes_expanded, 'time': time.perf_counter() - start_time,
+                      'bound': bound, 'weight': solved_weight, 'solutions': solutions}
+
+    def _best_first(self, start: Tuple[int, int], heuristic: Optional[Callable[[Tuple[int, int]], float]],
+                    departure: int = 0) -> Tuple[List[Tuple[int, int]], Dict]:
+        # Shared UCS/A* loop: heap of (f, g, cell index), stale entries skipped on pop
+        start_time = time.perf_counter()
+        prof = self.profiler
+        space = SearchSpace(self.env)
+        root, goal = space.index(start), space.index(self.env.goal)
+        space.open(root, -1, 0, departure)
+        pq = [(heuristic(start) if heuristic else 0, 0, root)]
+        g_values, depths = space.g, space.depth
+        nodes_expanded = stale = 0
+        path, cost = [], float('inf')
         while pq:
-            _, g, pos, path = heapq.heappop(pq)
+            _, g, idx = heapq.heappop(pq)
+            if g > g_values[idx]:
+                stale += 1
+                continue  # Superseded by a cheaper push
             nodes_expanded += 1
-            if pos == self.env.goal:
-                return path, {'cost': g, 'nodes': nodes_expanded, 'time': time.time() - start_time}
-            for next_pos, edge_cost in self.env.successors(pos, len(path)):
+            if prof is not None:
+                prof.expand(space.position(idx), g, len(pq))
+            if idx == goal:
+                path, cost = space.extract_path(idx), g
+                break
+            depth = int(depths[idx])
+            for next_pos, edge_cost in self.env.successors(space.position(idx), depth):
                 new_g = g + edge_cost
-                if new_g < visited.get(next_pos, float('inf')):
-                    h = self.manhattan_heuristic(next_pos)
-                    visited[next_pos] = new_g
-                    heapq.heappush(pq, (new_g + h, new_g, next_pos, path + [next_pos]))
-        return [], {'cost': float('inf'), 'nodes': nodes_expanded, 'time': time.time() - start_time}
-
-    def simulated_annealing(self, start: Tuple[int, int], max_steps: int = 200) -> Tuple[List[Tuple[int, int]], Dict]:
-        # Local search for replanning: Start with greedy path, perturb and anneal
-        random.seed(42)
-        current_path = self._greedy_path(start)  # Initial hill-climb approximation
-        if not current_path:
-            return [], {'cost': float('inf'), 'nodes': 0, 'time': 0}
-        current_cost = self._path_cost(current_path)
-        best_path, best_cost = current_path[:], current_cost
-        temp = 1000
-        cooling = 0.995
-        nodes_expanded = len(current_path)  # Approximate
-        start_time = time.time()
-
-        for _ in range(max_steps):
-            # Perturb: Random swap or insert wait
-            new_path = self._perturb_path(current_path)
-            new_cost = self._path_cost(new_path)
-            delta = new_cost - current_cost
-            if delta < 0 or random.random() < np.exp(-delta / temp):
-                current_path, current_cost = new_path, new_cost
-                if current_cost < best_cost:
-                    best_path, best_cost = current_path[:], current_cost
-            temp *= cooling
-            nodes_expanded += 1  # Per iteration
-
-        return best_path, {'cost': best_cost, 'nodes': nodes_expanded, 'time': time.time() - start_time}
-
-    def _greedy_path(self, start: Tuple[int, int]) -> List[Tuple[int, int]]:
+                next_idx = space.index(next_pos)
+                if new_g < g_values[next_idx]:
+                    space.open(next_idx, idx, new_g, depth + 1)
+                    h = heuristic(next_pos) if heuristic else 0
+                    heapq.heappush(pq, (new_g + h, new_g, next_idx))
+        if prof is not None:
+            # Every push is either popped or still queued
+            pops = nodes_expanded + stale
+            prof.record_search(pops + len(pq), pops, stale)
+        return path, {'cost': cost, 'nodes': nodes_expanded, 'time': time.perf_counter() - start_time}
+
+    def simulated_annealing(self, start: Tuple[int, int], max_steps: int = 200, chains: int = 1, workers: int = 1,
+                            schedule: str = 'geometric', temp: float = 10.0, cooling: float = 0.995,
+                            time_budget: Optional[float] = None, seed: int = 42,
+                            departure: int = 0) -> Tuple[List[Tuple[int, int]], Dict]:
+        """Anneal a seed path with local, always-valid edits; best of `chains` seeded runs.
+
+        Chains use seeds seed, seed + 1, ... and run on a process pool when workers > 1.
+        time_budget (seconds) caps each chain's wall-clock time on top of max_steps.
+        Only the seed path sees moving obstacles (from time `departure`); edits are
+        checked against static terrain.
+        """
+        if schedule not in COOLING_SCHEDULES:
+            raise ValueError(f"Unknown cooling schedule {schedule!r}; choose from {', '.join(COOLING_SCHEDULES)}")
+        start_time = time.perf_counter()
+        initial = self._greedy_path(start, departure) or self.bfs(start, departure)[0]  # Greedy can dead-end; BFS cannot miss a path
+        if not initial:
+            return [], {'cost': float('inf'), 'nodes': 0, 'time': time.perf_counter() - start_time}
+        params = (max_steps, schedule, temp, cooling, time_budget)
+        worker = Planner(self.env)  # No profiler/cache: they hold locks and connections that do not pickle
+        jobs = [(worker, initial, seed + k, params) for k in range(max(chains, 1))]
+        if workers > 1 and len(jobs) > 1:
+            from concurrent.futures import ProcessPoolExecutor  # Deferred: pulls in multiprocessing
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_anneal_job, jobs))
+        else:
+            results = [_anneal_job(job) for job in jobs]
+        best_path, best_cost, _, _ = min(results, key=lambda r: r[1])
+        iterations = sum(r[2] for r in results)
+        return best_path, {'cost': best_cost, 'nodes': len(initial) + iterations, 'time': time.perf_counter() - start_time,
+                           'chains': len(results), 'accepted': sum(r[3] for r in results)}
+
+    def _anneal(self, path: List[Tuple[int, int]], rng: random.Random, max_steps: int, schedule: str,
+                temp: float, cooling: float, time_budget: Optional[float]) -> Tuple[List[Tuple[int, int]], float, int, int]:
+        path = path[:]
+        edges = self._edge_costs(path)
+        prefix = np.concatenate(([0.0], np.cumsum(edges)))
+        current_cost = prefix[-1]
+        best_path, best_cost = path[:], current_cost
+        cool = COOLING_SCHEDULES[schedule]
+        deadline = time.perf_counter() + time_budget if time_budget is not None else None
+        accepted = steps = 0
+        for steps in range(1, max_steps + 1):
+            if deadline is not None and steps % 64 == 0 and time.perf_counter() > deadline:
+                break
+            move = self._propose(path, edges, rng)
+            if move is None:
+                continue
+            lo, hi, cells, new_edges = move
+            # O(1) delta: the replaced stretch path[lo] -> path[hi] is a prefix-cost difference
+            delta = sum(new_edges) - (prefix[hi] - prefix[lo])
+            t = cool(temp, steps, max_steps, cooling)
+            if delta <= 0 or rng.random() < math.exp(-delta / t):
+                path[lo + 1:hi] = cells
+                edges = np.concatenate((edges[:lo], new_edges, edges[hi:]))
+                prefix = np.concatenate(([0.0], np.cumsum(edges)))
+                current_cost = prefix[-1]
+                accepted += 1
+                if current_cost < best_cost - 1e-9:
+                    best_path, best_cost = path[:], current_cost
+        best_cost = int(round(best_cost)) if self.env.movement == '4' else float(best_cost)  # Integer costs stay ints
+        return best_path, best_cost, steps, accepted
+
+    def _propose(self, path: List[Tuple[int, int]], edges: np.ndarray, rng: random.Random):
+        """Pick a local edit (lo, hi, cells, edge costs): path[lo+1:hi] becomes cells.
+
+        Edits keep the path connected, so only the few new edges need checking:
+        shortcut (skip cells between two adjacent path cells), corner flip, or a
+        detour that bumps one edge sideways. Returns None if the edit is illegal.
+        """
+        n = len(path)
+        edge = self.env.edge_cost
+        kind = rng.random()
+        if kind < 0.4 and n >= 3:
+            i = rng.randrange(n - 2)
+            j = rng.randrange(i + 2, min(i + SA_SHORTCUT_WINDOW, n - 1) + 1)
+            if path[i] == path[j]:  # Loop: drop it together with the repeated cell
+                if j + 1 >= n:
+                    return None
+                return i, j + 1, [], [edges[j]]
+            cost = edge(path[i], path[j])
+            return (i, j, [], [cost]) if cost != float('inf') else None
+        if kind < 0.7 and n >= 3:
+            i = rng.randrange(n - 2)
+            (ax, ay), (bx, by), (cx, cy) = path[i], path[i + 1], path[i + 2]
+            flipped = (ax + cx - bx, ay + cy - by)
+            if flipped == path[i + 1]:
+                return None
+            new_edges = [edge(path[i], flipped), edge(flipped, path[i + 2])]
+        elif n >= 2:
+            i = rng.randrange(n - 1)
+            dx, dy = rng.choice(self.env.stencil)
+            a, b = path[i], path[i + 1]
+            c, d = (a[0] + dx, a[1] + dy), (b[0] + dx, b[1] + dy)
+            if c == b or d == a:
+                return None  # Offset along the edge would just double back
+            new_edges = [edge(a, c), edge(c, d), edge(d, b)]
+            return (i, i + 1, [c, d], new_edges) if max(new_edges) != float('inf') else None
+        else:
+            return None
+        if max(new_edges) == float('inf'):
+            return None
+        return i, i + 2, [flipped], new_edges
+
+    def _greedy_path(self, start: Tuple[int, int], departure: int = 0) -> List[Tuple[int, int]]:
         path = [start]
         pos = start
+        visited = {start}
+        h = self.heuristic()
         while pos != self.env.goal:
-            succ = self.env.successors(pos, len(path))
+            # Never step back onto the path: otherwise greedy can oscillate forever
+            succ = [s for s in self.env.successors(pos, departure + len(path) - 1) if s[0] not in visited]
             if not succ:
                 return []
             # Greedy: Min heuristic successor
-            next_pos = min(succ, key=lambda x: self.manhattan_heuristic(x[0]))
+            next_pos = min(succ, key=lambda x: h(x[0]))
             path.append(next_pos[0])
             pos = next_pos[0]
+            visited.add(pos)
         return path
 
-    def _path_cost(self, path: List[Tuple[int, int]]) -> int:
-        cost = 0
-        for i in range(len(path) - 1):
-            edge_cost = self.env.get_cost(path[i+1])
-            if edge_cost == float('inf'):
-                return float('inf')
-            cost += edge_cost
-        return cost
-
-    def _perturb_path(self, path: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
-        # Random restart-like: Swap two points or add detour
-        idx1, idx2 = random.sample(range(1, len(path)-1), 2)
-        new_path = path[:]
-        new_path[idx1], new_path[idx2] = new_path[idx2], new_path[idx1]
-        # Ensure validity (simple check)
-        if self._path_cost(new_path) == float('inf'):
-            return path  # Revert
-        return new_path
\ No newline at end of file
+    def _edge_costs(self, path: List[Tuple[int, int]]) -> np.ndarray:
+        # Vectorized per-step costs: target terrain times step length (inf on walls)
+        if len(path) < 2:
+            return np.zeros(0)
+        cells = np.asarray(path)
+        terrain = self.env.grid[cells[1:, 0], cells[1:, 1]].astype(np.float64)
+        terrain[terrain == -1] = np.inf
+        return terrain * np.hypot(*np.diff(cells, axis=0).T)
+
+    def _path_cost(self, path: List[Tuple[int, int]]) -> float:
+        return float(self._edge_costs(path).sum())
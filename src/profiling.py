@@ -0,0 +1,95 @@
+import json
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Callable, Dict, Optional, Tuple
+
+ExpandHook = Callable[[Tuple[int, int], float, int], None]  # (pos, g, frontier size)
+
+# successors reads its moves from _edges and filters them with _unoccupied (one call per
+# expansion each); is_occupied and get_cost are counted only when called per cell
+HOT_METHODS = ('successors', '_edges', '_unoccupied', 'is_occupied', 'get_cost')
+
+
+class Profiler:
+    """Opt-in counters and timers for one or more planning runs.
+
+    attach() shadows the environment's hot methods with timed wrappers on that
+    instance only, and planners report frontier events through expand() /
+    record_search(). Nothing is wrapped or counted unless a profiler is attached.
+    Method times are inclusive: successors time contains its _edges and
+    _unoccupied calls. Only Planner's searches (bfs, ucs, astar, ara and the
+    bidirectional ones) report expansions and frontier sizes; JPS, SIPP, HPA*
+    and D* Lite get method counters only.
+    """
+
+    def __init__(self, track_memory: bool = False, on_expand: Optional[ExpandHook] = None):
+        self.track_memory = track_memory
+        self.on_expand = on_expand
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.peak_frontier = 0
+        self.peak_memory_kb = 0.0
+        self.wall_time = 0.0
+        self._started = None
+
+    def attach(self, env):
+        for name in HOT_METHODS:
+            if hasattr(env, name):
+                setattr(env, name, self._timed(name, getattr(env, name)))
+        return self
+
+    def detach(self, env):
+        for name in HOT_METHODS:
+            env.__dict__.pop(name, None)  # Fall back to the class method
+
+    def _timed(self, name: str, fn: Callable) -> Callable:
+        calls, seconds, clock = self.calls, self.seconds, time.perf_counter
+
+        def wrapper(*args):
+            t0 = clock()
+            try:
+                return fn(*args)
+            finally:
+                seconds[name] += clock() - t0
+                calls[name] += 1
+        return wrapper
+
+    def start(self):
+        self._started = time.perf_counter()
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop(self):
+        if self._started is not None:
+            self.wall_time += time.perf_counter() - self._started
+            self._started = None
+        if self.track_memory and tracemalloc.is_tracing():
+            self.peak_memory_kb = max(self.peak_memory_kb, tracemalloc.get_traced_memory()[1] / 1024)
+            tracemalloc.stop()
+
+    def expand(self, pos: Tuple[int, int], g: float, frontier: int):
+        self.counters['expansions'] += 1
+        if frontier > self.peak_frontier:
+            self.peak_frontier = frontier
+        if self.on_expand is not None:
+            self.on_expand(pos, g, frontier)
+
+    def record_search(self, pushes: int, pops: int, stale: int):
+        self.counters['pushes'] += pushes
+        self.counters['pops'] += pops
+        self.counters['stale_pops'] += stale
+
+    def report(self) -> Dict:
+        return {
+            'wall_time': self.wall_time,
+            'calls': dict(self.calls),
+            'seconds': dict(self.seconds),
+            'counters': dict(self.counters),
+            'peak_frontier': self.peak_frontier,
+            'peak_memory_kb': self.peak_memory_kb if self.track_memory else None,
+        }
+
+    def to_json(self, indent: int = 2) -> str:
+        return json.dumps(self.report(), indent=indent)
@@ -0,0 +1,188 @@
+import sys
+import os
+src_dir = os.path.dirname(os.path.abspath(__file__))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+import argparse
+import json
+import struct
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from grid import GridEnvironment, resolve_map
+
+# RGB colours; terrain is shaded between the two TERRAIN ends by cost
+TERRAIN = (np.array([222, 235, 247]), np.array([8, 81, 156]))
+WALL = (45, 45, 45)
+PATH = (214, 39, 40)
+START = (44, 160, 44)
+GOAL = (140, 20, 20)
+VEHICLE = (0, 0, 0)
+AGENT = (255, 200, 0)
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+
+def _idat(rgb: np.ndarray, level: int) -> bytes:
+    # Filter type 0 (none) on every scanline: a zero byte ahead of each row
+    h, w, _ = rgb.shape
+    raw = np.zeros((h, w * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = rgb.reshape(h, w * 3)
+    return zlib.compress(raw.tobytes(), level)
+
+
+def write_png(file: str, rgb: np.ndarray, level: int = 6):
+    """Write an (H, W, 3) uint8 array as an 8-bit RGB PNG using only zlib."""
+    h, w, _ = rgb.shape
+    with open(file, 'wb') as f:
+        f.write(PNG_SIGNATURE + _chunk(b'IHDR', struct.pack('>IIBBBBB', w, h, 8, 2, 0, 0, 0))
+                + _chunk(b'IDAT', _idat(rgb, level)) + _chunk(b'IEND', b''))
+
+
+def write_apng(file: str, frames: Iterable[np.ndarray], count: int, delay_ms: int = 100, level: int = 6):
+    """Write `count` equally sized RGB frames as a looping animated PNG (plain PNG viewers show frame 0).
+
+    Frames may come from a generator; each is compressed as it arrives, so long
+    timelines never sit in memory uncompressed.
+    """
+    if count < 1:
+        raise ValueError("Animation needs at least one frame")
+    out = []
+    seq = 0
+    for k, frame in enumerate(frames):
+        if k == 0:
+            h, w, _ = frame.shape
+            out += [PNG_SIGNATURE, _chunk(b'IHDR', struct.pack('>IIBBBBB', w, h, 8, 2, 0, 0, 0)),
+                    _chunk(b'acTL', struct.pack('>II', count, 0))]
+        out.append(_chunk(b'fcTL', struct.pack('>IIIIIHHBB', seq, w, h, 0, 0, delay_ms, 1000, 0, 0)))
+        seq += 1
+        data = _idat(frame, level)
+        if k == 0:
+            out.append(_chunk(b'IDAT', data))
+        else:
+            out.append(_chunk(b'fdAT', struct.pack('>I', seq) + data))
+            seq += 1
+    out.append(_chunk(b'IEND', b''))
+    with open(file, 'wb') as f:
+        f.write(b''.join(out))
+
+
+class GridRenderer:
+    """Rasterizes one map and any number of paths straight from NumPy arrays.
+
+    The shaded terrain is computed once; each render copies it, paints path,
+    endpoint and vehicle cells by fancy indexing and scales cells up to `cell`
+    pixels with np.repeat. No Matplotlib figure is involved, so hundreds of
+    runs render in one process at PNG-compression speed.
+    """
+
+    def __init__(self, env: GridEnvironment, cell: Optional[int] = None):
+        self.env = env
+        self.cell = cell or max(1, 800 // max(env.rows, env.cols))
+        grid = env.grid
+        walls = grid == -1
+        top = max(int(grid.max()), 2)
+        shade = np.clip((grid - 1) / (top - 1), 0, 1)[..., None]
+        base = TERRAIN[0] + (TERRAIN[1] - TERRAIN[0]) * shade
+        base[walls] = WALL
+        self.base = base.astype(np.uint8)
+
+    def vehicles(self, t: int) -> np.ndarray:
+        """(N, 2) cells the moving obstacles hold at time t."""
+        cells = [obs['path'][t % len(obs['path'])] for obs in self.env.moving_obstacles.values() if obs['path']]
+        cells = np.array(cells, dtype=np.int64).reshape(-1, 2)
+        inside = (cells[:, 0] >= 0) & (cells[:, 0] < self.env.rows) & (cells[:, 1] >= 0) & (cells[:, 1] < self.env.cols)
+        return cells[inside]
+
+    def frame(self, path: Sequence[Tuple[int, int]] = (), t: int = 0, agent: Optional[Tuple[int, int]] = None,
+              start: Optional[Tuple[int, int]] = None, goal: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        """RGB image of the map with `path`, the vehicles at time t and optionally the agent's cell."""
+        img = self.base.copy()
+        if len(path):
+            cells = np.asarray(path, dtype=np.int64).reshape(-1, 2)
+            img[cells[:, 0], cells[:, 1]] = PATH
+        start = start if start is not None else (path[0] if len(path) else self.env.start)
+        goal = goal if goal is not None else (path[-1] if len(path) else self.env.goal)
+        img[tuple(start)] = START
+        img[tuple(goal)] = GOAL
+        vehicles = self.vehicles(t)
+        img[vehicles[:, 0], vehicles[:, 1]] = VEHICLE
+        if agent is not None:
+            img[tuple(agent)] = AGENT
+        if self.cell > 1:
+            img = np.repeat(np.repeat(img, self.cell, axis=0), self.cell, axis=1)
+        return img
+
+    def save(self, file: str, path: Sequence[Tuple[int, int]] = (), **kwargs):
+        write_png(file, self.frame(path, **kwargs))
+
+    def save_timeline(self, file: str, path: Sequence[Tuple[int, int]], departure: int = 0, delay_ms: int = 100,
+                      max_frames: int = 500):
+        """Animated PNG: one frame per step of `path` (starting at time `departure`) with vehicles moving."""
+        count = min(len(path), max_frames)
+        frames = (self.frame(path[:k + 1], departure + k, path[k], path[0], path[-1]) for k in range(count))
+        write_apng(file, frames, count, delay_ms)
+
+
+def load_paths(file: str) -> List[Dict]:
+    """Runs from a JSON-lines file (e.g. saved server responses); each line needs a "path"."""
+    with open(file) as f:
+        runs = [json.loads(line) for line in f if line.strip()]
+    return [run for run in runs if run.get('path')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless batch renderer: paths on a map straight to PNG')
+    parser.add_argument('--map', required=True, help='Map name (e.g. large) or map file')
+    parser.add_argument('--paths', default=None, metavar='FILE',
+                        help='JSON-lines runs with a "path" field to render instead of planning queries')
+    parser.add_argument('--planner', default='astar', help='Planner for generated queries (bfs/ucs/astar/...)')
+    parser.add_argument('--queries', type=int, default=100, help='Generated queries to plan and render')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out-dir', default='renders')
+    parser.add_argument('--cell', type=int, default=None, help='Pixels per grid cell (default fits ~800px)')
+    parser.add_argument('--timeline', action='store_true',
+                        help='Write animated PNGs stepping through time with the moving obstacles')
+    args = parser.parse_args()
+
+    from planners import Planner
+    import mapgen
+    try:
+        env = GridEnvironment(*resolve_map(args.map))
+    except (ValueError, FileNotFoundError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if args.paths:
+        runs = load_paths(args.paths)
+    else:
+        planner, default_goal = Planner(env), env.goal
+        runs = []
+        for start, goal in mapgen.queries(env, args.queries, args.seed):
+            env.goal = goal
+            runs.append({'path': planner.plan(args.planner, start)[0]})
+        env.goal = default_goal
+    renderer = GridRenderer(env, args.cell)
+    os.makedirs(args.out_dir, exist_ok=True)
+    t0 = time.perf_counter()
+    rendered = 0
+    for k, run in enumerate(runs):
+        path = [tuple(p) for p in run['path']]
+        if not path:
+            continue
+        file = os.path.join(args.out_dir, f'{os.path.splitext(os.path.basename(args.map))[0]}_{k:04d}.png')
+        if args.timeline:
+            renderer.save_timeline(file, path, int(run.get('departure', 0)))
+        else:
+            renderer.save(file, path)
+        rendered += 1
+    elapsed = time.perf_counter() - t0
+    print(f"Rendered {rendered} runs to {args.out_dir} in {elapsed:.2f}s "
+          f"({rendered / elapsed if elapsed > 0 else 0:.0f} images/s)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,315 @@
+import sys
+import os
+src_dir = os.path.dirname(os.path.abspath(__file__))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from grid import GridEnvironment, resolve_map
+from planners import Planner
+from dstar import DStarLite
+from hpa import HPAPlanner
+from jps import JumpPointPlanner
+from sipp import SIPPPlanner
+
+PLANNERS = ('bfs', 'ucs', 'astar', 'ara', 'bidijkstra', 'biastar', 'sa', 'dstar', 'hpa', 'jps', 'sipp')
+
+Job = Tuple[Tuple[int, int], Optional[Tuple[int, int]], int, float]  # start, goal, departure, absolute deadline
+
+# Per-process state: loaded maps and per-map planners, reused by every batch a worker runs
+_ENVS: Dict[Tuple[str, str], GridEnvironment] = {}
+_HPA: Dict[Tuple[str, str], HPAPlanner] = {}
+_JPS: Dict[Tuple[str, str], JumpPointPlanner] = {}
+_SIPP: Dict[Tuple[str, str], SIPPPlanner] = {}
+_MAPS_DIR = 'maps'
+
+
+def load_env(name: str, movement: str = '4') -> GridEnvironment:
+    key = (name, movement)
+    if key not in _ENVS:
+        _ENVS[key] = GridEnvironment(*resolve_map(name, _MAPS_DIR), movement=movement)
+    return _ENVS[key]
+
+
+def _init_worker(maps_dir: str, preload: List[str]):
+    global _MAPS_DIR
+    _MAPS_DIR = maps_dir
+    for name in preload:
+        load_env(name)
+
+
+def _cell(value, field: str) -> Tuple[int, int]:
+    if not (isinstance(value, (list, tuple)) and len(value) == 2
+            and all(isinstance(v, int) and not isinstance(v, bool) for v in value)):
+        raise ValueError(f"{field} must be [row, col] integers, got {value!r}")
+    return tuple(value)
+
+
+def plan_batch(name: str, movement: str, planner: str, jobs: List[Job]) -> List[Dict]:
+    """Run a batch of queries against one loaded map; expired jobs are skipped, not planned.
+
+    A job that fails (e.g. a start outside the map) gets its own error result;
+    the rest of the batch is still planned.
+    """
+    env = load_env(name, movement)
+    search = Planner(env)
+    results = []
+    default_goal = env.goal
+    for start, goal, departure, deadline in jobs:
+        if time.time() > deadline:
+            results.append({'error': 'deadline exceeded'})
+            continue
+        env.goal = tuple(goal) if goal else default_goal
+        try:
+            for field, cell in (('start', start), ('goal', env.goal)):
+                if env.get_cost(cell) == float('inf'):
+                    raise ValueError(f"{field} {list(cell)} is outside the map or a wall")
+            if planner == 'ara' and deadline < float('inf'):
+                # Spend whatever is left of the request's deadline improving the path
+                path, metrics = search.plan(planner, tuple(start), departure, time_budget=deadline - time.time())
+            elif planner in Planner.METHODS:
+                path, metrics = search.plan(planner, tuple(start), departure)
+            elif planner == 'dstar':
+                path, metrics = DStarLite(env).plan(tuple(start))  # Goal is fixed at construction
+            elif planner == 'jps':
+                key = (name, movement)
+                if key not in _JPS:
+                    _JPS[key] = JumpPointPlanner(env)
+                path, metrics = _JPS[key].plan(tuple(start), env.goal)
+            elif planner == 'sipp':
+                key = (name, movement)
+                if key not in _SIPP:
+                    _SIPP[key] = SIPPPlanner(env)
+                path, metrics = _SIPP[key].plan(tuple(start), departure, env.goal)
+            else:
+                key = (name, movement)
+                if key not in _HPA:
+                    _HPA[key] = HPAPlanner(env)
+                path, metrics = _HPA[key].plan(tuple(start), env.goal)
+        except Exception as e:  # One bad job must not fail the requests batched with it
+            results.append({'error': f'planning failed: {e}'})
+            continue
+        finally:
+            env.goal = default_goal
+        results.append({'path': [list(p) for p in path], 'cost': float(metrics.get('cost', float('inf'))),
+                        'nodes': int(metrics.get('nodes', 0)), 'time': metrics.get('time', 0.0)})
+    return results
+
+
+class _Request:
+    __slots__ = ('id', 'job', 'future', 'cancelled')
+
+    def __init__(self, req_id, job: Job, future: asyncio.Future):
+        self.id = req_id
+        self.job = job
+        self.future = future
+        self.cancelled = False
+
+
+class PlanningServer:
+    """Long-running JSON-lines planning service.
+
+    Each line is a request object; responses carry the request's "id" and may
+    arrive out of order. Ops:
+      {"id", "map", "planner", "start", ["goal"], ["movement"], ["departure"], ["deadline"]}  plan
+      {"op": "cancel", "id"}   cancel a pending plan on this connection
+      {"op": "stats"}          server counters
+    Queries for the same (map, movement, planner) arriving within batch_window
+    seconds run as one job on the pool. With workers=0 batches run on a thread,
+    which keeps tests and tiny deployments free of process startup.
+    """
+
+    def __init__(self, maps_dir: str = 'maps', workers: int = 2, batch_window: float = 0.005, max_batch: int = 64,
+                 preload: Optional[List[str]] = None):
+        self.maps_dir = maps_dir
+        self.workers = workers
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.preload = list(preload or [])
+        self.stats = {'requests': 0, 'completed': 0, 'errors': 0, 'batches': 0, 'batched_requests': 0,
+                      'deadline_misses': 0, 'cancelled': 0}
+        self._pending: Dict[Tuple[str, str, str], List[_Request]] = {}
+        self._pool: Optional[Executor] = None
+        self._server = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0, unix: Optional[str] = None):
+        if self.workers:
+            self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.maps_dir, self.preload))
+        else:
+            _init_worker(self.maps_dir, self.preload)
+            self._pool = ThreadPoolExecutor(1)  # Planner state is per-map, so batches must not overlap
+        if unix:
+            self._server = await asyncio.start_unix_server(self._handle, path=unix)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    @property
+    def address(self):
+        return self._server.sockets[0].getsockname()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        pending: Dict = {}  # Request id -> _Request still awaiting a result, for this connection
+        generated = 0  # Ids handed to plan requests that arrive without one
+
+        def send(message: Dict):
+            if not writer.is_closing():
+                writer.write((json.dumps(message) + '\n').encode())
+
+        def reply(request: _Request):
+            pending.pop(request.id, None)
+            send({'id': request.id, **request.future.result()})
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError as e:
+                    send({'error': f'invalid JSON: {e}'})
+                    continue
+                if not isinstance(message, dict):
+                    send({'error': 'request must be a JSON object'})
+                    continue
+                op = message.get('op', 'plan')
+                req_id = message.get('id')
+                if isinstance(req_id, (list, dict)):
+                    send({'error': 'id must be a string or number'})
+                    continue
+                if op == 'stats':
+                    send({'op': 'stats', **self.stats})
+                elif op == 'cancel':
+                    if req_id in pending:
+                        self._finish(pending[req_id], {'error': 'cancelled'})
+                    else:
+                        send({'id': req_id, 'error': 'unknown request'})
+                elif op == 'plan':
+                    self.stats['requests'] += 1
+                    if req_id is None:
+                        generated += 1
+                        req_id = message['id'] = f'auto-{generated}'  # Echoed in the reply so it can be cancelled
+                    elif req_id in pending:
+                        self.stats['errors'] += 1
+                        send({'id': req_id, 'error': 'duplicate id: a request with this id is still pending'})
+                        continue
+                    try:
+                        request = self._submit(message)
+                    except (ValueError, KeyError, TypeError, FileNotFoundError) as e:
+                        self.stats['errors'] += 1
+                        send({'id': req_id, 'error': str(e)})
+                        continue
+                    pending[req_id] = request
+                    request.future.add_done_callback(lambda _, r=request: reply(r))
+                else:
+                    send({'id': req_id, 'error': f'unknown op {op!r}'})
+                await writer.drain()
+        finally:
+            for request in list(pending.values()):  # Client went away: nobody is waiting for these
+                self._finish(request, {'error': 'cancelled'})
+            writer.close()
+
+    def _finish(self, request: '_Request', result: Dict):
+        if request.future.done():
+            return
+        if 'error' not in result:
+            self.stats['completed'] += 1
+        else:
+            self.stats['errors'] += 1
+            if result['error'] in ('cancelled', 'deadline exceeded'):
+                request.cancelled = True  # Skipped if its batch has not been sent yet
+                self.stats['cancelled' if result['error'] == 'cancelled' else 'deadline_misses'] += 1
+        request.future.set_result(result)
+
+    def _submit(self, message: Dict) -> _Request:
+        planner = message.get('planner', 'astar')
+        if planner not in PLANNERS:
+            raise ValueError(f"Unknown planner {planner!r}; expected one of {', '.join(PLANNERS)}")
+        movement = str(message.get('movement', '4'))
+        name = message['map']
+        resolve_map(name, self.maps_dir)  # Fail fast on unknown maps
+        deadline = message.get('deadline')
+        expires = time.time() + deadline if deadline is not None else float('inf')
+        goal = message.get('goal')
+        job = (_cell(message['start'], 'start'), _cell(goal, 'goal') if goal is not None else None,
+               int(message.get('departure', 0)), expires)
+        loop = asyncio.get_running_loop()
+        request = _Request(message.get('id'), job, loop.create_future())
+        if deadline is not None:
+            # Answer on time even if the batch is still queued or running
+            loop.call_later(deadline, self._finish, request, {'error': 'deadline exceeded'})
+        key = (name, movement, planner)
+        batch = self._pending.setdefault(key, [])
+        batch.append(request)
+        if len(batch) == 1:
+            loop.call_later(self.batch_window, self._flush, key)
+        elif len(batch) >= self.max_batch:
+            self._flush(key)
+        return request
+
+    def _flush(self, key: Tuple[str, str, str]):
+        batch = [r for r in self._pending.pop(key, []) if not r.cancelled]
+        if not batch:
+            return
+        self.stats['batches'] += 1
+        self.stats['batched_requests'] += len(batch)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._pool, plan_batch, *key, [r.job for r in batch])
+        future.add_done_callback(lambda f: self._deliver(batch, f))
+
+    def _deliver(self, batch: List[_Request], future: asyncio.Future):
+        if future.cancelled():
+            results = [{'error': 'server shutting down'}] * len(batch)
+        elif future.exception() is not None:
+            results = [{'error': f'planning failed: {future.exception()}'}] * len(batch)
+        else:
+            results = future.result()
+        for request, result in zip(batch, results):
+            self._finish(request, result)
+
+
+async def _serve_forever(args):
+    server = PlanningServer(args.maps_dir, args.workers, args.batch_window, args.max_batch, args.preload)
+    await server.start(args.host, args.port, args.unix)
+    print(f"Planning server listening on {args.unix or '%s:%d' % server.address[:2]} "
+          f"({args.workers} workers, preloaded: {', '.join(args.preload) or 'none'})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON-lines planning server with map preloading and batching')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, metavar='PATH',
+                        help='Listen on a Unix socket instead of TCP')
+    parser.add_argument('--maps-dir', default='maps')
+    parser.add_argument('--preload', nargs='+', default=[],
+                        help='Maps every worker loads at startup, e.g. small medium large dynamic')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Planning processes (0 plans on a background thread)')
+    parser.add_argument('--batch-window', type=float, default=0.005,
+                        help='Seconds to collect same-map queries into one batch')
+    parser.add_argument('--max-batch', type=int, default=64)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve_forever(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+import sys
+import os
+src_dir = os.path.dirname(os.path.abspath(__file__))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+import argparse
+import json
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from grid import GridEnvironment, resolve_map
+from planners import Planner
+from jps import JumpPointPlanner
+from sipp import SIPPPlanner
+import mapgen
+
+PLANNERS = ('bfs', 'ucs', 'astar', 'ara', 'bidijkstra', 'biastar', 'jps', 'sipp')
+OUTCOMES = ('delivered', 'out_of_fuel', 'out_of_steps', 'collision', 'unreachable')
+
+# Per-process state: the map is loaded once per worker and reused by every episode it runs
+_WORLD: Dict[str, Tuple[GridEnvironment, GridEnvironment, List[Dict]]] = {}
+
+
+def load_map(spec: str, seed: int = 0, movement: str = '4') -> GridEnvironment:
+    """A repo map name or file path, or a generated map written kind-size (e.g. traffic-64)."""
+    kind, _, size = spec.rpartition('-')
+    if kind in mapgen.MAP_KINDS and size.isdigit():
+        env = mapgen.generate(kind, int(size), seed)
+        env.set_movement(movement)
+        return env
+    return GridEnvironment(*resolve_map(spec), movement=movement)
+
+
+def _world(spec: str, seed: int, movement: str) -> Tuple[GridEnvironment, GridEnvironment, List[Dict]]:
+    # (episode env whose obstacles are rewritten per episode, obstacle-free twin, base obstacle scripts)
+    key = f'{spec}/{seed}/{movement}'
+    if key not in _WORLD:
+        env = load_map(spec, seed, movement)
+        static = GridEnvironment.from_array(env.grid, env.start, env.goal, None, env.movement)
+        scripts = [dict(obs) for obs in env.moving_obstacles.values() if obs['path']]
+        _WORLD[key] = (env, static, scripts)
+    return _WORLD[key]
+
+
+def retime(path: List[Tuple[int, int]], phase: int, speed: float) -> List[Tuple[int, int]]:
+    """An obstacle script started `phase` steps in, moving `speed` cells per step.
+
+    Speeds below 1 hold each cell for round(1 / speed) steps; speeds above 1 skip
+    cells, so a fast vehicle jumps along its route.
+    """
+    path = path[phase % len(path):] + path[:phase % len(path)]
+    if speed >= 1:
+        return path[::int(round(speed))] or path[:1]
+    return [cell for cell in path for _ in range(int(round(1 / speed)))]
+
+
+def run_episode(env: GridEnvironment, static: GridEnvironment, start: Tuple[int, int], goal: Tuple[int, int],
+                planner: str = 'astar', max_fuel: float = 1000, max_steps: int = 200, wait_cost: float = 1,
+                trace: Optional[List] = None) -> Dict:
+    """Drive one delivery through env's moving obstacles, replanning when the next cell is taken.
+
+    Each step the agent moves to the next cell of its plan or waits in place. Moves
+    burn the entered cell's cost in fuel and waits burn wait_cost. When the next
+    cell is occupied at arrival time, or a vehicle would swap places with the
+    agent, it replans from where it stands. It also replans when the plan runs
+    out short of the goal. It waits if the new plan still starts with a blocked
+    move. Waiting fails with a collision if a vehicle drives onto the agent's
+    cell. Pass a list as `trace` to record (time, position, event); without one,
+    the loop does no per-step logging.
+    """
+    saved_goal, env.goal = env.goal, goal
+    static.goal = goal
+    try:
+        optimum = Planner(static).astar(start)[1]['cost']
+        if optimum == float('inf'):
+            return {'outcome': 'unreachable', 'cost': 0.0, 'optimum': optimum, 'steps': 0, 'replans': 0,
+                    'waits': 0, 'plan_time': 0.0}
+        plan = _plan_fn(env, planner, goal)
+        plan_time, t0 = 0.0, time.perf_counter()
+        path = plan(start, 0)
+        plan_time += time.perf_counter() - t0
+        pos, t, i, fuel, replans, waits = start, 0, 0, 0.0, 0, 0
+        outcome = 'delivered'
+        while pos != goal:
+            if t >= max_steps:
+                outcome = 'out_of_steps'
+                break
+            nxt = path[i + 1] if i + 1 < len(path) else pos
+            if i + 1 >= len(path) or nxt != pos and (env.is_occupied(nxt, t + 1) or _swapped(env, pos, nxt, t)):
+                replans += 1
+                t0 = time.perf_counter()
+                path, i = plan(pos, t), 0
+                plan_time += time.perf_counter() - t0
+                nxt = path[1] if len(path) > 1 else pos
+                if trace is not None:
+                    trace.append((t, pos, 'replan'))
+                if nxt != pos and (env.is_occupied(nxt, t + 1) or _swapped(env, pos, nxt, t)):
+                    nxt = pos  # Still blocked: hold position and let the plan catch up
+                    path = [pos] + path
+            step_cost = wait_cost if nxt == pos else env.edge_cost(pos, nxt)
+            if fuel + step_cost > max_fuel:
+                outcome = 'out_of_fuel'
+                break
+            if nxt == pos and env.is_occupied(pos, t + 1):
+                outcome = 'collision'
+                break
+            fuel += step_cost
+            waits += nxt == pos
+            if trace is not None:
+                trace.append((t + 1, nxt, 'wait' if nxt == pos else 'move'))
+            pos, t, i = nxt, t + 1, i + 1
+    finally:
+        env.goal = saved_goal
+    return {'outcome': outcome, 'cost': fuel, 'optimum': optimum, 'steps': t, 'replans': replans,
+            'waits': waits, 'plan_time': plan_time}
+
+
+def _swapped(env: GridEnvironment, pos: Tuple[int, int], nxt: Tuple[int, int], t: int) -> bool:
+    # A vehicle moving nxt -> pos over the same step would pass through the agent
+    return env.is_occupied(nxt, t) and env.is_occupied(pos, t + 1)
+
+
+def _plan_fn(env: GridEnvironment, planner: str, goal: Tuple[int, int]):
+    if planner == 'sipp':
+        sipp = SIPPPlanner(env)
+        return lambda start, departure: sipp.plan(start, departure, goal)[0]
+    if planner == 'jps':
+        jps = JumpPointPlanner(env)
+        return lambda start, departure: jps.plan(start, goal)[0]
+    if planner not in Planner.METHODS or planner == 'sa':
+        raise ValueError(f"Unknown planner {planner!r}; expected one of {', '.join(PLANNERS)}")
+    search = Planner(env)
+    return lambda start, departure: search.plan(planner, start, departure)[0]
+
+
+def sample_episode(env: GridEnvironment, scripts: List[Dict], rng: np.random.Generator,
+                   speeds: Sequence[float]) -> Tuple[Tuple[int, int], Tuple[int, int], Dict[str, Dict]]:
+    """Random start/goal on free cells and re-timed obstacle scripts for one episode."""
+    free = np.argwhere(env.grid != -1)
+    start, goal = (tuple(p) for p in free[rng.choice(len(free), size=2, replace=False)].tolist())
+    moving = {}
+    for k, obs in enumerate(scripts):
+        speed = float(speeds[rng.integers(len(speeds))])
+        path = retime([tuple(p) for p in obs['path']], int(rng.integers(len(obs['path']))), speed)
+        moving[f'vehicle{k + 1}'] = {'pos': path[0], 'path': path, 'speed': speed}
+    return start, goal, moving
+
+
+def run_chunk(job) -> List[Dict]:
+    # Module-level so a process pool can pickle it; one worker runs a contiguous range of episodes
+    spec, map_seed, movement, seeds, options = job
+    env, static, scripts = _world(spec, map_seed, movement)
+    speeds = options.pop('speeds')
+    rows = []
+    for seed in seeds:
+        rng = np.random.default_rng(seed)
+        start, goal, moving = sample_episode(env, scripts, rng, speeds)
+        env.moving_obstacles = moving
+        env.build_occupancy_index()
+        if env.is_occupied(start, 0):
+            env.moving_obstacles = {k: v for k, v in moving.items() if v['path'][0] != start}  # Not spawned on a vehicle
+            env.build_occupancy_index()
+        row = run_episode(env, static, start, goal, **options)
+        row.update(seed=seed, start=list(start), goal=list(goal))
+        rows.append(row)
+    return rows
+
+
+def simulate(spec: str, episodes: int, planner: str = 'astar', workers: int = 1, seed: int = 0,
+             movement: str = '4', speeds: Sequence[float] = (1,), max_fuel: float = 1000, max_steps: int = 200,
+             chunk_size: int = 64) -> List[Dict]:
+    """Run `episodes` seeded episodes; with workers > 1 chunks of them run on a process pool."""
+    options = {'planner': planner, 'max_fuel': max_fuel, 'max_steps': max_steps, 'speeds': list(speeds)}
+    seeds = list(range(seed, seed + episodes))
+    jobs = [(spec, seed, movement, seeds[k:k + chunk_size], dict(options)) for k in range(0, episodes, chunk_size)]
+    if workers <= 1 or len(jobs) <= 1:
+        return [row for job in jobs for row in run_chunk(job)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [row for rows in pool.map(run_chunk, jobs) for row in rows]
+
+
+def aggregate(rows: List[Dict]) -> Dict:
+    """Success rate, outcome counts, replan distribution, cost overhead and planning latency."""
+    done = [r for r in rows if r['outcome'] == 'delivered' and 0 < r['optimum'] < float('inf')]
+    replans = np.array([r['replans'] for r in rows])
+    overhead = np.array([r['cost'] / r['optimum'] - 1 for r in done])
+    latency = np.array([r['plan_time'] for r in rows]) * 1e3
+
+    def pct(values: np.ndarray, q: float) -> float:
+        return float(np.percentile(values, q)) if len(values) else 0.0
+
+    return {
+        'episodes': len(rows),
+        'success_rate': sum(r['outcome'] == 'delivered' for r in rows) / len(rows) if rows else 0.0,
+        'outcomes': {name: sum(r['outcome'] == name for r in rows) for name in OUTCOMES},
+        'replans': {'mean': float(replans.mean()) if len(rows) else 0.0, 'p50': pct(replans, 50),
+                    'p90': pct(replans, 90), 'max': int(replans.max()) if len(rows) else 0,
+                    'histogram': {str(k): v for k, v in sorted(Counter(replans.tolist()).items())}},
+        'cost_overhead': {'mean': float(overhead.mean()) if len(done) else 0.0, 'p50': pct(overhead, 50),
+                          'p90': pct(overhead, 90)},
+        'plan_latency_ms': {'mean': float(latency.mean()) if len(rows) else 0.0, 'p50': pct(latency, 50),
+                            'p99': pct(latency, 99)},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Monte Carlo delivery simulator over randomized obstacle schedules')
+    parser.add_argument('--map', default='traffic-40',
+                        help='Repo map name or file, or a generated map as kind-size (e.g. traffic-64)')
+    parser.add_argument('--planner', choices=PLANNERS, default='astar')
+    parser.add_argument('--episodes', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Processes to spread episodes over (1 runs them inline)')
+    parser.add_argument('--movement', choices=['4', '8'], default='4')
+    parser.add_argument('--speeds', type=float, nargs='+', default=[0.5, 1, 2],
+                        help='Obstacle speeds (cells per step) drawn per vehicle and episode')
+    parser.add_argument('--max-fuel', type=float, default=1000)
+    parser.add_argument('--max-steps', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed for the generated map and the first episode')
+    parser.add_argument('--output', default=None, help='Write per-episode rows and the summary as JSON')
+    args = parser.parse_args()
+
+    try:
+        t0 = time.perf_counter()
+        rows = simulate(args.map, args.episodes, args.planner, args.workers, args.seed, args.movement,
+                        args.speeds, args.max_fuel, args.max_steps)
+        elapsed = time.perf_counter() - t0
+    except (ValueError, FileNotFoundError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    stats = aggregate(rows)
+    print(f"{stats['episodes']} episodes on {args.map} with {args.planner} in {elapsed:.1f}s "
+          f"({stats['episodes'] / elapsed:.0f} episodes/s)")
+    print(f"Success rate: {stats['success_rate'] * 100:.1f}%  "
+          + ', '.join(f"{name}={count}" for name, count in stats['outcomes'].items()))
+    r = stats['replans']
+    print(f"Replans per episode: mean {r['mean']:.2f}, p50 {r['p50']:.0f}, p90 {r['p90']:.0f}, max {r['max']}")
+    c = stats['cost_overhead']
+    print(f"Cost over static optimum: mean {c['mean'] * 100:.1f}%, p50 {c['p50'] * 100:.1f}%, p90 {c['p90'] * 100:.1f}%")
+    p = stats['plan_latency_ms']
+    print(f"Planning time per episode: mean {p['mean']:.2f}ms, p50 {p['p50']:.2f}ms, p99 {p['p99']:.2f}ms")
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump({'summary': stats, 'episodes': rows}, f, indent=1)
+        print(f"Results saved to {args.output}")
+
+if __name__ == '__main__':
+    main()
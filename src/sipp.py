@@ -0,0 +1,135 @@
+import heapq
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from grid import GridEnvironment
+from planners import Planner
+
+Interval = Tuple[int, float]  # First and last safe time step (inclusive); last may be inf
+
+
+class SIPPPlanner:
+    """Safe Interval Path Planning around the scripted obstacles of a .dyn file.
+
+    Each cell's timeline is compressed into maximal intervals in which no moving
+    obstacle occupies it, and the search state is (cell, interval) rather than
+    (cell, time), so waiting costs nothing to represent: a successor is reached at
+    the earliest step its interval allows. Moves take one step and cost the
+    entered cell's terrain; each step spent waiting costs wait_cost. Swapping
+    places with an obstacle is ruled out.
+
+    Because cost and time differ on weighted terrain, a state keeps every
+    label (arrival time t, cost g) not dominated by another with both an earlier
+    t and a smaller g - wait_cost * t. On unit terrain that is one label per state.
+    Paths list one position per time step from the departure, waits included.
+    Timelines are cut at `horizon` steps after departure: a cell an obstacle ever
+    visits is only known safe up to there.
+    """
+
+    def __init__(self, env: GridEnvironment, wait_cost: float = 1, horizon: Optional[int] = None):
+        self.env = env
+        self.wait_cost = wait_cost
+        self.horizon = horizon or 4 * (env.rows + env.cols) + 2 * env.dynamic_period
+        self.cols = env.cols
+        self._blocked: Dict[int, List[Tuple[int, int]]] = {}  # cell -> (period, phase) an obstacle is there
+        self._paths = [[tuple(p) for p in obs['path']] for obs in env.moving_obstacles.values() if obs['path']]
+        for path in self._paths:
+            for phase, (x, y) in enumerate(path):
+                if 0 <= x < env.rows and 0 <= y < env.cols:
+                    self._blocked.setdefault(x * self.cols + y, []).append((len(path), phase))
+        self._intervals: Dict[Tuple[int, int], List[Interval]] = {}
+
+    def safe_intervals(self, cell: int, end: int) -> List[Interval]:
+        """Safe intervals of a flat cell index over [0, end]; open-ended only for cells no obstacle visits."""
+        key = (cell, end)
+        if key not in self._intervals:
+            if cell not in self._blocked:
+                self._intervals[key] = [(0, math.inf)]
+            else:
+                blocked = np.zeros(end + 1, dtype=bool)
+                for period, phase in self._blocked[cell]:
+                    blocked[phase::period] = True
+                edges = np.flatnonzero(np.diff(np.concatenate(([True], blocked, [True])).astype(np.int8)))
+                # Free runs start where blocked turns off and end where it turns back on
+                self._intervals[key] = [(int(a), int(b) - 1) for a, b in zip(edges[::2], edges[1::2])]
+        return self._intervals[key]
+
+    def _swaps(self, u: int, v: int, t: int) -> bool:
+        # An obstacle moving v -> u while we move u -> v between t and t + 1
+        (ux, uy), (vx, vy) = divmod(u, self.cols), divmod(v, self.cols)
+        return any(path[t % len(path)] == (vx, vy) and path[(t + 1) % len(path)] == (ux, uy) for path in self._paths)
+
+    def plan(self, start: Tuple[int, int], departure: int = 0,
+             goal: Optional[Tuple[int, int]] = None) -> Tuple[List[Tuple[int, int]], Dict]:
+        start_time = time.perf_counter()
+        env, cols, w = self.env, self.cols, self.wait_cost
+        goal = tuple(goal or env.goal)
+        saved_goal, env.goal = env.goal, goal
+        try:
+            heuristic = Planner(env).heuristic()
+        finally:
+            env.goal = saved_goal
+        end = departure + self.horizon
+        table = env.neighbor_table
+        s, target = start[0] * cols + start[1], goal[0] * cols + goal[1]
+        fail = {'cost': float('inf'), 'nodes': 0, 'time': 0.0}
+        start_interval = next((k for k, (a, b) in enumerate(self.safe_intervals(s, end)) if a <= departure <= b), None)
+        if env.get_cost(start) == float('inf') or env.get_cost(goal) == float('inf') or start_interval is None:
+            fail['time'] = time.perf_counter() - start_time
+            return [], fail
+        # Labels: (cell, arrival time, cost, parent label); open entries are (f, g, -t, label)
+        labels = [(s, departure, 0, -1)]
+        pq = [(heuristic(start), 0, -departure, 0)]
+        frontier: Dict[Tuple[int, int], List[Tuple[int, float]]] = {(s, start_interval): [(departure, 0)]}
+        closed: Dict[Tuple[int, int], List[Tuple[int, float]]] = {}
+        nodes_expanded = 0
+        found = -1
+        while pq:
+            _, g, _, label = heapq.heappop(pq)
+            u, t = labels[label][0], labels[label][1]
+            intervals_u = self.safe_intervals(u, end)
+            k = next(i for i, (a, b) in enumerate(intervals_u) if a <= t <= b)
+            done = closed.setdefault((u, k), [])
+            if any(t0 <= t and r0 <= g - w * t for t0, r0 in done):
+                continue  # An expanded label already reaches this state earlier and cheaper
+            done.append((t, g - w * t))
+            nodes_expanded += 1
+            if u == target:
+                found = label
+                break
+            last_departure = intervals_u[k][1]
+            lo, hi = table.indptr[u], table.indptr[u + 1]
+            for v, move_cost in zip(table.indices[lo:hi].tolist(), table.costs[lo:hi].tolist()):
+                for k_v, (a, b) in enumerate(self.safe_intervals(v, end)):
+                    arrive = max(t + 1, a)
+                    if arrive > b or arrive - 1 > last_departure:
+                        continue  # Interval closes before we can enter, or we must leave u too late
+                    while arrive <= b and arrive - 1 <= last_departure and self._swaps(u, v, arrive - 1):
+                        arrive += 1
+                    if arrive > b or arrive - 1 > last_departure or arrive > end:
+                        continue
+                    ng = g + w * (arrive - 1 - t) + move_cost
+                    state = (v, k_v)
+                    seen = frontier.setdefault(state, [])
+                    if any(t0 <= arrive and r0 <= ng - w * arrive for t0, r0 in seen):
+                        continue
+                    seen.append((arrive, ng - w * arrive))
+                    labels.append((v, arrive, ng, label))
+                    heapq.heappush(pq, (ng + heuristic(divmod(v, cols)), ng, -arrive, len(labels) - 1))
+        if found == -1:
+            fail.update(nodes=nodes_expanded, time=time.perf_counter() - start_time)
+            return [], fail
+        waypoints = []
+        label = found
+        while label != -1:
+            cell, t, _, label = labels[label]
+            waypoints.append((divmod(cell, cols), t))
+        waypoints.reverse()
+        path = [waypoints[0][0]]
+        for (_, t0), (pos, t1) in zip(waypoints, waypoints[1:]):
+            path.extend([path[-1]] * (t1 - t0 - 1))  # Wait in place, then step
+            path.append(pos)
+        cost = labels[found][2]
+        return path, {'cost': cost, 'nodes': nodes_expanded, 'time': time.perf_counter() - start_time,
+                      'departure': departure, 'arrival': waypoints[-1][1], 'waits': len(path) - len(waypoints)}
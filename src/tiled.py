@@ -0,0 +1,176 @@
+import math
+import os
+import struct
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+import numpy as np
+from grid import GridEnvironment, BINARY_DTYPES, TILED_MAGIC, is_tiled_map, write_binary_dynamic
+
+# Tiled map layout: fixed header, then tile x tile blocks in row-major tile order
+# (edge tiles padded with walls), then the optional dynamics section of the binary format
+TILED_HEADER = struct.Struct('<8s4i3IBxxxQ')  # magic, sx sy gx gy, rows cols tile, dtype code, dyn offset
+TILED_DATA_OFFSET = 64
+TILED_PLANNERS = ('bfs', 'ucs', 'astar', 'ara')  # Searches that only use get_cost/successors
+
+
+def save_tiled_map(env: GridEnvironment, out_file: str, tile: int = 64):
+    """Write env's grid as tile x tile blocks, plus start/goal and moving obstacles.
+
+    Tiles are copied one at a time, so a memory-mapped binary map converts
+    without ever being read into RAM as a whole.
+    """
+    if tile < 1:
+        raise ValueError("Tile size must be at least 1")
+    rows, cols = env.rows, env.cols
+    low, high = int(env.grid.min()), int(env.grid.max())
+    peak = max(abs(low), high)
+    if peak > np.iinfo(np.int16).max:
+        raise ValueError(f"Terrain cost {peak} does not fit the int16 tiled format.")
+    code = 1 if peak <= np.iinfo(np.int8).max else 2
+    dtype = BINARY_DTYPES[code]
+    tile_rows, tile_cols = -(-rows // tile), -(-cols // tile)
+    tile_bytes = tile * tile * np.dtype(dtype).itemsize
+    dyn_offset = TILED_DATA_OFFSET + tile_rows * tile_cols * tile_bytes if env.moving_obstacles else 0
+    block = np.empty((tile, tile), dtype=dtype)
+    with open(out_file, 'wb') as f:
+        f.write(TILED_HEADER.pack(TILED_MAGIC, *env.start, *env.goal, rows, cols, tile, code, dyn_offset)
+                .ljust(TILED_DATA_OFFSET, b'\0'))
+        for tx in range(tile_rows):
+            for ty in range(tile_cols):
+                part = env.grid[tx * tile:(tx + 1) * tile, ty * tile:(ty + 1) * tile]
+                block.fill(-1)
+                block[:part.shape[0], :part.shape[1]] = part
+                f.write(block.tobytes())
+        if dyn_offset:
+            write_binary_dynamic(f, env.moving_obstacles)
+
+
+class TiledGridEnvironment(GridEnvironment):
+    """Out-of-core grid for maps larger than RAM, read from a .tmap file tile by tile.
+
+    Only `cache_tiles` tiles are held in memory at once (least recently used is
+    evicted first); every other cell stays on disk until a search reaches it.
+    get_cost, edge_cost, successors and is_occupied behave as on an in-memory
+    GridEnvironment, so bfs, ucs, astar and ara run unchanged. Whole-grid views
+    (grid, neighbor_table, cost_grid) do not exist, so planners and tools built
+    on them (bidirectional search, sa, JPS, HPA*, distance fields, landmarks,
+    the plan cache) need an in-memory map.
+
+    tile_stats counts tile lookups served from the cache (hits), tiles read from
+    disk (misses), the bytes those reads cost and the tiles evicted; compare
+    them across tile sizes to match the tiles to a search's locality.
+    """
+
+    def __init__(self, map_file: str, dyn_file: str = None, movement='4', cache_tiles: int = 64):
+        if not os.path.exists(map_file):
+            raise FileNotFoundError(f"Map file not found: {map_file}. Ensure maps/ directory has the file.")
+        if cache_tiles < 1:
+            raise ValueError("Tile cache needs room for at least one tile")
+        self.moving_obstacles: Dict[str, Dict] = {}
+        self._file = open(map_file, 'rb')
+        try:
+            header = self._file.read(TILED_HEADER.size)
+            magic, sx, sy, gx, gy, rows, cols, tile, code, dyn_offset = TILED_HEADER.unpack(header)
+            if magic != TILED_MAGIC:
+                raise ValueError("not a tiled map")
+            if code not in BINARY_DTYPES or tile < 1:
+                raise ValueError(f"bad dtype code {code} or tile size {tile}")
+            if dyn_offset:
+                self._file.seek(dyn_offset)
+                self.moving_obstacles = self._read_binary_dynamic(self._file)
+        except (struct.error, ValueError) as e:
+            self._file.close()
+            raise ValueError(f"Error parsing tiled map {map_file}: {e}. Re-create it with convert_map --tile.")
+        self.start, self.goal = (sx, sy), (gx, gy)
+        self.rows, self.cols = rows, cols
+        self.tile = tile
+        self.tile_cols = -(-cols // tile)
+        self._dtype = np.dtype(BINARY_DTYPES[code]).newbyteorder('<')
+        self._tile_bytes = tile * tile * self._dtype.itemsize
+        self.cache_tiles = cache_tiles
+        self._tiles: 'OrderedDict[int, List[int]]' = OrderedDict()
+        self._last_key, self._last_tile = -1, None
+        self.tile_stats = {'hits': 0, 'misses': 0, 'bytes_read': 0, 'evictions': 0}
+        if dyn_file:
+            self.moving_obstacles = self._load_dynamic(dyn_file)
+        self.horizon = 10
+        self.set_movement(movement)
+        self.build_occupancy_index()
+
+    def close(self):
+        self._file.close()
+
+    def _load_tile(self, key: int) -> List[int]:
+        tiles = self._tiles
+        if key in tiles:
+            self.tile_stats['hits'] += 1
+            tiles.move_to_end(key)
+            return tiles[key]
+        self._file.seek(TILED_DATA_OFFSET + key * self._tile_bytes)
+        data = self._file.read(self._tile_bytes)
+        if len(data) != self._tile_bytes:
+            raise ValueError(f"Tiled map is truncated at tile {key}")
+        self.tile_stats['misses'] += 1
+        self.tile_stats['bytes_read'] += len(data)
+        values = np.frombuffer(data, dtype=self._dtype).tolist()  # Flat Python ints: cheapest per-cell reads
+        tiles[key] = values
+        if len(tiles) > self.cache_tiles:
+            evicted, _ = tiles.popitem(last=False)
+            self.tile_stats['evictions'] += 1
+            if evicted == self._last_key:
+                self._last_key = -1
+        return values
+
+    def _terrain(self, x: int, y: int) -> int:
+        # Raw cell value (-1 for walls) of an in-bounds cell; repeat reads of one tile skip the LRU
+        t = self.tile
+        tx, ox = divmod(x, t)
+        ty, oy = divmod(y, t)
+        key = tx * self.tile_cols + ty
+        if key == self._last_key:
+            self.tile_stats['hits'] += 1
+            return self._last_tile[ox * t + oy]
+        values = self._load_tile(key)
+        self._last_key, self._last_tile = key, values
+        return values[ox * t + oy]
+
+    def get_cost(self, pos: Tuple[int, int]) -> int:
+        x, y = pos
+        if 0 <= x < self.rows and 0 <= y < self.cols:
+            value = self._terrain(x, y)
+            if value != -1:
+                return value
+        return float('inf')
+
+    @property
+    def neighbor_table(self):
+        raise ValueError("Tiled maps have no global neighbor table; use successors() or an in-memory map.")
+
+    @property
+    def grid(self):
+        raise ValueError("Tiled maps are never loaded whole; use get_cost() or an in-memory map.")
+
+    def cost_grid(self) -> np.ndarray:
+        raise ValueError("Tiled maps are never loaded whole; use get_cost() or an in-memory map.")
+
+    def occupied_mask(self, positions: np.ndarray, time: int) -> np.ndarray:
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+        return np.array([self.is_occupied((x, y), time) for x, y in positions.tolist()], dtype=bool)
+
+    def successors(self, pos: Tuple[int, int], time: int) -> List[Tuple[Tuple[int, int], int]]:
+        # Same edges and stencil order as NeighborTable, computed per expansion from the cached tiles
+        x, y = pos
+        if not (0 <= x < self.rows and 0 <= y < self.cols):
+            return []
+        get_cost = self.get_cost
+        succ = []
+        for dx, dy in self.stencil:
+            nxt = (x + dx, y + dy)
+            cost = get_cost(nxt)
+            if cost == float('inf'):
+                continue
+            if abs(dx) == 1 and abs(dy) == 1:
+                if get_cost((x + dx, y)) == float('inf') or get_cost((x, y + dy)) == float('inf'):
+                    continue  # No corner cutting
+            succ.append((nxt, cost if abs(dx) + abs(dy) == 1 else cost * math.hypot(dx, dy)))
+        return self._unoccupied(succ, time)
@@ -0,0 +1,156 @@
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from grid import GridEnvironment
+from distance import DistanceFields, UNREACHABLE
+
+
+def load_stops(file: str, env: Optional[GridEnvironment] = None) -> List[Tuple[int, int]]:
+    """Drop points from a text file: one 'row col' pair per line, '#' starts a comment."""
+    stops = []
+    with open(file) as f:
+        for line_num, line in enumerate(f, 1):
+            parts = line.split('#', 1)[0].split()
+            if not parts:
+                continue
+            if len(parts) != 2:
+                raise ValueError(f"Line {line_num} of {file}: expected 'row col', got {line.strip()!r}")
+            stop = (int(parts[0]), int(parts[1]))
+            if env is not None and env.get_cost(stop) == float('inf'):
+                raise ValueError(f"Line {line_num} of {file}: stop {stop} is outside the map or a wall")
+            stops.append(stop)
+    return stops
+
+
+class TourPlanner:
+    """Orders a vehicle's drop points and stitches one cell-level route through them.
+
+    The pairwise cost matrix takes one one-to-all sweep per point (DistanceFields)
+    rather than a search per pair. The visiting order starts from nearest
+    neighbour and is improved by 2-opt (reverse a stretch) and Or-opt (move a run
+    of 1-3 stops elsewhere) until neither helps or the time budget runs out.
+    Costs are asymmetric (moves pay the entered cell's terrain), so both moves
+    are priced in the direction actually driven. Like the distance fields, tours
+    see static terrain only.
+    """
+
+    def __init__(self, env: GridEnvironment, fields: Optional[DistanceFields] = None):
+        self.env = env
+        self.fields = fields or DistanceFields(env, max_fields=256)  # Stitching reuses the matrix sweeps
+
+    def plan(self, stops: List[Tuple[int, int]], start: Optional[Tuple[int, int]] = None,
+             end: Optional[Tuple[int, int]] = None, return_to_start: bool = False,
+             time_budget: Optional[float] = None) -> Tuple[List[Tuple[int, int]], Dict]:
+        """Route from start (default env.start) through every reachable stop.
+
+        The route ends at the last stop, at `end`, or back at start with
+        return_to_start. Stops that start cannot reach are skipped and listed in
+        metrics['unreachable']. metrics['order'] gives the input indices of the
+        visited stops in visiting order.
+        """
+        start_time = time.perf_counter()
+        deadline = start_time + time_budget if time_budget is not None else float('inf')
+        depot = tuple(start or self.env.start)
+        tail = depot if return_to_start else (tuple(end) if end is not None else None)
+        points = [depot] + [tuple(s) for s in stops] + ([tail] if tail is not None else [])
+        self.fields.max_fields = max(self.fields.max_fields, len(points))
+        matrix = self.fields.matrix(points, points).astype(np.float64)
+        matrix[matrix == UNREACHABLE] = np.inf
+        if tail is not None and not np.isfinite(matrix[0, -1]):
+            raise ValueError(f"Route end {tail} is unreachable from {depot}")
+        last = len(points) - 1 if tail is not None else None
+        visit = [k for k in range(1, len(stops) + 1) if np.isfinite(matrix[0, k]) and np.isfinite(matrix[k, 0])]
+        unreachable = [k - 1 for k in range(1, len(stops) + 1) if k not in visit]
+        cost = matrix.tolist()
+
+        tour = self._nearest_neighbour(cost, visit)
+        if last is not None:
+            tour.append(last)
+        initial = self._tour_cost(cost, tour)
+        passes = 0
+        improved = True
+        while improved and time.perf_counter() < deadline:
+            passes += 1
+            improved = self._two_opt(cost, tour, last is not None, deadline)
+            improved = self._or_opt(cost, tour, last is not None, deadline) or improved
+        route = self._stitch(points, tour)
+        total = self._tour_cost(cost, tour)
+        return route, {'cost': total, 'initial_cost': initial, 'sweeps': len(points), 'passes': passes,
+                       'order': [k - 1 for k in tour[1:] if k != last], 'unreachable': unreachable,
+                       'time': time.perf_counter() - start_time}
+
+    @staticmethod
+    def _nearest_neighbour(cost: List[List[float]], visit: List[int]) -> List[int]:
+        tour, left = [0], set(visit)
+        while left:
+            here = cost[tour[-1]]
+            nxt = min(left, key=lambda k: (here[k], k))
+            tour.append(nxt)
+            left.remove(nxt)
+        return tour
+
+    @staticmethod
+    def _tour_cost(cost: List[List[float]], tour: List[int]) -> float:
+        return sum(cost[a][b] for a, b in zip(tour, tour[1:]))
+
+    def _two_opt(self, cost: List[List[float]], tour: List[int], fixed_end: bool, deadline: float) -> bool:
+        # Reverse tour[i..j]; the stretch is then driven backwards, so price it with reverse prefix sums
+        n = len(tour)
+        hi = n - 1 if fixed_end else n
+        improved = False
+        i = 1
+        while i < hi - 1:
+            fwd, rev = [0.0] * n, [0.0] * n
+            for a in range(1, n):
+                fwd[a] = fwd[a - 1] + cost[tour[a - 1]][tour[a]]
+                rev[a] = rev[a - 1] + cost[tour[a]][tour[a - 1]]
+            moved = False
+            p = tour[i - 1]
+            for j in range(i + 1, hi):
+                after = cost[tour[j]][tour[j + 1]] if j + 1 < n else 0.0
+                after_new = cost[tour[i]][tour[j + 1]] if j + 1 < n else 0.0
+                old = cost[p][tour[i]] + (fwd[j] - fwd[i]) + after
+                new = cost[p][tour[j]] + (rev[j] - rev[i]) + after_new
+                if new < old - 1e-9:
+                    tour[i:j + 1] = tour[i:j + 1][::-1]
+                    improved = moved = True
+                    break
+            if time.perf_counter() > deadline:
+                break
+            if not moved:
+                i += 1
+        return improved
+
+    def _or_opt(self, cost: List[List[float]], tour: List[int], fixed_end: bool, deadline: float) -> bool:
+        # Move the run tour[i:i+length] (same direction) between two other consecutive stops
+        improved = False
+        for length in (1, 2, 3):
+            i = 1
+            while i + length <= len(tour) - (1 if fixed_end else 0):
+                n = len(tour)
+                seg = tour[i:i + length]
+                prev, nxt = tour[i - 1], tour[i + length] if i + length < n else None
+                removed = cost[prev][seg[0]] + (cost[seg[-1]][nxt] - cost[prev][nxt] if nxt is not None else 0.0)
+                rest = tour[:i] + tour[i + length:]
+                best, best_k = 0.0, -1
+                for k in range(len(rest) - (1 if fixed_end else 0)):
+                    a, b = rest[k], rest[k + 1] if k + 1 < len(rest) else None
+                    if k == i - 1:
+                        continue  # Where it came from
+                    added = cost[a][seg[0]] + (cost[seg[-1]][b] - cost[a][b] if b is not None else 0.0)
+                    if added - removed < best - 1e-9:
+                        best, best_k = added - removed, k
+                if best_k >= 0:
+                    tour[:] = rest[:best_k + 1] + seg + rest[best_k + 1:]
+                    improved = True
+                else:
+                    i += 1
+                if time.perf_counter() > deadline:
+                    return improved
+        return improved
+
+    def _stitch(self, points: List[Tuple[int, int]], tour: List[int]) -> List[Tuple[int, int]]:
+        route = [points[tour[0]]]
+        for a, b in zip(tour, tour[1:]):
+            route.extend(self.fields.path(points[a], points[b])[1:])
+        return route
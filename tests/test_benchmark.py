@@ -0,0 +1,24 @@
+import pytest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import mapgen
+from planners import Planner
+from benchmark import run_suite, summarize, compare
+
+@pytest.mark.parametrize('kind', mapgen.MAP_KINDS)
+def test_generated_maps_are_seeded_and_solvable(kind):
+    env = mapgen.generate(kind, 50, seed=3)
+    again = mapgen.generate(kind, 50, seed=3)
+    assert (env.grid == again.grid).all()
+    assert env.moving_obstacles == again.moving_obstacles
+    assert Planner(env).ucs(env.start)[0]  # Seed 3 maps are connected start->goal
+
+def test_suite_and_regression_check():
+    maps = [('maze-21', mapgen.generate('maze', 21, seed=0))]
+    results = run_suite(maps, ['astar', 'ucs'], n_queries=2, seed=0, measure_memory=False, log=lambda _: None)
+    assert len(results) == 4 and all(r['found'] for r in results)
+    summary = summarize(results)
+    assert compare(summary, summary, tolerance=0.0) == []
+    worse = {key: dict(stats, mean_cost=stats['mean_cost'] - 1) for key, stats in summary.items()}
+    assert len(compare(summary, worse, tolerance=0.0)) == 2
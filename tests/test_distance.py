@@ -0,0 +1,40 @@
+import pytest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from grid import GridEnvironment
+from planners import Planner
+from distance import DistanceFields, UNREACHABLE
+
+@pytest.fixture
+def env():
+    return GridEnvironment('maps/small.map')
+
+def test_field_matches_ucs(env):
+    fields = DistanceFields(env)
+    dist, pred = fields.field(env.start)
+    assert dist.dtype == pred.dtype == 'int32'
+    assert dist[env.goal] == Planner(env).ucs(env.start)[1]['cost']
+    assert dist[1, 1] == UNREACHABLE  # Wall
+
+def test_path_extraction_and_cache(env):
+    fields = DistanceFields(env)
+    path = fields.path(env.start, env.goal)
+    assert path[0] == env.start and path[-1] == env.goal
+    assert sum(env.get_cost(p) for p in path[1:]) == fields.cost(env.start, env.goal)
+    assert fields.field(env.start) is fields.field(env.start)
+
+def test_reverse_field_and_matrix(env):
+    fields = DistanceFields(env)
+    points = [env.start, env.goal, (2, 2)]
+    matrix = fields.matrix(points, points)
+    to_goal = fields.field(env.goal, reverse=True)[0]
+    for i, p in enumerate(points):
+        assert matrix[i, 1] == to_goal[p]
+    assert (fields.matrix(points, points, workers=2) == matrix).all()
+
+def test_construction_keeps_the_env_table():
+    env = GridEnvironment('maps/medium.map')
+    table, version = env.neighbor_table, env.version
+    DistanceFields(env)
+    assert env.neighbor_table is table and env.version == version
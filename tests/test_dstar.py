@@ -0,0 +1,43 @@
+import pytest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from grid import GridEnvironment
+from planners import Planner
+from dstar import DStarLite
+
+@pytest.fixture
+def env():
+    return GridEnvironment('maps/medium.map')
+
+def test_initial_plan_is_optimal(env):
+    path, metrics = DStarLite(env).plan(env.start)
+    assert path[0] == env.start and path[-1] == env.goal
+    assert metrics['cost'] == Planner(env).ucs(env.start)[1]['cost']
+
+def test_repair_matches_fresh_search(env):
+    dstar = DStarLite(env)
+    path, first = dstar.plan(env.start)
+    blocked = [path[len(path) // 2], path[len(path) // 2 + 1]]
+    dstar.set_blocked(blocked)
+    repaired, metrics = dstar.plan(path[1])
+    fresh = DStarLite(env)
+    fresh.update_cells(blocked=blocked)
+    expected = fresh.plan(path[1])[1]
+    assert repaired[0] == path[1] and repaired[-1] == env.goal
+    assert not set(blocked) & set(repaired)
+    assert metrics['cost'] == expected['cost']
+    assert metrics['nodes'] < first['nodes']
+
+def test_unblock_restores_cost(env):
+    dstar = DStarLite(env)
+    _, first = dstar.plan(env.start)
+    dstar.set_blocked([(0, 1), (1, 0)])
+    assert dstar.plan(env.start)[0] == []
+    dstar.set_blocked([])
+    assert dstar.plan(env.start)[1]['cost'] == first['cost']
+
+def test_rejects_8_connected_movement(env):
+    env.set_movement('8')
+    with pytest.raises(ValueError):
+        DStarLite(env)
@@ -0,0 +1,48 @@
+import pytest
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from grid import GridEnvironment
+from planners import Planner
+from fleet import FleetPlanner, find_conflicts, random_queries
+
+@pytest.fixture
+def env():
+    return GridEnvironment('maps/large.map')
+
+def test_fleet_is_conflict_free(env):
+    queries = random_queries(env, 40, seed=3)
+    paths, stats = FleetPlanner(env).plan(queries)
+    assert stats['planned'] == 40 and stats['conflicts'] == 0
+    assert find_conflicts(paths) == []
+    for (start, goal), path in zip(queries, paths):
+        assert path[0] == start and path[-1] == goal
+        for a, b in zip(path, path[1:]):
+            assert a == b or abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+
+def test_single_agent_matches_astar(env):
+    paths, _ = FleetPlanner(env).plan([(env.start, env.goal)])
+    _, metrics = Planner(env).astar(env.start)
+    assert sum(env.get_cost(p) for p in paths[0][1:]) == metrics['cost']
+
+def test_corridor_swap_forces_detour():
+    # Two agents trade ends of a corridor with a single side pocket to pass in
+    grid = np.array([[1, 1, 1, 1, 1], [-1, -1, -1, 1, -1]])
+    env = GridEnvironment.from_array(grid, (0, 0), (0, 4))
+    paths, stats = FleetPlanner(env).plan([((0, 0), (0, 4)), ((0, 4), (0, 0))])
+    assert stats['planned'] == 2 and find_conflicts(paths) == []
+    assert (1, 3) in paths[1]
+
+def test_scripted_obstacles_are_avoided():
+    env = GridEnvironment('maps/dynamic.map', 'maps/dynamic.dyn')
+    queries = random_queries(env, 5, seed=1)
+    paths, stats = FleetPlanner(env).plan(queries)
+    for path in paths:
+        assert not any(env.is_occupied(pos, t) for t, pos in enumerate(path) if t)
+
+def test_stranded_agent_keeps_its_cell():
+    # Agent 0 cannot reach its goal past the wall, so agent 1 must not drive through it
+    env = GridEnvironment.from_array(np.array([[1, 1, 1, -1, 1]]), (0, 1), (0, 4))
+    paths, stats = FleetPlanner(env).plan([((0, 1), (0, 4)), ((0, 0), (0, 2))])
+    assert stats['failed'] == 2 and paths == [[], []]
@@ -37,3 +37,60 @@ def test_dynamic_occupied():
     else:
         # Fallback: No dynamics, so False for dynamic positions
         assert dyn_env.is_occupied((5, 6), 1) == False
+
+def test_occupancy_table_matches_paths():
+    dyn_env = GridEnvironment('maps/dynamic.map', 'maps/dynamic.dyn')
+    path = dyn_env.moving_obstacles['vehicle1']['path']
+    assert dyn_env.occupancy is not None
+    for t in range(2 * len(path)):
+        assert dyn_env.is_occupied(path[t % len(path)], t)
+    mask = dyn_env.occupied_mask([(5, 6), (5, 7), (0, 0), (-1, 0)], 0)
+    assert mask.tolist() == [True, False, False, True]
+
+def test_occupancy_fallback_without_table(monkeypatch):
+    import grid
+    monkeypatch.setattr(grid, 'OCCUPANCY_TABLE_LIMIT', 0)
+    dyn_env = GridEnvironment('maps/dynamic.map', 'maps/dynamic.dyn')
+    assert dyn_env.occupancy is None
+    assert dyn_env.is_occupied((5, 6), 4) == True
+    assert dyn_env.is_occupied((5, 6), 1) == False
+    assert dyn_env.occupied_mask([(5, 7), (5, 6)], 1).tolist() == [True, False]
+
+def test_binary_map_round_trip(tmp_path):
+    from grid import save_binary_map, is_binary_map
+    text_env = GridEnvironment('maps/dynamic.map', 'maps/dynamic.dyn')
+    out = str(tmp_path / 'dynamic.gmap')
+    save_binary_map(text_env, out)
+    assert is_binary_map(out) and not is_binary_map('maps/dynamic.map')
+    bin_env = GridEnvironment(out)
+    assert bin_env.grid.dtype == 'int8'
+    assert (bin_env.grid == text_env.grid).all()
+    assert (bin_env.start, bin_env.goal) == (text_env.start, text_env.goal)
+    assert bin_env.moving_obstacles == text_env.moving_obstacles
+    assert bin_env.is_occupied((5, 6), 4) == True
+    assert bin_env.obstacles == text_env.obstacles
+
+def test_resolve_map_prefers_binary(tmp_path):
+    from grid import save_binary_map, resolve_map
+    assert resolve_map('dynamic') == (os.path.join('maps', 'dynamic.map'), os.path.join('maps', 'dynamic.dyn'))
+    save_binary_map(GridEnvironment('maps/dynamic.map', 'maps/dynamic.dyn'), str(tmp_path / 'dynamic.gmap'))
+    assert resolve_map('dynamic', str(tmp_path)) == (str(tmp_path / 'dynamic.gmap'), None)  # Dynamics are inside
+    with pytest.raises(FileNotFoundError):
+        resolve_map('missing')
+
+def test_neighbor_table_matches_four_connected(small_env):
+    table = small_env.neighbor_table
+    idx = 0 * small_env.cols + 1  # (0, 1): (1, 1) below is a wall
+    assert sorted(table.indices[table.indptr[idx]:table.indptr[idx + 1]].tolist()) == [0, 2]
+    assert small_env.successors((0, 1), 0) == [((0, 0), 1), ((0, 2), 1)]
+
+def test_eight_connected_no_corner_cutting():
+    env = GridEnvironment('maps/small.map', movement='8')
+    succ = dict(env.successors((0, 0), 0))
+    assert (1, 1) not in succ  # Wall
+    succ = dict(env.successors((2, 2), 0))
+    assert (1, 1) not in succ and (3, 3) in succ
+    assert abs(succ[(3, 3)] - 2 ** 0.5) < 1e-9
+    assert (1, 3) in succ  # (1, 2) and (2, 3) are both free
+    succ = dict(env.successors((0, 1), 0))
+    assert (1, 0) not in succ and (1, 2) not in succ  # Would cut the wall at (1, 1)
@@ -0,0 +1,44 @@
+import pytest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from grid import GridEnvironment
+from planners import Planner
+from hpa import HPAPlanner
+
+@pytest.fixture
+def env():
+    return GridEnvironment('maps/large.map')
+
+def test_hpa_path_is_valid(env):
+    path, metrics = HPAPlanner(env, cluster_size=4).plan(env.start)
+    assert path[0] == env.start and path[-1] == env.goal
+    for a, b in zip(path, path[1:]):
+        assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+    assert metrics['cost'] == sum(env.get_cost(p) for p in path[1:])
+    assert metrics['cost'] >= Planner(env).astar(env.start)[1]['cost']
+
+def test_save_and_load_abstraction(env, tmp_path):
+    hpa = HPAPlanner(env, cluster_size=5)
+    file = str(tmp_path / 'large_hpa.npz')
+    hpa.save(file)
+    loaded = HPAPlanner.load(env, file)
+    assert loaded.transitions == hpa.transitions
+    assert loaded.intra == hpa.intra
+    assert loaded.plan(env.start)[1]['cost'] == hpa.plan(env.start)[1]['cost']
+
+def test_local_update_matches_rebuild(env):
+    hpa = HPAPlanner(env, cluster_size=5)
+    path, _ = hpa.plan(env.start)
+    cell = path[len(path) // 2]
+    env.grid[cell] = -1
+    rebuilt = hpa.update_cells([cell])
+    assert len(rebuilt) < hpa.cluster_rows * hpa.cluster_cols
+    fresh = HPAPlanner(env, cluster_size=5)
+    assert hpa.intra == fresh.intra
+    assert cell not in hpa.plan(env.start)[0]
+
+def test_rejects_8_connected_movement(env):
+    env.set_movement('8')
+    with pytest.raises(ValueError):
+        HPAPlanner(env)
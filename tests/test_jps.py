@@ -0,0 +1,34 @@
+import pytest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from grid import GridEnvironment
+from planners import Planner
+from jps import JumpPointPlanner
+import mapgen
+
+@pytest.mark.parametrize('kind', ['random', 'weighted', 'maze'])
+@pytest.mark.parametrize('movement', ['4', '8'])
+def test_costs_match_astar(kind, movement):
+    env = mapgen.generate(kind, 40, seed=5)
+    env.set_movement(movement)
+    jps, planner = JumpPointPlanner(env), Planner(env)
+    for start, goal in mapgen.queries(env, 8, seed=5):
+        env.goal = goal
+        expected = planner.astar(start)[1]['cost']
+        path, metrics = jps.plan(start, goal)
+        assert metrics['cost'] == pytest.approx(expected)
+        if path:
+            assert path[0] == start and path[-1] == goal
+            assert sum(env.edge_cost(a, b) for a, b in zip(path, path[1:])) == pytest.approx(expected)
+
+def test_fewer_nodes_on_open_map():
+    env = GridEnvironment('maps/large.map')
+    _, jps = JumpPointPlanner(env).plan(env.start)
+    _, astar = Planner(env).astar(env.start)
+    assert jps['cost'] == astar['cost'] and jps['nodes'] < astar['nodes']
+
+def test_moving_obstacles_fall_back_to_astar():
+    env = GridEnvironment('maps/dynamic.map', 'maps/dynamic.dyn')
+    path, metrics = JumpPointPlanner(env).plan(env.start)
+    assert metrics['fallback'] == 'astar' and path == Planner(env).astar(env.start)[0]
@@ -0,0 +1,51 @@
+import pytest
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from grid import GridEnvironment
+from planners import Planner
+from landmarks import LandmarkTable
+from distance import DistanceFields
+import mapgen
+
+@pytest.mark.parametrize('kind', ['maze', 'weighted', 'traffic'])
+@pytest.mark.parametrize('movement', ['4', '8'])
+def test_costs_match_with_fewer_nodes(kind, movement):
+    env = mapgen.generate(kind, 40, seed=4)
+    env.set_movement(movement)
+    plain, alt = Planner(env), Planner(env, landmarks=LandmarkTable.build(env, 6))
+    nodes, alt_nodes = 0, 0
+    for start, goal in mapgen.queries(env, 6, seed=4):
+        env.goal = goal
+        _, expected = plain.astar(start)
+        _, metrics = alt.astar(start)
+        assert metrics['cost'] == pytest.approx(expected['cost'])
+        assert alt.biastar(start)[1]['cost'] == pytest.approx(expected['cost'])
+        assert alt.ara(start)[1]['cost'] == pytest.approx(expected['cost'])
+        nodes, alt_nodes = nodes + expected['nodes'], alt_nodes + metrics['nodes']
+    assert alt_nodes <= nodes
+
+def test_bounds_are_admissible_and_exact_at_landmarks():
+    env = mapgen.generate('weighted', 30, seed=1)
+    table = LandmarkTable.build(env, 4)
+    assert table.tables.dtype == np.uint16 and table.exact
+    fields = DistanceFields(env)
+    goal = divmod(table.landmarks[0], env.cols)
+    to_goal = fields.field(goal, reverse=True)[0].ravel()
+    bounds = np.array(table.bounds(goal))
+    reachable = to_goal >= 0
+    assert np.all(bounds[reachable] <= to_goal[reachable])
+    assert np.array_equal(bounds[reachable], to_goal[reachable])  # d(v, L) - d(L, L) is exact
+    assert np.all(np.isinf(bounds[~reachable & np.isfinite(env.cost_grid().ravel())]))
+
+def test_save_and_load_memory_mapped(tmp_path):
+    env = GridEnvironment('maps/large.map')
+    table = LandmarkTable.build(env, 3)
+    file = str(tmp_path / 'large_alt.npy')
+    table.save(file)
+    loaded = LandmarkTable.load(env, file)
+    assert isinstance(loaded.tables, np.memmap) and loaded.landmarks == table.landmarks
+    assert np.array_equal(np.asarray(loaded.tables), table.tables)
+    with pytest.raises(ValueError):
+        LandmarkTable.load(GridEnvironment('maps/medium.map'), file)
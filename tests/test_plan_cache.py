@@ -0,0 +1,70 @@
+import pytest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from grid import GridEnvironment
+from planners import Planner
+import plan_cache
+from plan_cache import PlanCache
+
+@pytest.fixture
+def env():
+    return GridEnvironment('maps/medium.map')
+
+def test_hit_after_miss(env):
+    planner = Planner(env, cache=PlanCache())
+    path, first = planner.plan('astar', env.start)
+    again, second = planner.plan('astar', env.start)
+    assert not first['cached'] and second['cached']
+    assert again == path and second['cost'] == first['cost']
+    assert second['cache']['hits'] == 1 and second['cache']['misses'] == 1
+
+def test_lru_eviction(env):
+    cache = PlanCache(max_entries=2)
+    planner = Planner(env, cache=cache)
+    for start in [(0, 0), (0, 1), (1, 0)]:
+        planner.plan('ucs', start)
+    assert cache.stats['evictions'] == 1
+    assert planner.plan('ucs', (0, 0))[1]['cached'] == False
+
+def test_map_change_invalidates(env):
+    cache = PlanCache()
+    planner = Planner(env, cache=cache)
+    path, _ = planner.plan('astar', env.start)
+    env.grid[path[3]] = -1
+    env.invalidate_neighbor_table()
+    new_path, metrics = planner.plan('astar', env.start)
+    assert not metrics['cached'] and path[3] not in new_path
+    assert cache.stats['invalidations'] == 1
+
+def test_disk_store_survives_restart(env, tmp_path):
+    db = str(tmp_path / 'plans.db')
+    first = PlanCache(db_file=db)
+    path, _ = Planner(env, cache=first).plan('bfs', env.start)
+    first.close()
+    again, metrics = Planner(GridEnvironment('maps/medium.map'), cache=PlanCache(db_file=db)).plan('bfs', env.start)
+    assert metrics['cached'] and metrics['cache']['disk_hits'] == 1
+    assert again == path
+
+def test_fingerprint_hashed_once_per_version(env, monkeypatch):
+    calls = []
+    real = plan_cache.env_fingerprint
+    monkeypatch.setattr(plan_cache, 'env_fingerprint', lambda e: calls.append(1) or real(e))
+    planner = Planner(env, cache=PlanCache())
+    for start in [(0, 0), (0, 1), (1, 0)]:
+        planner.plan('astar', start)
+    assert len(calls) == 1
+    env.invalidate_neighbor_table()
+    planner.plan('astar', (0, 0))
+    assert len(calls) == 2
+
+def test_departure_reaches_the_search():
+    # A vehicle holds the corridor cell (0, 1) on even steps only
+    env = GridEnvironment.from_array([[1, 1, 1], [1, 1, 1]], (0, 0), (0, 2), {'v': {'pos': (0, 1), 'path': [(0, 1), (9, 9)], 'speed': 1}})
+    planner = Planner(env, cache=PlanCache())
+    paths = [planner.plan('astar', env.start, departure)[0] for departure in (0, 1)]
+    assert paths == [Planner(env).astar(env.start, departure)[0] for departure in (0, 1)]
+    assert paths[0] != paths[1]
+    for departure, path in enumerate(paths):
+        assert path[-1] == env.goal
+        assert not any(env.is_occupied(pos, departure + i) for i, pos in enumerate(path))
@@ -27,4 +27,102 @@ def test_astar(planner, env):
 
 def test_sa(planner, env):
     path, metrics = planner.simulated_annealing(env.start)
-    assert len(path) > 0 or metrics['cost'] < float('inf')
\ No newline at end of file
+    assert len(path) > 0 or metrics['cost'] < float('inf')
+
+def test_ucs(planner, env):
+    path, metrics = planner.ucs(env.start)
+    assert path[0] == env.start and path[-1] == env.goal
+    assert metrics['cost'] == sum(env.get_cost(p) for p in path[1:])
+
+def test_parent_pointer_path_is_connected(planner, env):
+    path, _ = planner.astar(env.start)
+    for a, b in zip(path, path[1:]):
+        assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+
+def test_eight_connected_astar_matches_ucs():
+    env = GridEnvironment('maps/medium.map', movement='8')
+    planner = Planner(env)
+    assert planner.heuristic() == planner.octile_heuristic
+    path, metrics = planner.astar(env.start)
+    assert abs(metrics['cost'] - planner.ucs(env.start)[1]['cost']) < 1e-9
+    assert metrics['cost'] < Planner(GridEnvironment('maps/medium.map')).astar(env.start)[1]['cost']
+
+def test_sa_edits_keep_path_valid():
+    import mapgen
+    env = mapgen.generate('weighted', 30, seed=1)
+    planner = Planner(env)
+    initial = planner._path_cost(planner._greedy_path(env.start))
+    path, metrics = planner.simulated_annealing(env.start, max_steps=5000, chains=2, schedule='linear')
+    assert path[0] == env.start and path[-1] == env.goal
+    assert all(env.edge_cost(a, b) < float('inf') for a, b in zip(path, path[1:]))
+    assert metrics['cost'] == planner._path_cost(path) <= initial
+    assert metrics['chains'] == 2
+    again, _ = planner.simulated_annealing(env.start, max_steps=5000, chains=2, schedule='linear')
+    assert again == path  # Seeded chains are reproducible
+
+def test_ara_converges_to_optimal_with_bounds():
+    import mapgen
+    env = mapgen.generate('weighted', 60, seed=2)
+    planner = Planner(env)
+    optimal = planner.astar(env.start)[1]['cost']
+    path, metrics = planner.ara(env.start, weight=3.0)
+    assert metrics['cost'] == optimal == planner._path_cost(path)
+    assert metrics['bound'] == 1.0
+    for _, cost, bound in metrics['solutions']:
+        assert cost <= bound * optimal + 1e-9
+
+def test_ara_respects_time_budget():
+    import mapgen
+    env = mapgen.generate('weighted', 200, seed=2)
+    planner = Planner(env)
+    path, metrics = planner.ara(env.start, weight=5.0, time_budget=0.05)
+    assert path and 1 <= len(metrics['solutions']) <= 9  # Weights 5, 4.5, ..., 1
+    assert 1.0 <= metrics['weight'] <= 5.0
+    bounds = [bound for _, _, bound in metrics['solutions']]
+    assert bounds == sorted(bounds, reverse=True) and metrics['bound'] == bounds[-1]
+    assert metrics['cost'] <= metrics['bound'] * planner.astar(env.start)[1]['cost'] + 1e-9
+    # Only the first round may overrun the budget; the slack keeps slow machines from failing
+    assert metrics['time'] - metrics['solutions'][0][0] < 0.05 + 1.0
+
+def test_ara_finishes_first_round_past_deadline():
+    import mapgen
+    env = mapgen.generate('weighted', 60, seed=2)
+    planner = Planner(env)
+    path, metrics = planner.ara(env.start, weight=3.0, time_budget=0)
+    assert path and metrics['solutions'] and metrics['weight'] == 3.0
+    assert metrics['cost'] <= metrics['bound'] * planner.astar(env.start)[1]['cost'] + 1e-9
+    env.goal = next(cell for cell in env.obstacles)  # Unreachable
+    path, metrics = planner.ara(env.start, time_budget=0)
+    assert path == [] and metrics['bound'] == float('inf')
+
+def test_bidirectional_matches_unidirectional():
+    import mapgen
+    for movement in ('4', '8'):
+        env = mapgen.generate('weighted', 50, seed=4)
+        env.set_movement(movement)
+        planner = Planner(env)
+        for start, goal in mapgen.queries(env, 6, seed=4):
+            env.goal = goal
+            expected = planner.ucs(start)[1]['cost']
+            for method in (planner.bidijkstra, planner.biastar):
+                path, metrics = method(start)
+                assert metrics['cost'] == pytest.approx(expected)
+                if path:
+                    assert path[0] == start and path[-1] == goal
+                    assert planner._path_cost(path) == pytest.approx(expected)
+
+def test_bidirectional_start_is_goal():
+    from landmarks import LandmarkTable
+    env = GridEnvironment('maps/small.map')
+    env.goal = env.start
+    for planner in (Planner(env), Planner(env, landmarks=LandmarkTable.build(env, 2))):
+        for method in (planner.bidijkstra, planner.biastar):
+            path, metrics = method(env.start)
+            assert path == [env.start] and metrics['cost'] == 0
+
+def test_bidirectional_falls_back_on_dynamic_maps():
+    env = GridEnvironment('maps/dynamic.map', 'maps/dynamic.dyn')
+    planner = Planner(env)
+    path, metrics = planner.biastar(env.start)
+    assert metrics['fallback'] == 'astar' and path == planner.astar(env.start)[0]
+    assert planner.bidijkstra(env.start)[1]['fallback'] == 'ucs'
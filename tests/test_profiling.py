@@ -0,0 +1,42 @@
+import pytest
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from grid import GridEnvironment
+from planners import Planner
+from profiling import Profiler
+
+@pytest.fixture
+def env():
+    return GridEnvironment('maps/medium.map')
+
+def test_profiler_counts_hot_paths(env):
+    trace = []
+    profiler = Profiler(track_memory=True, on_expand=lambda pos, g, size: trace.append(pos)).attach(env)
+    profiler.start()
+    path, metrics = Planner(env, profiler).ucs(env.start)
+    profiler.stop()
+    report = json.loads(profiler.to_json())
+    assert report['counters']['expansions'] == metrics['nodes'] == len(trace)
+    assert report['counters']['pops'] == metrics['nodes'] + report['counters']['stale_pops']
+    assert report['calls']['successors'] == metrics['nodes'] - 1  # Goal is not expanded further
+    assert report['calls']['_edges'] == report['calls']['_unoccupied'] == report['calls']['successors']
+    assert report['peak_frontier'] > 0
+    assert report['peak_memory_kb'] > 0
+    assert trace[0] == env.start and trace[-1] == env.goal
+
+def test_detach_restores_env(env):
+    profiler = Profiler().attach(env)
+    profiler.detach(env)
+    assert not {'successors', '_unoccupied', '_edges'} & env.__dict__.keys()
+    Planner(env).astar(env.start)
+    assert not profiler.calls
+
+@pytest.mark.parametrize('method', ['bidijkstra', 'biastar'])
+def test_bidirectional_reports_expansions(env, method):
+    profiler = Profiler()
+    path, metrics = Planner(env, profiler).plan(method, env.start)
+    assert profiler.counters['expansions'] == metrics['nodes'] > 0
+    assert profiler.counters['pops'] == metrics['nodes'] + profiler.counters['stale_pops']
+    assert profiler.peak_frontier > 0
@@ -0,0 +1,58 @@
+import pytest
+import sys
+import os
+import struct
+import subprocess
+import zlib
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from grid import GridEnvironment
+from planners import Planner
+from render import GridRenderer, PATH, VEHICLE, AGENT
+
+def _chunks(file):
+    with open(file, 'rb') as f:
+        data = f.read()
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    pos, chunks = 8, []
+    while pos < len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        assert struct.unpack('>I', data[pos + 8 + length:pos + 12 + length])[0] == zlib.crc32(kind + body) & 0xffffffff
+        chunks.append((kind, body))
+        pos += 12 + length
+    return chunks
+
+def test_png_decodes_to_the_frame(tmp_path):
+    env = GridEnvironment('maps/small.map')
+    path = Planner(env).astar(env.start)[0]
+    renderer = GridRenderer(env, cell=3)
+    file = str(tmp_path / 'small.png')
+    renderer.save(file, path)
+    chunks = _chunks(file)
+    w, h = struct.unpack('>II', chunks[0][1][:8])
+    assert (h, w) == (env.rows * 3, env.cols * 3)
+    raw = np.frombuffer(zlib.decompress(b''.join(b for k, b in chunks if k == b'IDAT')), dtype=np.uint8)
+    pixels = raw.reshape(h, w * 3 + 1)[:, 1:].reshape(h, w, 3)
+    assert np.array_equal(pixels, renderer.frame(path))
+    x, y = path[len(path) // 2]
+    assert tuple(pixels[x * 3 + 1, y * 3 + 1]) == PATH
+
+def test_timeline_has_one_frame_per_step(tmp_path):
+    env = GridEnvironment('maps/dynamic.map', 'maps/dynamic.dyn')
+    path = Planner(env).astar(env.start)[0]
+    renderer = GridRenderer(env, cell=1)
+    file = str(tmp_path / 'dynamic.png')
+    renderer.save_timeline(file, path)
+    chunks = _chunks(file)
+    kinds = [k for k, _ in chunks]
+    assert struct.unpack('>I', dict(chunks)[b'acTL'][:4])[0] == len(path) == kinds.count(b'fcTL')
+    assert kinds.count(b'fdAT') == len(path) - 1
+    frame = renderer.frame(path[:3], 2, path[2])
+    assert tuple(frame[path[2]]) == AGENT
+    assert all(tuple(frame[tuple(c)]) == VEHICLE for c in renderer.vehicles(2) if tuple(c) != tuple(path[2]))
+
+def test_main_does_not_import_matplotlib():
+    src = os.path.join(os.path.dirname(__file__), '..', 'src')
+    code = "import sys, main; sys.exit('matplotlib' in sys.modules)"
+    assert subprocess.run([sys.executable, '-c', code], cwd=src).returncode == 0
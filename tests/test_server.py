@@ -0,0 +1,82 @@
+import asyncio
+import json
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from grid import GridEnvironment
+from planners import Planner
+from server import PlanningServer
+from loadgen import Client
+
+def run_session(session, **server_options):
+    async def main():
+        server = PlanningServer(workers=0, **server_options)
+        await server.start()
+        client = await Client.connect(*server.address[:2])
+        try:
+            return await session(client)
+        finally:
+            await client.close()
+            await server.close()
+    return asyncio.run(main())
+
+def test_batched_results_match_direct_planning():
+    env = GridEnvironment('maps/medium.map')
+    starts = [(0, 0), (0, 1), (1, 0), (2, 2)]
+
+    async def session(client):
+        replies = await asyncio.gather(*(client.request({'map': 'medium', 'planner': 'astar', 'start': list(s)})
+                                         for s in starts))
+        stats = await client.request({'op': 'stats'})
+        return replies, stats
+
+    replies, stats = run_session(session, batch_window=0.05)
+    assert stats['batches'] == 1 and stats['batched_requests'] == 4
+    for start, reply in zip(starts, replies):
+        path, metrics = Planner(env).astar(start)
+        assert [tuple(p) for p in reply['path']] == path and reply['cost'] == metrics['cost']
+
+def test_deadline_and_cancel():
+    async def session(client):
+        late = client.request({'id': 'late', 'map': 'large', 'planner': 'ucs', 'start': [0, 0], 'deadline': 0.01})
+        dropped = client.request({'id': 'dropped', 'map': 'large', 'planner': 'ucs', 'start': [0, 0]})
+        client.cancel('dropped')
+        return await late, await dropped
+
+    late, dropped = run_session(session, batch_window=0.2)
+    assert late['error'] == 'deadline exceeded'
+    assert dropped['error'] == 'cancelled'
+
+def test_bad_requests_get_errors():
+    async def session(client):
+        return await asyncio.gather(client.request({'map': 'nowhere', 'start': [0, 0]}),
+                                    client.request({'map': 'small', 'planner': 'magic', 'start': [0, 0]}),
+                                    client.request({'map': 'small', 'start': [0]}),
+                                    client.request({'map': 'small', 'start': [999, 999]}),  # Same batch as the next one
+                                    client.request({'map': 'small', 'start': [0, 0]}))
+
+    missing, unknown, malformed, outside, good = run_session(session)
+    assert 'not found' in missing['error'] and 'Unknown planner' in unknown['error']
+    assert 'integers' in malformed['error'] and 'outside the map' in outside['error']
+    assert good['path'][0] == [0, 0] and 'error' not in good
+
+def test_malformed_messages_and_ids():
+    async def main():
+        server = PlanningServer(workers=0)
+        await server.start()
+        reader, writer = await asyncio.open_connection(*server.address[:2])
+        try:
+            lines = ['[1]', '3', '{"id": [1], "op": "cancel"}', '{"map": "small", "start": [0, 0]}',
+                     '{"id": "a", "map": "large", "planner": "ucs", "start": [0, 0]}',
+                     '{"id": "a", "map": "small", "start": [0, 0]}']
+            writer.write(''.join(line + '\n' for line in lines).encode())
+            return [json.loads(await reader.readline()) for _ in range(6)]
+        finally:
+            writer.close()
+            await server.close()
+
+    replies = asyncio.run(main())
+    assert [r['error'] for r in replies[:3]] == ['request must be a JSON object'] * 2 + ['id must be a string or number']
+    assert any(r.get('id') == 'auto-1' and r['path'] for r in replies)
+    assert any(r.get('id') == 'a' and 'duplicate id' in r.get('error', '') for r in replies)
+    assert any(r.get('id') == 'a' and r.get('path') for r in replies)
@@ -0,0 +1,38 @@
+import pytest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from simulate import retime, simulate, aggregate, run_episode, load_map, OUTCOMES
+from grid import GridEnvironment
+
+def test_retime_phase_and_speed():
+    path = [(0, 0), (0, 1), (0, 2), (0, 1)]
+    assert retime(path, 1, 1) == [(0, 1), (0, 2), (0, 1), (0, 0)]
+    assert retime(path, 0, 2) == [(0, 0), (0, 2)]
+    assert retime(path, 0, 0.5) == [(0, 0), (0, 0), (0, 1), (0, 1), (0, 2), (0, 2), (0, 1), (0, 1)]
+
+def test_episodes_are_seeded_and_pool_matches_inline():
+    inline = simulate('traffic-20', 24, workers=1, seed=3, speeds=(0.5, 1, 2), chunk_size=8)
+    pooled = simulate('traffic-20', 24, workers=2, seed=3, speeds=(0.5, 1, 2), chunk_size=8)
+    strip = lambda rows: [{k: v for k, v in r.items() if k != 'plan_time'} for r in rows]
+    assert strip(inline) == strip(pooled)
+    stats = aggregate(inline)
+    assert stats['episodes'] == 24 and sum(stats['outcomes'].values()) == 24
+    assert set(stats['outcomes']) == set(OUTCOMES)
+    assert stats['success_rate'] > 0.5 and stats['cost_overhead']['mean'] >= 0
+
+def test_diagonal_fuel_matches_planned_costs():
+    rows = simulate('traffic-20', 24, seed=2, movement='8')
+    assert all(r['cost'] >= r['optimum'] - 1e-9 for r in rows if r['outcome'] == 'delivered')
+
+def test_sipp_never_collides():
+    rows = simulate('traffic-30', 40, planner='sipp', seed=1, speeds=(0.5, 1, 2))
+    assert all(r['outcome'] in ('delivered', 'unreachable') for r in rows)
+
+def test_fuel_budget_is_enforced():
+    env = load_map('large')
+    static = GridEnvironment.from_array(env.grid, env.start, env.goal)
+    trace = []
+    row = run_episode(env, static, env.start, env.goal, max_fuel=10, trace=trace)
+    assert row['outcome'] == 'out_of_fuel' and row['cost'] <= 10 and len(trace) == row['steps']
+    assert run_episode(env, static, env.start, env.goal)['outcome'] == 'delivered'
@@ -0,0 +1,43 @@
+import pytest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from grid import GridEnvironment
+from planners import Planner
+from sipp import SIPPPlanner
+import mapgen
+
+def _valid(env, path, departure=0):
+    steps = zip(path, path[1:])
+    return (all(not env.is_occupied(p, departure + t) for t, p in enumerate(path))
+            and all(a == b or abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in steps))
+
+def test_waits_out_obstacle_in_corridor(tmp_path):
+    # One-lane corridor; a vehicle pulls into (1, 2) for steps 1-3 of every 4
+    (tmp_path / 'corridor.map').write_text('1 0 1 4\n-1 -1 1 -1 -1\n1 1 1 1 1\n-1 -1 -1 -1 -1\n')
+    (tmp_path / 'corridor.dyn').write_text('van 0 2 8 0 2 1 2 1 2 1 2\n')
+    env = GridEnvironment(str(tmp_path / 'corridor.map'), str(tmp_path / 'corridor.dyn'))
+    path, metrics = SIPPPlanner(env).plan(env.start)
+    assert path[0] == (1, 0) and path[-1] == (1, 4)
+    assert _valid(env, path)
+    assert metrics['waits'] == 2 and metrics['arrival'] == len(path) - 1 == 6
+    assert metrics['cost'] == 6  # Four moves plus two waits
+
+def test_traffic_paths_avoid_obstacles():
+    env = mapgen.generate('traffic', 30, seed=2)
+    sipp = SIPPPlanner(env)
+    for departure, (start, goal) in enumerate(mapgen.queries(env, 6, seed=2)):
+        if env.is_occupied(start, departure):
+            continue
+        path, metrics = sipp.plan(start, departure, goal)
+        assert path and path[0] == start and path[-1] == goal
+        assert _valid(env, path, departure)
+        assert metrics['arrival'] == departure + len(path) - 1
+
+@pytest.mark.parametrize('kind', ['random', 'weighted'])
+def test_static_costs_match_astar(kind):
+    env = mapgen.generate(kind, 25, seed=3)
+    sipp, planner = SIPPPlanner(env), Planner(env)
+    for start, goal in mapgen.queries(env, 6, seed=3):
+        env.goal = goal
+        assert sipp.plan(start, goal=goal)[1]['cost'] == pytest.approx(planner.astar(start)[1]['cost'])
@@ -0,0 +1,61 @@
+import pytest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import planners
+from planners import Planner
+from tiled import TiledGridEnvironment, save_tiled_map
+import mapgen
+
+def tiled_copy(env, tmp_path, tile, movement='4', cache_tiles=64):
+    file = str(tmp_path / 'map.tmap')
+    save_tiled_map(env, file, tile)
+    return TiledGridEnvironment(file, movement=movement, cache_tiles=cache_tiles)
+
+@pytest.mark.parametrize('movement', ['4', '8'])
+def test_costs_match_in_memory_map(tmp_path, movement):
+    env = mapgen.generate('weighted', 37, seed=3)  # Not a multiple of the tile: edge tiles are padded
+    env.set_movement(movement)
+    tiled = tiled_copy(env, tmp_path, 8, movement)
+    for start, goal in mapgen.queries(env, 5, seed=3):
+        env.goal = tiled.goal = goal
+        for method in ('ucs', 'astar', 'ara'):
+            path, metrics = Planner(tiled).plan(method, start)
+            expected = Planner(env).plan(method, start)[1]
+            assert metrics['cost'] == pytest.approx(expected['cost'])
+            assert path[0] == start and path[-1] == goal
+
+def test_cache_is_bounded_and_counted(tmp_path):
+    env = mapgen.generate('maze', 40, seed=2)
+    tiled = tiled_copy(env, tmp_path, 4, cache_tiles=3)
+    for x in range(env.rows):
+        for y in range(env.cols):
+            assert tiled.get_cost((x, y)) == env.get_cost((x, y))
+    stats = tiled.tile_stats
+    assert len(tiled._tiles) == 3
+    assert stats['misses'] == 100 * 4  # Every row sweep reloads all ten tiles of its band
+    assert stats['bytes_read'] == stats['misses'] * 4 * 4 * tiled._dtype.itemsize
+    assert stats['evictions'] == stats['misses'] - 3
+    assert stats['hits'] + stats['misses'] == env.rows * env.cols
+    with pytest.raises(ValueError):
+        tiled.neighbor_table
+
+def test_dynamics_round_trip(tmp_path):
+    env = mapgen.generate('traffic', 30, seed=5)
+    tiled = tiled_copy(env, tmp_path, 16)
+    assert tiled.moving_obstacles.keys() == env.moving_obstacles.keys()
+    for t in range(12):
+        for x in range(env.rows):
+            for y in range(env.cols):
+                assert tiled.is_occupied((x, y), t) == env.is_occupied((x, y), t)
+    for start, goal in mapgen.queries(env, 3, seed=5):
+        assert tiled.successors(start, 4) == env.successors(start, 4)
+
+def test_sparse_search_state(tmp_path, monkeypatch):
+    # Maps too big for dense per-cell arrays keep search state in dicts
+    env = mapgen.generate('maze', 30, seed=7)
+    tiled = tiled_copy(env, tmp_path, 8)
+    expected = Planner(env).astar(env.start)[1]['cost']
+    monkeypatch.setattr(planners, 'DENSE_SEARCH_LIMIT', 100)
+    assert isinstance(planners.SearchSpace(tiled).g, dict)
+    assert Planner(tiled).astar(tiled.start)[1]['cost'] == expected
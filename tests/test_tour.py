@@ -0,0 +1,49 @@
+import pytest
+import sys
+import os
+import itertools
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from grid import GridEnvironment
+from distance import DistanceFields
+from tour import TourPlanner, load_stops
+import mapgen
+
+def _stops(env, count, seed):
+    free = np.argwhere(env.grid != -1)
+    picks = np.random.default_rng(seed).choice(len(free), count, replace=False)
+    return [tuple(p) for p in free[picks].tolist()]
+
+@pytest.mark.parametrize('return_to_start', [False, True])
+def test_matches_brute_force_on_small_tours(return_to_start):
+    env = mapgen.generate('weighted', 30, seed=2)
+    stops = _stops(env, 6, seed=2)
+    route, metrics = TourPlanner(env).plan(stops, return_to_start=return_to_start)
+    fields = DistanceFields(env)
+    tail = [env.start] if return_to_start else []
+    best = min(sum(fields.cost(a, b) for a, b in zip(legs, legs[1:]))
+               for legs in ([env.start] + [stops[i] for i in perm] + tail for perm in itertools.permutations(range(6))))
+    assert metrics['cost'] == best <= metrics['initial_cost']
+    assert route[0] == env.start and route[-1] == (env.start if return_to_start else stops[metrics['order'][-1]])
+    assert sum(env.get_cost(b) for b in route[1:]) == metrics['cost']
+    assert sorted(metrics['order']) == list(range(6)) and set(stops) <= set(route)
+
+def test_time_budget_and_unreachable_stops():
+    env = mapgen.generate('maze', 21, seed=0)
+    walled = GridEnvironment.from_array(env.grid, env.start, env.goal)
+    x, y = env.start
+    walled.grid[x - 1:x + 2, y - 1:y + 2] = -1  # Seal the start in
+    walled.grid[x, y] = 1
+    walled.invalidate_neighbor_table()
+    route, metrics = TourPlanner(walled).plan(_stops(env, 4, seed=0))
+    assert route == [env.start] and metrics['unreachable'] == [0, 1, 2, 3]
+    _, quick = TourPlanner(env).plan(_stops(env, 30, seed=1), time_budget=0)
+    assert quick['passes'] == 0 and quick['cost'] == quick['initial_cost']
+
+def test_load_stops(tmp_path):
+    env = GridEnvironment('maps/small.map')
+    assert load_stops('maps/large.stops')[:2] == [(0, 19), (19, 0)]
+    bad = tmp_path / 'bad.stops'
+    bad.write_text('0 1\n1 1  # wall\n')
+    with pytest.raises(ValueError):
+        load_stops(str(bad), env)